@@ -2,4 +2,11 @@ from .adis import Adis
 from .adis_file import AdisFile
 from .adis_block import AdisBlock
 from .adis_field_definition import AdisFieldDefinition
-from .adis_value import AdisValue
+from .adis_value import (
+    AdisSerializationOptions,
+    AdisValue
+)
+from .adis_parser import AdisParser
+from .adis_writer import AdisWriter
+from .adis_follow import AdisFollowReader
+from .adis_stats import AdisStats
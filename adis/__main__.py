@@ -0,0 +1,58 @@
+import argparse
+import logging
+from .adis_ingest import AdisIngestService
+
+"""
+Command line interface of the adis package.
+
+Usage:
+    adis ingest INBOX OUTPUT --done DONE --failed FAILED [--workers N] [--ndjson]
+        [--encoding ENCODING]
+"""
+
+def main(arguments=None):
+    """Runs the command line interface.
+
+    Args:
+        arguments (list[string], optional): command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(prog="adis")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest",
+        help="watch a directory and convert new ADIS files to JSON or NDJSON")
+    ingest_parser.add_argument("inbox", help="directory that is watched for *.ads files")
+    ingest_parser.add_argument("output", help="directory the converted files are written to")
+    ingest_parser.add_argument("--done", required=True,
+        help="directory converted ADIS files are moved to")
+    ingest_parser.add_argument("--failed", required=True,
+        help="directory ADIS files that could not be converted are moved to")
+    ingest_parser.add_argument("--workers", type=int, default=None,
+        help="number of worker processes (default: number of CPUs)")
+    ingest_parser.add_argument("--ndjson", action="store_true",
+        help="write NDJSON (one data row per line) instead of JSON")
+    ingest_parser.add_argument("--keep-whitespace", action="store_true",
+        help="do not strip string values")
+    ingest_parser.add_argument("--poll-interval", type=float, default=1.0,
+        help="seconds between two polls of the inbox (default: 1.0)")
+    ingest_parser.add_argument("--encoding", default="latin-1",
+        help="encoding of the ADIS files (default: latin-1)")
+
+    parsed_arguments = parser.parse_args(arguments)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if parsed_arguments.command == "ingest":
+        service = AdisIngestService(parsed_arguments.inbox, parsed_arguments.output,
+                                    parsed_arguments.done, parsed_arguments.failed,
+                                    parsed_arguments.workers, parsed_arguments.ndjson,
+                                    not parsed_arguments.keep_whitespace,
+                                    parsed_arguments.poll_interval,
+                                    parsed_arguments.encoding)
+        try:
+            service.run()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,25 @@
+import io
 import json
+import mmap
+import os
+from .adis_async import (
+    AdisAsyncWriter,
+    aiter_blocks
+)
+from .adis_cache import AdisParseCache
 from .adis_file import AdisFile
-from .adis_lines import (
-    AdisLine,
-    EndOfLogicalFileLine,
-    PhysicalEndOfFileLine
+from .adis_index import AdisIndex
+from .adis_numpy import import_pandas
+from .adis_parallel import parse_file_parallel
+from .adis_stats import AdisStatsWriter
+from .adis_validator import AdisValidator
+from .adis_parser import (
+    AdisParser,
+    read_buffer_lines,
+    read_lines
 )
-from .adis_value import AdisValue
+from .adis_value import AdisSerializationOptions
+from .adis_writer import AdisWriter
 
 def split_lines(raw_input_text):
     """Splits the provided text into lines. Lines are splitted at "\n" and "\r" chars get \
@@ -24,6 +38,23 @@ def split_lines(raw_input_text):
     return lines
 
 
+def write_ndjson_row(output_file, file_index, entity_number, data_row_dict):
+    """Writes a data row as one line of NDJSON.
+
+    Args:
+        output_file (file): file object opened in text mode
+        file_index (int): index of the logical file
+        entity_number (string): entity number of the block
+        data_row_dict (dict): item numbers as keys and the values of the fields as values
+    """
+    output_file.write(json.dumps({
+        "file_index": file_index,
+        "entity_number": entity_number,
+        "data": data_row_dict
+    }))
+    output_file.write("\n")
+
+
 class Adis:
     def __init__(self, adis_files):
         """Creates an Adis object based on the logical ADIS files
@@ -32,6 +63,9 @@ class Adis:
             adis_files (list[AdisFile]): List of logical ADIS files
         """
         self.files = adis_files
+        self.index = None
+        self.rejected_count = 0
+        self.problems = []
 
     def get_files(self):
         """Returns a list containing the logical AdisFiles
@@ -41,47 +75,371 @@ class Adis:
         """
         return self.files
 
+    def get_rejected_count(self):
+        """Returns the number of lines that got rejected while parsing with the error policy \
+            "skip" or "collect".
+
+        Returns:
+            int: number of rejected lines
+        """
+        return self.rejected_count
+
+    def get_problems(self):
+        """Returns the lines that got rejected while parsing with the error policy "collect".
+
+        Returns:
+            list[AdisProblem]: one problem per rejected line with the line number, the reason \
+                and the line
+        """
+        return self.problems
+
     @staticmethod
-    def parse(text):
+    def parse(text, storage="rows", entities=None, items=None, decimals="float", stats=None,
+              errors="strict", quarantine=None):
         """This method parses the provided ADIS text into an Adis object.
 
         Args:
             text (string): ADIS file content
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            entities (list[string], optional): only parse the blocks with these entity \
+                numbers. Value lines of other entities are skipped without being decoded. \
+                Defaults to all entities.
+            items (list[string], optional): only decode the fields with these item numbers. \
+                Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded: "float", "scaled" \
+                (exact integers of the digits, the scale is the number of decimal digits of the \
+                field definition) or "decimal" (exact Decimals), see AdisParser. Defaults to \
+                "float".
+            stats (AdisStats, optional): collects the time of each phase and counts the \
+                lines, chars, blocks, rows, fields, nulls and rows per entity. Defaults to None.
+            errors (string, optional): "strict" raises an error for an invalid line, "skip" \
+                and "collect" reject the line and keep parsing, see AdisParser. The rejected \
+                lines are available through get_rejected_count and get_problems. Defaults to \
+                "strict".
+            quarantine (file, optional): file object opened in text mode the rejected lines \
+                get written to. Defaults to None.
 
         Returns:
             Adis: Adis object created from the provided ADIS text
         """
-        raw_lines = split_lines(text)
+        if stats is not None:
+            lines = stats.measure("split_lines", split_lines, text)
+        else:
+            lines = split_lines(text)
+        return Adis.parse_lines(lines, storage, entities=entities, items=items,
+                                decimals=decimals, stats=stats, errors=errors,
+                                quarantine=quarantine)
 
-        adis_files = []
+    @staticmethod
+    def parse_from_file(path_to_file, storage="rows", use_mmap=False, encoding=None,
+                        workers=None, entities=None, items=None, cache_dir=None,
+                        decimals="float", stats=None, errors="strict", quarantine=None):
+        """This method parses the given ADIS file to an Adis object. The file is read line by \
+            line, so its whole content is never held in memory as one string.
 
-        lines_for_file = []
-        for raw_line in raw_lines:
-            if raw_line == "":
-                continue
+        Args:
+            path_to_file (string): Path to the ADIS file
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            use_mmap (bool, optional): Whether to memory-map the file and parse it on raw bytes. \
+                Line boundaries are searched in the mapped file and fields are sliced without \
+                copying the lines. Requires a single-byte encoding. Defaults to False.
+            encoding (string, optional): encoding of the file. Defaults to the locale encoding, \
+                or "latin-1" when use_mmap or workers is set.
+            workers (int, optional): number of worker processes. If set, the file is split at \
+                definition lines, ends of logical files and line boundaries and the value \
+                lines are decoded in a process pool. Requires a single-byte encoding and the \
+                storage "rows", "columnar" or "tuples". Defaults to None.
+            entities (list[string], optional): only parse the blocks with these entity \
+                numbers. Value lines of other entities are skipped without being decoded. \
+                Defaults to all entities.
+            items (list[string], optional): only decode the fields with these item numbers. \
+                Defaults to all fields.
+            cache_dir (string, optional): directory of an AdisParseCache. The parsed file is \
+                stored there in a compact binary form and loaded from there as long as the \
+                path, size and modification time of the file do not change. Not used for the \
+                storage "lazy". Defaults to None.
+            decimals (string, optional): how decimal fields are decoded: "float", "scaled" \
+                (exact integers of the digits, the scale is the number of decimal digits of the \
+                field definition) or "decimal" (exact Decimals), see AdisParser. Defaults to \
+                "float".
+            stats (AdisStats, optional): collects the time of each phase and counts the \
+                lines, chars, blocks, rows, fields, nulls and rows per entity. With workers or \
+                cache_dir the lines are not seen one by one, only the bytes of the file and its \
+                blocks are counted. Defaults to None.
+            errors (string, optional): "strict" raises an error for an invalid line, "skip" \
+                and "collect" reject the line and keep parsing, see AdisParser. The rejected \
+                lines are available through get_rejected_count and get_problems. Defaults to \
+                "strict".
+            quarantine (file, optional): file object opened in text mode the rejected lines \
+                get written to. Defaults to None.
 
-            line = AdisLine.parse_line(raw_line)
-            if type(line) == EndOfLogicalFileLine or type(line) == PhysicalEndOfFileLine:
-                adis_files.append(AdisFile.from_lines(lines_for_file))
-                lines_for_file = []
-            else:
-                lines_for_file.append(line)
+        Returns:
+            Adis: Adis object created from the provided ADIS file
+        """
+        if errors != "strict" and ((cache_dir is not None and storage != "lazy")
+                                   or (workers is not None and workers > 1)):
+            raise Exception("The error policy \"%s\" cannot be used together with workers " \
+                "or cache_dir." % errors)
+
+        if stats is not None and ((cache_dir is not None and storage != "lazy")
+                                  or (workers is not None and workers > 1)):
+            # the lines are not seen one by one, only the whole file and its blocks are measured
+            adis = stats.measure("parse_file", Adis.parse_from_file, path_to_file, storage,
+                                 use_mmap, encoding, workers, entities, items, cache_dir,
+                                 decimals)
+            stats.count("bytes", os.path.getsize(path_to_file))
+            stats.measure("count_blocks", stats.count_blocks,
+                          [block for adis_file in adis.files for block in adis_file.get_blocks()])
+            stats.finish("parse")
+            return adis
+
+        if cache_dir is not None and storage != "lazy":
+            cache = AdisParseCache(cache_dir)
+            options = (encoding, entities, items, decimals)
+            adis_files = cache.load(path_to_file, options)
+            if adis_files is None:
+                adis_files = Adis.parse_from_file(path_to_file, "columnar", use_mmap, encoding,
+                                                  workers, entities, items,
+                                                  decimals=decimals).get_files()
+                cache.save(path_to_file, options, adis_files)
+            return Adis(AdisParseCache.convert_storage(adis_files, storage))
+
+        if workers is not None and workers > 1:
+            return Adis(parse_file_parallel(path_to_file, workers, storage,
+                                            encoding or "latin-1", entities=entities,
+                                            items=items, decimals=decimals))
+
+        if use_mmap:
+            with open(path_to_file, "rb") as input_file:
+                if os.fstat(input_file.fileno()).st_size == 0:
+                    return Adis.parse_bytes(b"", storage, encoding or "latin-1", entities,
+                                            items, decimals, stats, errors, quarantine)
+                mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return Adis.parse_bytes(mapped_file, storage, encoding or "latin-1", entities,
+                                        items, decimals, stats, errors, quarantine)
+            finally:
+                try:
+                    mapped_file.close()
+                except BufferError:
+                    pass    # memoryviews into the mapping are still in use, it is closed with them
+
+        with open(path_to_file, "r", encoding=encoding) as input_file:
+            return Adis.parse_lines(read_lines(input_file), storage, entities=entities,
+                                    items=items, decimals=decimals, stats=stats,
+                                    errors=errors, quarantine=quarantine)
+
+    @staticmethod
+    def parse_bytes(data, storage="rows", encoding="latin-1", entities=None, items=None,
+                    decimals="float", stats=None, errors="strict", quarantine=None):
+        """This method parses the provided ADIS bytes into an Adis object. Line boundaries are \
+            searched on the raw bytes and fields are sliced through memoryviews, only the \
+            values themselves get decoded.
 
+        Args:
+            data (bytes, bytearray, mmap.mmap): ADIS file content
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            encoding (string, optional): single-byte encoding of the content. Defaults to \
+                "latin-1".
+            entities (list[string], optional): only parse the blocks with these entity \
+                numbers. Value lines of other entities are skipped without being decoded. \
+                Defaults to all entities.
+            items (list[string], optional): only decode the fields with these item numbers. \
+                Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded: "float", "scaled" \
+                (exact integers of the digits, the scale is the number of decimal digits of the \
+                field definition) or "decimal" (exact Decimals), see AdisParser. Defaults to \
+                "float".
+            stats (AdisStats, optional): collects the time of each phase and counts the \
+                lines, chars, blocks, rows, fields, nulls and rows per entity. Defaults to None.
+            errors (string, optional): "strict" raises an error for an invalid line, "skip" \
+                and "collect" reject the line and keep parsing, see AdisParser. The rejected \
+                lines are available through get_rejected_count and get_problems. Defaults to \
+                "strict".
+            quarantine (file, optional): file object opened in text mode the rejected lines \
+                get written to. Defaults to None.
+
+        Returns:
+            Adis: Adis object created from the provided ADIS bytes
+        """
+        raw_lines = read_buffer_lines(data)
+        try:
+            return Adis.parse_lines(raw_lines, storage, encoding, entities, items, decimals,
+                                    stats, errors, quarantine)
+        finally:
+            raw_lines.close()
+
+    @staticmethod
+    def parse_lines(raw_lines, storage="rows", encoding="latin-1", entities=None, items=None,
+                    decimals="float", stats=None, errors="strict", quarantine=None):
+        """This method parses the provided lines into an Adis object. Blocks of a logical file \
+            that is not terminated by an "EN" or "ZN" line are ignored.
+
+        Args:
+            raw_lines (iterable[string], iterable[memoryview]): lines of an ADIS file without \
+                line break chars
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            encoding (string, optional): single-byte encoding of lines given as bytes. Defaults \
+                to "latin-1".
+            entities (list[string], optional): only parse the blocks with these entity \
+                numbers. Value lines of other entities are skipped without being decoded. \
+                Defaults to all entities.
+            items (list[string], optional): only decode the fields with these item numbers. \
+                Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded: "float", "scaled" \
+                (exact integers of the digits, the scale is the number of decimal digits of the \
+                field definition) or "decimal" (exact Decimals), see AdisParser. Defaults to \
+                "float".
+            stats (AdisStats, optional): collects the time of each phase and counts the \
+                lines, chars, blocks, rows, fields, nulls and rows per entity. Defaults to None.
+            errors (string, optional): "strict" raises an error for an invalid line, "skip" \
+                and "collect" reject the line and keep parsing, see AdisParser. The rejected \
+                lines are available through get_rejected_count and get_problems. Defaults to \
+                "strict".
+            quarantine (file, optional): file object opened in text mode the rejected lines \
+                get written to. Defaults to None.
+
+        Returns:
+            Adis: Adis object created from the provided lines
+        """
+        parser = AdisParser(storage, encoding, entities, items, decimals, errors, quarantine)
+        if stats is None:
+            indexed_blocks = list(parser.iter_blocks(raw_lines))
+            adis = Adis.from_indexed_blocks(indexed_blocks, parser.get_file_index())
+            adis.rejected_count = parser.get_rejected_count()
+            adis.problems = parser.get_problems()
+            return adis
+
+        indexed_blocks = stats.feed_lines(parser, raw_lines)
+        adis = Adis.from_indexed_blocks(indexed_blocks, parser.get_file_index())
+        adis.rejected_count = parser.get_rejected_count()
+        adis.problems = parser.get_problems()
+        if adis.rejected_count != 0:
+            stats.count("rejected_lines", adis.rejected_count)
+        stats.measure("count_blocks", stats.count_blocks,
+                      [block for adis_file in adis.files for block in adis_file.get_blocks()])
+        stats.finish("parse")
+        return adis
+
+    @staticmethod
+    def validate(path_to_file, encoding="latin-1", max_problems=None):
+        """Validates an ADIS file in one pass without parsing it. Line types, status chars, \
+            definition lines, the lengths of the value lines and the "EN" and "ZN" lines are \
+            checked, the values themselves are not decoded.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            encoding (string, optional): single-byte encoding of the file. Defaults to \
+                "latin-1".
+            max_problems (int, optional): stop after this number of problems. Defaults to all \
+                problems.
+
+        Returns:
+            list[AdisProblem]: problems with line number, byte offset and reason, empty if the \
+                file is valid
+        """
+        return AdisValidator(encoding, max_problems).validate_file(path_to_file)
+
+    @staticmethod
+    def from_indexed_blocks(indexed_blocks, number_of_files):
+        """Creates an Adis object from blocks and the indices of their logical files. Blocks \
+            of logical files that have not been terminated are ignored.
+
+        Args:
+            indexed_blocks (list[tuple(int, AdisBlock)]): index of the logical file and block
+            number_of_files (int): number of terminated logical files
+
+        Returns:
+            Adis: Adis object containing the blocks
+        """
+        blocks_of_files = []
+        for file_index, block in indexed_blocks:
+            while len(blocks_of_files) <= file_index:
+                blocks_of_files.append([])
+            blocks_of_files[file_index].append(block)
+
+        while len(blocks_of_files) < number_of_files:
+            blocks_of_files.append([])
+
+        adis_files = []
+        for blocks in blocks_of_files[:number_of_files]:
+            adis_files.append(AdisFile(blocks))
         return Adis(adis_files)
 
     @staticmethod
-    def parse_from_file(path_to_file):
-        """This method parses the given ADIS file to an Adis object.
+    def iter_blocks(path_to_file, storage="rows", encoding="latin-1"):
+        """Reads the given ADIS file incrementally and yields its blocks one by one. Only the \
+            block that is currently being parsed is held in memory.
 
         Args:
             path_to_file (string): Path to the ADIS file
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            encoding (string, optional): encoding of the file. Defaults to "latin-1".
+
+        Yields:
+            tuple(int, AdisBlock): index of the logical file and the block
+        """
+        with open(path_to_file, "r", encoding=encoding) as input_file:
+            yield from AdisParser(storage, encoding).iter_blocks(read_lines(input_file))
+
+    @staticmethod
+    def aiter_blocks(reader, storage="rows", encoding="latin-1"):
+        """Parses an asyncio stream line by line as the bytes arrive and yields its blocks one \
+            by one. Control is given back to the event loop between two chunks.
+
+        Args:
+            reader (asyncio.StreamReader): stream containing the ADIS text
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            encoding (string, optional): single-byte encoding of the stream. Defaults to \
+                "latin-1".
 
         Returns:
-            Adis: Adis object created from the provided ADIS file
+            async iterator of tuple(int, AdisBlock): index of the logical file and the block
+        """
+        return aiter_blocks(reader, storage, encoding)
+
+    @staticmethod
+    async def aparse(reader, storage="rows", encoding="latin-1"):
+        """Parses an asyncio stream into an Adis object without blocking the event loop. \
+            Blocks of a logical file that is not terminated are ignored, like in parse.
+
+        Args:
+            reader (asyncio.StreamReader): stream containing the ADIS text
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+            encoding (string, optional): single-byte encoding of the stream. Defaults to \
+                "latin-1".
+
+        Returns:
+            Adis: Adis object created from the stream
         """
-        with open(path_to_file, "r") as input_file:
-            text = input_file.read()
-        return Adis.parse(text)
+        parser = AdisParser(storage, encoding)
+        indexed_blocks = [indexed_block async for indexed_block
+                          in aiter_blocks(reader, parser=parser)]
+        return Adis.from_indexed_blocks(indexed_blocks, parser.get_file_index())
+
+    @staticmethod
+    def iter_rows(path_to_file, entity=None, encoding="latin-1"):
+        """Reads the given ADIS file incrementally and yields its data rows one by one. Only \
+            the line that is currently being parsed is held in memory.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            entity (string, optional): only yield data rows of blocks with this entity number
+            encoding (string, optional): encoding of the file. Defaults to "latin-1".
+
+        Yields:
+            tuple(int, string, list[AdisValue]): index of the logical file, entity number of the \
+                block and the data row
+        """
+        with open(path_to_file, "r", encoding=encoding) as input_file:
+            yield from AdisParser(encoding=encoding).iter_rows(read_lines(input_file), entity)
 
     def get_list(self, strip_string_values=True):
         """Returns a list containing of the logical ADIS files and their contents. \
@@ -94,14 +452,13 @@ class Adis:
         Returns:
             list: containing the logical adis files and their contents as builtin types.
         """
-
-        AdisValue.strip_string_values = strip_string_values
+        options = AdisSerializationOptions(strip_string_values)
         list_of_files = []
         for adis_file in self.files:
-            list_of_files.append(adis_file.to_dict())
+            list_of_files.append(adis_file.to_dict(options))
         return list_of_files
 
-    def to_json(self, strip_string_values=True, mapping_dict: dict=None):
+    def to_json(self, strip_string_values=True, mapping_dict: dict=None, stats=None):
         """Creates a json from the Adis object.
 
         Args:
@@ -109,16 +466,111 @@ class Adis:
                 values should be stripped or not.
             mapping_dict (dict): Optional dictionary of mapping values \
                 for entity numbers (e.g. {"0080004": "Betriebsnummer"})
+            stats (AdisStats, optional): collects the time of the phases "to_dict" and \
+                "json_dumps" and counts the blocks, rows and the chars of the json text. \
+                Defaults to None.
 
         Returns:
             string: Adis as json
         """
+        if stats is not None:
+            list_of_adis = stats.measure("to_dict", self.get_list, strip_string_values)
+            if mapping_dict is not None and type(mapping_dict) == dict:
+                list_of_adis = self.add_string_value(list_of_adis, mapping_dict)
+            json_text = stats.measure("json_dumps", json.dumps, list_of_adis)
+            stats.count_blocks([block for adis_file in self.files
+                                for block in adis_file.get_blocks()], fields=False)
+            stats.count("chars", len(json_text))
+            stats.finish("to_json")
+            return json_text
+
         if mapping_dict is None or type(mapping_dict) != dict:
             return json.dumps(self.get_list(strip_string_values))
         else:
             list_of_adis = self.get_list(strip_string_values)
             return json.dumps(self.add_string_value(list_of_adis, mapping_dict))
 
+    def dump_json(self, output_file, strip_string_values=True, mapping_dict: dict=None,
+                  ndjson=False):
+        """Writes the Adis object as json to a file object. The json is written block by \
+            block, so the complete json text is never held in memory. The written json is the \
+            same as the one created by to_json.
+
+        Args:
+            output_file (file): file object opened in text mode
+            strip_string_values (bool, optional, by default True): Whether string \
+                values should be stripped or not.
+            mapping_dict (dict): Optional dictionary of mapping values \
+                for entity numbers (e.g. {"0080004": "Betriebsnummer"})
+            ndjson (bool, optional): Whether to write one json object per data row and line \
+                instead of one json document. Each object contains the index of the logical \
+                file, the entity number and the data of the row. Defaults to False.
+        """
+        options = AdisSerializationOptions(strip_string_values)
+        if ndjson:
+            for file_index, adis_file in enumerate(self.files):
+                for block in adis_file.get_blocks():
+                    entity_number = block.get_entity_number()
+                    scaled_digits = block.get_scaled_digits()
+                    for data_row in block.get_data_rows():
+                        write_ndjson_row(output_file, file_index, entity_number,
+                                         block.data_row_to_dict(data_row, options, scaled_digits))
+            return
+
+        output_file.write("[")
+        for file_index, adis_file in enumerate(self.files):
+            if file_index != 0:
+                output_file.write(", ")
+            output_file.write("{")
+
+            # like in AdisFile.to_dict the last block of an entity is written at the position
+            # of the first block of the entity
+            blocks_by_entity = {}
+            for block in adis_file.get_blocks():
+                blocks_by_entity[block.get_entity_number()] = block
+
+            for block_index, (entity_number, block) in enumerate(blocks_by_entity.items()):
+                if block_index != 0:
+                    output_file.write(", ")
+                block_dict = block.to_dict(options)
+                if mapping_dict is not None and type(mapping_dict) == dict:
+                    Adis.add_item_names(block_dict, mapping_dict)
+                output_file.write(json.dumps(entity_number))
+                output_file.write(": ")
+                output_file.write(json.dumps(block_dict))
+            output_file.write("}")
+        output_file.write("]")
+
+    @staticmethod
+    def dump_ndjson_from_file(path_to_file, output_file, strip_string_values=True, entity=None,
+                              encoding="latin-1"):
+        """Converts the given ADIS file to NDJSON (one json object per data row and line) \
+            without parsing the whole file first. Only one line is held in memory at a time.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            output_file (file): file object opened in text mode
+            strip_string_values (bool, optional, by default True): Whether string \
+                values should be stripped or not.
+            entity (string, optional): only write data rows of blocks with this entity number
+            encoding (string, optional): encoding of the file. Defaults to "latin-1".
+
+        Returns:
+            int: number of written data rows
+        """
+        number_of_rows = 0
+        for file_index, entity_number, data_row in Adis.iter_rows(path_to_file, entity,
+                                                                        encoding):
+            data_row_dict = {}
+            for value in data_row:
+                if strip_string_values and isinstance(value.value, str):
+                    data_row_dict[value.item_number] = value.value.strip()
+                else:
+                    data_row_dict[value.item_number] = value.value
+            write_ndjson_row(output_file, file_index, entity_number, data_row_dict)
+            number_of_rows += 1
+        return number_of_rows
+
     @staticmethod
     def from_json(json_text):
         """Creates an Adis object based on the provided json.
@@ -157,25 +609,129 @@ class Adis:
             raw_content = input_file.read()
         return Adis.from_json(raw_content)
 
-    def dumps(self):
+    def to_dataframes(self, strip_string_values=True):
+        """Creates one pandas DataFrame per entity number. The blocks of an entity from all \
+            logical files are concatenated in order, columns missing in some blocks are filled \
+            with NaN. Requires pandas.
+
+        Args:
+            strip_string_values (bool, optional, by default True): Whether string values should \
+                be stripped or not.
+
+        Returns:
+            dict: entity number as key and the pandas.DataFrame as value
+        """
+        dataframes_by_entity = {}
+        for adis_file in self.files:
+            for block in adis_file.get_blocks():
+                dataframes = dataframes_by_entity.setdefault(block.get_entity_number(), [])
+                dataframes.append(block.to_dataframe(strip_string_values))
+
+        if len(dataframes_by_entity) == 0:
+            return {}
+
+        pandas = import_pandas()
+        result = {}
+        for entity_number, dataframes in dataframes_by_entity.items():
+            if len(dataframes) == 1:
+                result[entity_number] = dataframes[0]
+            else:
+                result[entity_number] = pandas.concat(dataframes, ignore_index=True)
+        return result
+
+    def get_index(self):
+        """Returns the AdisIndex of the logical files. The index is built on the first call.
+
+        Returns:
+            AdisIndex: index of the entity numbers and item numbers
+        """
+        if self.index is None:
+            self.index = AdisIndex(self.files)
+        return self.index
+
+    def select(self, entity, items=None):
+        """Returns the data rows of an entity from all logical files, see AdisIndex.select.
+
+        Args:
+            entity (string): entity number
+            items (list[string], optional): item numbers of the fields that are returned, in \
+                this order. Defaults to all fields.
+
+        Returns:
+            list[tuple(int, list[AdisValue])]: index of the logical file and the data row
+        """
+        return self.get_index().select(entity, items)
+
+    def dumps(self, stats=None):
         """Creates an ADIS text
 
+        Args:
+            stats (AdisStats, optional): collects the time of writing the blocks and counts \
+                the written lines, chars, blocks and rows. Defaults to None.
+
         Returns:
             string: ADIS text
         """
-        file_texts = []
-        for adis_file in self.files:
-            file_texts.append(adis_file.dumps())
-        
-        end_of_logical_file_line = "EN\r\n"
-        text = end_of_logical_file_line.join(file_texts)
+        output = io.StringIO()
+        self.dump(output, stats)
+        return output.getvalue()
+
+    async def adump(self, stream_writer, encoding="latin-1"):
+        """Writes the ADIS text to an asyncio stream. The stream gets drained regularly, so \
+            the event loop is not blocked by large files.
+
+        Args:
+            stream_writer (asyncio.StreamWriter): stream the ADIS text gets written to
+            encoding (string, optional): encoding of the ADIS text. Defaults to "latin-1".
+        """
+        writer = AdisAsyncWriter(stream_writer, encoding)
+        for file_index, adis_file in enumerate(self.files):
+            if file_index != 0:
+                await writer.end_logical_file()
+            for block in adis_file.get_blocks():
+                await writer.write_block(block)
+        await writer.close()       # physical end of file
 
-        text += "ZN\r\n"    # physical end of file
-        return text
+    def dump(self, output_file, stats=None):
+        """Writes the ADIS text line by line to a file object.
+
+        Args:
+            output_file (file): file object opened in text mode. Use newline="" when opening \
+                a file, the lines already end with "\r\n".
+            stats (AdisStats, optional): collects the time of writing the blocks and counts \
+                the written lines, chars, blocks and rows. Defaults to None.
+        """
+        if stats is not None:
+            blocks = [block for adis_file in self.files for block in adis_file.get_blocks()]
+            stats.measure("write_blocks", self.dump, AdisStatsWriter(output_file, stats))
+            stats.count_blocks(blocks, fields=False)
+            stats.finish("dumps")
+            return
+
+        writer = AdisWriter(output_file)
+        for file_index, adis_file in enumerate(self.files):
+            if file_index != 0:
+                writer.end_logical_file()
+            for block in adis_file.get_blocks():
+                writer.write_block(block)
+        writer.close()      # physical end of file
 
     def __repr__(self):
         return """Adis containing %d Adis-files""" % len(self.files)
 
+    @staticmethod
+    def add_item_names(block_dict: dict, entity_data_dict: dict):
+        """ Adds the item names to the definitions of a block dict
+
+        Args:
+            block_dict (dict): block as created by AdisBlock.to_dict
+            entity_data_dict (dict): dictionary of mapping values for \
+             item numbers (e.g. {"0080004": "Betriebsnummer"})
+        """
+        for items in block_dict["definitions"]:
+            items['item_name'] = entity_data_dict.get(items['item_number'][2:],
+                                                      items['item_number'][2:])
+
     @staticmethod
     def add_string_value(obj: list, entity_data_dict: dict):
         """ Adds string value to definition list
@@ -189,9 +745,7 @@ class Adis:
              list: containing the logical adis files and their contents as builtin types with string values
 
         """
-        for o in obj:
-            for defs in o:
-                for items in obj[0].get(defs).get("definitions"):
-                    x = entity_data_dict.get(items['item_number'][2:], items['item_number'][2:])
-                    items['item_name'] = x
+        for file_dict in obj:
+            for block_dict in file_dict.values():
+                Adis.add_item_names(block_dict, entity_data_dict)
         return obj
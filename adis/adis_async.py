@@ -0,0 +1,170 @@
+import asyncio
+from .adis_parser import AdisParser
+from .adis_writer import AdisWriter
+
+"""
+asyncio counterparts of the parsing and writing functions. Lines are parsed as the bytes arrive
+and control is given back to the event loop after each chunk, so many streams can be handled by
+one event loop.
+"""
+
+async def read_stream_lines(reader, chunk_size=64 * 1024):
+    """Reads chunks from an asyncio stream and yields the lines of each chunk. Line break chars \
+        get removed.
+
+    Args:
+        reader (asyncio.StreamReader): stream containing the ADIS text
+        chunk_size (int, optional): maximum number of bytes that are read at once. Defaults to \
+            64 KiB.
+
+    Yields:
+        list[bytes]: the complete lines of a chunk
+    """
+    rest = b""
+    while True:
+        chunk = await reader.read(chunk_size)
+        if len(chunk) == 0:
+            break
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()      # partial line, it gets completed by the next chunk
+        yield [line[:-1] if line.endswith(b"\r") else line for line in lines]
+
+    if len(rest) != 0:
+        yield [rest[:-1] if rest.endswith(b"\r") else rest]
+
+
+async def aiter_blocks(reader, storage="rows", encoding="latin-1", chunk_size=64 * 1024,
+                       parser=None):
+    """Parses an asyncio stream and yields the blocks as soon as they are complete.
+
+    Args:
+        reader (asyncio.StreamReader): stream containing the ADIS text
+        storage (string, optional): storage mode of the data rows, see AdisParser. Defaults \
+            to "rows".
+        encoding (string, optional): single-byte encoding of the stream. Defaults to "latin-1".
+        chunk_size (int, optional): maximum number of bytes that are parsed before control \
+            is given back to the event loop. Defaults to 64 KiB.
+        parser (AdisParser, optional): parser to use, e.g. to read its file index afterwards. \
+            storage and encoding are ignored if it is provided. Defaults to a new parser.
+
+    Yields:
+        tuple(int, AdisBlock): index of the logical file and the block
+    """
+    if parser is None:
+        parser = AdisParser(storage, encoding)
+    async for raw_lines in read_stream_lines(reader, chunk_size):
+        for raw_line in raw_lines:
+            completed_block = parser.feed(raw_line)
+            if completed_block is not None:
+                yield completed_block
+        await asyncio.sleep(0)      # let other tasks run between two chunks
+
+    completed_block = parser.finish()
+    if completed_block is not None:
+        yield completed_block
+
+
+class StreamTextWriter:
+    def __init__(self, stream_writer, encoding):
+        """Creates a text file like object that encodes the text and writes it to a stream.
+
+        Args:
+            stream_writer (asyncio.StreamWriter): stream the bytes get written to
+            encoding (string): encoding of the text
+        """
+        self.stream_writer = stream_writer
+        self.encoding = encoding
+        self.pending_bytes = 0
+
+    def write(self, text):
+        """Writes text to the stream without waiting for it to be sent.
+
+        Args:
+            text (string): text to write
+        """
+        data = text.encode(self.encoding)
+        self.stream_writer.write(data)
+        self.pending_bytes += len(data)
+
+
+class AdisAsyncWriter:
+    def __init__(self, stream_writer, encoding="latin-1", drain_size=64 * 1024):
+        """Creates an AdisAsyncWriter. It writes the same lines as the AdisWriter, but waits \
+            for the stream to drain whenever drain_size bytes have been written.
+
+        Args:
+            stream_writer (asyncio.StreamWriter): stream the ADIS text gets written to. Any \
+                object with write(bytes) and a coroutine drain() can be used.
+            encoding (string, optional): encoding of the ADIS text. Defaults to "latin-1".
+            drain_size (int, optional): number of bytes after which the stream is drained. \
+                Defaults to 64 KiB.
+        """
+        self.stream_writer = stream_writer
+        self.text_writer = StreamTextWriter(stream_writer, encoding)
+        self.writer = AdisWriter(self.text_writer)
+        self.drain_size = drain_size
+
+    async def drain(self, force=False):
+        """Waits until the written bytes are sent if enough bytes are pending.
+
+        Args:
+            force (bool, optional): Whether to drain even if less than drain_size bytes are \
+                pending. Defaults to False.
+        """
+        if force or self.text_writer.pending_bytes >= self.drain_size:
+            self.text_writer.pending_bytes = 0
+            await self.stream_writer.drain()
+
+    async def begin_block(self, entity_number, status, field_definitions, scaled=False):
+        """Writes the definition line of a new block, see AdisWriter.begin_block.
+
+        Args:
+            entity_number (string): Entity number of the block (has to be a string with 6 chars)
+            status (string): Status char of the block, can be H, N, S, F or D
+            field_definitions (list[AdisFieldDefinition]): Field definitions of the block
+            scaled (bool, optional): Whether integers in decimal fields are scaled integers. \
+                Defaults to False.
+        """
+        self.writer.begin_block(entity_number, status, field_definitions, scaled)
+        await self.drain()
+
+    async def write_row(self, data_row):
+        """Writes a value line for a data row of the current block, see AdisWriter.write_row.
+
+        Args:
+            data_row (list[AdisValue], dict): values of the data row
+        """
+        self.writer.write_row(data_row)
+        await self.drain()
+
+    async def write_values(self, values):
+        """Writes a value line from plain values, see AdisWriter.write_values.
+
+        Args:
+            values (list): one value per field definition, UNDEFINED for undefined fields
+        """
+        self.writer.write_values(values)
+        await self.drain()
+
+    async def write_block(self, block):
+        """Writes the definition line and all value lines of an AdisBlock.
+
+        Args:
+            block (AdisBlock): block to write
+        """
+        self.writer.begin_block(block.get_entity_number(), block.status,
+                                block.get_field_definitions(), block.decimals == "scaled")
+        for values in block.iter_values():
+            self.writer.write_values(values)
+            await self.drain()
+
+    async def end_logical_file(self):
+        """Writes the end of the current logical file ("EN")."""
+        self.writer.end_logical_file()
+        await self.drain()
+
+    async def close(self):
+        """Writes the physical end of the file ("ZN") and drains the stream. The stream itself \
+            is not closed."""
+        self.writer.close()
+        await self.drain(force=True)
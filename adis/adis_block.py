@@ -1,10 +1,24 @@
+import io
+from .adis_columns import AdisColumnarRows
 from .adis_field_definition import AdisFieldDefinition
+from .adis_lazy_rows import AdisLazyRows
+from .adis_numpy import (
+    block_to_dataframe,
+    block_to_numpy
+)
 from .adis_lines import (
     AdisLine,
     DefinitionLine,
     ValueLine
 )
-from .adis_value import AdisValue
+from .adis_schema import AdisSchema
+from .adis_tuple_rows import AdisTupleRows
+from .adis_value import (
+    AdisSerializationOptions,
+    AdisValue,
+    UNDEFINED
+)
+from .adis_writer import AdisWriter
 
 """
 An AdisBlock consists of one definition and (one or) multiple data rows.
@@ -12,15 +26,21 @@ Each data row has multiple fields.
 """
 
 class AdisBlock:
-    def __init__(self, entity_number, status, field_definitions, data_rows):
+    def __init__(self, entity_number, status, field_definitions, data_rows, decimals="float"):
         """Creates an AdisBlock object.
 
         Args:
             entity_number (string): Entity number of this Block (has to be a string with 6 chars)
             status (string): Status char of this block, can be H, N, S, F or D
             field_definintions (list[AdisFieldDefinition]): Field definitions
-            data_rows (list[list[AdisValue]]): list of data rows, each data row is a list \
-                containing AdisValue
+            data_rows (list[list[AdisValue]], AdisColumnarRows, AdisLazyRows, \
+                AdisTupleRows): list of data rows, each data row is a list containing \
+                AdisValue. AdisColumnarRows can be used instead of the list to store the data \
+                rows column by column, AdisLazyRows to decode the data rows only when they get \
+                accessed and AdisTupleRows to store each data row as a tuple of plain values.
+            decimals (string, optional): how the decimal fields of the data rows are decoded, \
+                see AdisRowDecoder. With "scaled" the integers of decimal fields are written \
+                as scaled integers. Defaults to "float".
         """
         if len(status) != 1:
             raise Exception("Status may only be one char.")
@@ -34,6 +54,7 @@ class AdisBlock:
         self.entity_number = entity_number
         self.field_definitions = field_definitions
         self.data_rows = data_rows
+        self.decimals = decimals
 
     def get_entity_number(self):
         """Returns the entity number of this block.
@@ -44,10 +65,12 @@ class AdisBlock:
         return self.entity_number
 
     def get_field_definitions(self):
-        """Returns the field definitions of this block.
+        """Returns the field definitions of this block. Blocks with the same layout share the \
+            immutable field definitions of their AdisSchema.
 
         Returns:
-            list[AdisFieldDefinition]: list containing field definitions
+            tuple[AdisFieldDefinition], list[AdisFieldDefinition]: field definitions, a tuple \
+                for parsed blocks
         """
         return self.field_definitions
     
@@ -59,6 +82,84 @@ class AdisBlock:
         """
         return self.data_rows
 
+    def iter_values(self):
+        """Yields the plain values of each data row without creating AdisValues for columnar \
+            lazy and tuple data rows.
+
+        Yields:
+            list: one value per field definition, UNDEFINED for undefined fields
+        """
+        data_rows = self.data_rows
+        if hasattr(data_rows, "get_values"):
+            for index in range(len(data_rows)):
+                yield data_rows.get_values(index)
+            return
+
+        item_numbers = [definition.get_item_number() for definition in self.field_definitions]
+        for data_row in data_rows:
+            values_by_item_number = {}
+            for value in data_row:
+                values_by_item_number[value.item_number] = value.value
+            yield [values_by_item_number.get(item_number, UNDEFINED)
+                   for item_number in item_numbers]
+
+    def is_columnar(self):
+        """Returns whether the data rows of this block are stored column by column.
+
+        Returns:
+            boolean: True if the data rows are stored in columns, otherwise False
+        """
+        return type(self.data_rows) == AdisColumnarRows
+
+    def to_columns(self):
+        """Returns the values of this block column by column. Decimal fields are stored in an \
+            AdisDecimalColumn, all other fields in a dictionary-encoded AdisTextColumn. Null \
+            fields are None and undefined fields are UNDEFINED when accessing a column.
+
+        Returns:
+            dict: item number as key and the column as value
+        """
+        if self.is_columnar():
+            return self.data_rows.get_columns()
+        if type(self.data_rows) == AdisLazyRows or type(self.data_rows) == AdisTupleRows:
+            return AdisColumnarRows.from_values(self.field_definitions, self.iter_values(),
+                                                self.decimals).get_columns()
+        return AdisColumnarRows.from_data_rows(self.field_definitions, self.data_rows,
+                                               self.decimals).get_columns()
+
+    def to_numpy(self, masked=False, strip_string_values=True):
+        """Creates a NumPy structured array from this block. The array has one field per \
+            field definition, named by the item number. Decimal fields are float64 and null \
+            or undefined decimal fields are NaN. Text fields are unicode strings of the field \
+            size and null or undefined text fields are empty. The array is built from the \
+            columns of the block, so columnar blocks are exported without creating AdisValues. \
+            Requires NumPy.
+
+        Args:
+            masked (bool, optional): Whether to return a masked array where null and undefined \
+                fields are masked. Defaults to False.
+            strip_string_values (bool, optional, by default True): Whether string values \
+                should be stripped or not.
+
+        Returns:
+            numpy.ndarray: structured array containing the data rows of this block
+        """
+        return block_to_numpy(self, masked, strip_string_values)
+
+    def to_dataframe(self, strip_string_values=True):
+        """Creates a pandas DataFrame from this block. The DataFrame has one column per field \
+            definition, named by the item number. Null or undefined decimal fields are NaN, \
+            null or undefined text fields are None. Requires pandas.
+
+        Args:
+            strip_string_values (bool, optional, by default True): Whether string values \
+                should be stripped or not.
+
+        Returns:
+            pandas.DataFrame: DataFrame containing the data rows of this block
+        """
+        return block_to_dataframe(self, strip_string_values)
+
     @staticmethod
     def from_lines(lines):
         """Creates an AdisBlock from a list of AdisLines
@@ -72,16 +173,18 @@ class AdisBlock:
         status = None
         entity_number = None
         field_definitions = None
+        decoder = None
         data_rows = []
         for line in lines:
             if type(line) == DefinitionLine:
                 status = line.get_status_char()
                 entity_number = line.get_entity_number()
                 field_definitions = line.get_field_definitions()
+                decoder = line.get_row_decoder()
             if type(line) == ValueLine:
                 if field_definitions is None:
                     raise Exception("Definition line is missing before value line")
-                data_rows.append(line.parse(field_definitions))
+                data_rows.append(decoder.decode(line.raw_items))
 
         if entity_number is None or field_definitions is None:
             raise Exception("Definition is missing.")
@@ -107,13 +210,13 @@ class AdisBlock:
             raise Exception("\"data\" field is missing in block dict.")
 
         status = block_dict["status"]
-        field_definitions = []
         for definition_dict in block_dict["definitions"]:
             if type(definition_dict) is not dict:
                 raise Exception("A field definition has to be a dict but got %s."
                                 % type(definition_dict))
-            definition = AdisFieldDefinition.from_dict(definition_dict)
-            field_definitions.append(definition)
+        # blocks with the same definitions share the interned field definitions
+        field_definitions = AdisSchema.for_definition_dicts(block_dict["definitions"]) \
+            .get_field_definitions()
 
         if type(block_dict["data"]) is not list:
             raise Exception("The data of each block has to be a list. Got %s."
@@ -136,12 +239,19 @@ class AdisBlock:
 
         return AdisBlock(entity_number, status, field_definitions, data_rows)
 
-    def to_dict(self):
+    def to_dict(self, options=None):
         """Creates a dict cointaining all data of this block
 
+        Args:
+            options (AdisSerializationOptions, optional): options of the conversion. Defaults \
+                to the class flag AdisValue.strip_string_values.
+
         Returns:
             dict: contains the field definitions, the data rows and the status of the block
         """
+        if options is None:
+            options = AdisSerializationOptions.from_class_flags()
+
         result_dict = {
             "definitions": [],
             "data": [],
@@ -150,24 +260,49 @@ class AdisBlock:
         for definition in self.field_definitions:
             result_dict["definitions"].append(definition.to_dict())
 
+        scaled_digits = self.get_scaled_digits()
         for data_row in self.data_rows:
-            result_dict["data"].append(self.data_row_to_dict(data_row))
+            result_dict["data"].append(self.data_row_to_dict(data_row, options, scaled_digits))
 
         return result_dict
 
-    def data_row_to_dict(self, data_row):
-        """Turns a data row to a dict.
+    def get_scaled_digits(self):
+        """Returns the decimal digits of the decimal fields if the values of this block are \
+            scaled integers.
+
+        Returns:
+            dict: item number as key and the number of decimal digits as value, empty unless \
+                the decimal mode is "scaled"
+        """
+        if self.decimals != "scaled":
+            return {}
+        return {definition.get_item_number(): definition.get_decimal_digits()
+                for definition in self.field_definitions
+                if definition.get_decimal_digits() != 0}
+
+    def data_row_to_dict(self, data_row, options=None, scaled_digits=None):
+        """Turns a data row to a dict. Scaled integers are turned into floats, so the dict \
+            holds the same values for all decimal modes.
 
         Args:
             data_row (list[AdisValue]): list containing the values of the data row
+            options (AdisSerializationOptions, optional): options of the conversion. Defaults \
+                to the class flag AdisValue.strip_string_values.
+            scaled_digits (dict, optional): result of get_scaled_digits, to avoid computing it \
+                for each data row. Defaults to None.
 
         Returns:
             dict: dict where the key is the item number and the value is the actual value of the \
                 field
         """
+        if options is None:
+            options = AdisSerializationOptions.from_class_flags()
+        if scaled_digits is None:
+            scaled_digits = self.get_scaled_digits()
+
         data_row_dict = {}
         for value in data_row:
-            value_as_dict = value.to_dict()
+            value_as_dict = value.to_dict(options, scaled_digits.get(value.item_number, 0))
             data_row_dict[value_as_dict["item_number"]] = value_as_dict["value"]
         return data_row_dict
 
@@ -177,11 +312,9 @@ class AdisBlock:
         Returns:
             string: ADIS definition line string
         """
-        text = "D" + self.status + self.entity_number
-        for definition in self.field_definitions:
-            text += definition.dumps()
-        text += "\r\n"
-        return text
+        output = io.StringIO()
+        AdisWriter(output).begin_block(self.entity_number, self.status, self.field_definitions)
+        return output.getvalue()
 
     def dumps_data(self):
         """Turns the data rows into value lines.
@@ -189,22 +322,12 @@ class AdisBlock:
         Returns:
             string: value lines
         """
-        text = ""
-        for data_row in self.data_rows:
-            # create a value line
-            text += "V" + self.status + self.entity_number
-            data_row_dict = self.data_row_to_dict(data_row)
-            for definition in self.field_definitions:
-                item_number = definition.get_item_number()
-                if item_number not in data_row_dict:
-                    # the value of this field is undefined
-                    text += definition.dumps_value(None, undefined=True)
-                else:
-                    value = data_row_dict[item_number]
-                    text += definition.dumps_value(value)
-            
-            text += "\r\n"
-        return text
+        output = io.StringIO()
+        writer = AdisWriter(output)
+        writer.resume_block(self.entity_number, self.status, self.field_definitions,
+                            self.decimals == "scaled")
+        writer.write_data_rows(self)
+        return output.getvalue()
 
     def dumps(self):
         """Creates an ADIS text form this block.
@@ -212,9 +335,12 @@ class AdisBlock:
         Returns:
             string: ADIS text of this block
         """
-        text = self.dumps_definitions()
-        text += self.dumps_data()
-        return text
+        output = io.StringIO()
+        AdisWriter(output).write_block(self)
+        return output.getvalue()
+
+    def __len__(self):
+        return len(self.data_rows)
 
     def __repr__(self):
         return "AdisBlock with status=%s and entity_number=%s containing %d data row(s)" \
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import pickle
+from .adis_block import AdisBlock
+from .adis_columns import (
+    AdisColumnarRows,
+    AdisDecimalColumn,
+    AdisScaledColumn,
+    AdisTextColumn
+)
+from .adis_file import AdisFile
+from .adis_schema import AdisSchema
+from .adis_tuple_rows import AdisTupleRows
+
+"""
+The AdisParseCache stores parsed ADIS files in a compact binary form: the field definitions and
+the columns of each block. Loading a cached file skips the whole decoding of the value lines.
+"""
+
+class AdisParseCache:
+    magic = b"ADISCACHE2\n"
+    extension = ".adiscache"
+
+    def __init__(self, cache_dir, max_bytes=1024**3, hash_content=False):
+        """Creates an AdisParseCache. The cache directory is created if it does not exist. \
+            Cache files are pickled, so the directory must not be writable by untrusted users.
+
+        Args:
+            cache_dir (string): directory the cache files are stored in
+            max_bytes (int, optional): the least recently used cache files are removed when the \
+                cache files take more bytes. Defaults to 1 GiB.
+            hash_content (bool, optional): Whether the cache key is the SHA-256 of the content \
+                of the ADIS file instead of its path, size and modification time. Defaults to \
+                False.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, path_to_file, options):
+        """Returns the cache key of an ADIS file.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            options (tuple): parse options that change the result (encoding, filters and \
+                decimal mode)
+
+        Returns:
+            string: hex digest that is used as file name of the cache file
+        """
+        key_hash = hashlib.sha256(repr(options).encode())
+        if self.hash_content:
+            with open(path_to_file, "rb") as input_file:
+                for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+                    key_hash.update(chunk)
+        else:
+            stat = os.stat(path_to_file)
+            key_hash.update(repr((os.path.abspath(path_to_file), stat.st_size,
+                                  stat.st_mtime_ns)).encode())
+        return key_hash.hexdigest()
+
+    def get_cache_path(self, key):
+        """Returns the path of a cache file.
+
+        Args:
+            key (string): cache key
+
+        Returns:
+            string: Path to the cache file
+        """
+        return os.path.join(self.cache_dir, key + AdisParseCache.extension)
+
+    def load(self, path_to_file, options):
+        """Loads the cached logical files of an ADIS file.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            options (tuple): parse options that change the result (encoding, filters and \
+                decimal mode)
+
+        Returns:
+            list[AdisFile]: logical files with columnar data rows, or None if there is no \
+                valid cache file. Corrupt and stale cache files are removed.
+        """
+        cache_path = self.get_cache_path(self.get_key(path_to_file, options))
+        try:
+            with open(cache_path, "rb") as input_file:
+                content = input_file.read()
+        except OSError:
+            return None
+
+        try:
+            header_size = len(AdisParseCache.magic)
+            checksum = content[header_size:header_size + 32]
+            payload = content[header_size + 32:]
+            if content[:header_size] != AdisParseCache.magic \
+                    or hashlib.sha256(payload).digest() != checksum:
+                raise ValueError("corrupt cache file")
+            size, files = pickle.loads(payload)
+            if size != os.path.getsize(path_to_file):
+                raise ValueError("stale cache file")
+            adis_files = [AdisFile([AdisParseCache.block_from_tuple(block_tuple)
+                                    for block_tuple in blocks])
+                          for blocks in files]
+        except Exception:
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+
+        os.utime(cache_path)    # the modification time marks the last use for the eviction
+        return adis_files
+
+    def save(self, path_to_file, options, adis_files):
+        """Stores the logical files of an ADIS file and evicts the least recently used cache \
+            files if the cache got too large.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            options (tuple): parse options that change the result (encoding, filters and \
+                decimal mode)
+            adis_files (list[AdisFile]): logical files with columnar data rows
+        """
+        payload = pickle.dumps((
+            os.path.getsize(path_to_file),
+            [[AdisParseCache.block_to_tuple(block) for block in adis_file.get_blocks()]
+             for adis_file in adis_files]
+        ), protocol=pickle.HIGHEST_PROTOCOL)
+
+        cache_path = self.get_cache_path(self.get_key(path_to_file, options))
+        temporary_path = cache_path + ".part"
+        with open(temporary_path, "wb") as output_file:
+            output_file.write(AdisParseCache.magic)
+            output_file.write(hashlib.sha256(payload).digest())
+            output_file.write(payload)
+        os.replace(temporary_path, cache_path)
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used cache files until the cache files take at most \
+            max_bytes bytes."""
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(AdisParseCache.extension):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+    @staticmethod
+    def block_to_tuple(block):
+        """Turns a block with columnar data rows into builtin types and arrays.
+
+        Args:
+            block (AdisBlock): block with AdisColumnarRows
+
+        Returns:
+            tuple: entity number, status, field definitions, columns and decimal mode
+        """
+        definitions = [(definition.get_item_number(), definition.get_field_size(),
+                        definition.get_decimal_digits())
+                       for definition in block.get_field_definitions()]
+        columns = []
+        for column in block.get_data_rows().columns:
+            if type(column) == AdisDecimalColumn:
+                columns.append(("d", column.get_values(), bytes(column.get_mask())))
+            elif type(column) == AdisScaledColumn:
+                columns.append(("s", column.get_values(), bytes(column.get_mask())))
+            else:
+                columns.append(("t", column.get_dictionary(), column.get_codes()))
+        return block.get_entity_number(), block.status, definitions, columns, block.decimals
+
+    @staticmethod
+    def block_from_tuple(block_tuple):
+        """Creates a block with columnar data rows from the result of block_to_tuple.
+
+        Args:
+            block_tuple (tuple): entity number, status, field definitions, columns and decimal \
+                mode
+
+        Returns:
+            AdisBlock: block with AdisColumnarRows
+        """
+        entity_number, status, definitions, column_tuples, decimals = block_tuple
+        field_definitions = AdisSchema.for_definitions_text("".join(
+            "%s%02d%d" % definition for definition in definitions)).get_field_definitions()
+        columns = []
+        for definition, (column_type, first, second) in zip(field_definitions, column_tuples):
+            if column_type == "d" or column_type == "s":
+                if column_type == "d":
+                    column = AdisDecimalColumn(definition.get_decimal_digits())
+                else:
+                    column = AdisScaledColumn(definition.get_decimal_digits(), decimals)
+                column.values = first
+                column.mask = bytearray(second)
+            else:
+                column = AdisTextColumn()
+                column.dictionary = first
+                column.codes_by_value = {value: code for code, value in enumerate(first)}
+                column.codes = second
+            columns.append(column)
+        return AdisBlock(entity_number, status, field_definitions,
+                         AdisColumnarRows(field_definitions, columns), decimals)
+
+    @staticmethod
+    def convert_storage(adis_files, storage):
+        """Converts the columnar data rows of logical files to another storage mode.
+
+        Args:
+            adis_files (list[AdisFile]): logical files with columnar data rows
+            storage (string): "rows", "columnar" or "tuples"
+
+        Returns:
+            list[AdisFile]: the logical files with the data rows in the requested storage mode
+        """
+        if storage == "columnar":
+            return adis_files
+        for adis_file in adis_files:
+            for block in adis_file.get_blocks():
+                if storage == "tuples":
+                    block.data_rows = AdisTupleRows(block.get_field_definitions(),
+                                                    block.get_data_rows().to_tuples())
+                else:
+                    block.data_rows = block.get_data_rows().to_rows()
+        return adis_files
@@ -0,0 +1,432 @@
+from array import array
+from decimal import Decimal
+from .adis_value import (
+    AdisValue,
+    decimal_context,
+    scaled_to_decimal,
+    UNDEFINED
+)
+
+"""
+Columnar storage for the data rows of an AdisBlock. Each AdisFieldDefinition gets one compact
+column instead of one AdisValue per row and field.
+"""
+
+class AdisDecimalColumn:
+    VALUE = 0
+    NULL = 1
+    UNDEFINED = 2
+    value_types = (float,)
+
+    def __init__(self, decimal_digits):
+        """Creates an empty column for a decimal field. The values are stored in an \
+            array("d") and a mask marks null and undefined fields.
+
+        Args:
+            decimal_digits (int): number of decimal digits of the field
+        """
+        self.decimal_digits = decimal_digits
+        self.values = array("d")
+        self.mask = bytearray()
+
+    def append(self, value):
+        """Appends a value to the column.
+
+        Args:
+            value (None, float, UNDEFINED): value of the field
+        """
+        if value is None:
+            self.values.append(0.0)
+            self.mask.append(AdisDecimalColumn.NULL)
+        elif value is UNDEFINED:
+            self.values.append(0.0)
+            self.mask.append(AdisDecimalColumn.UNDEFINED)
+        else:
+            self.values.append(value)
+            self.mask.append(AdisDecimalColumn.VALUE)
+
+    def extend(self, column):
+        """Appends all values of another decimal column to this column.
+
+        Args:
+            column (AdisDecimalColumn): column whose values get appended
+        """
+        self.values.extend(column.values)
+        self.mask.extend(column.mask)
+
+    def get_values(self):
+        """Returns the values of the column. Null and undefined fields hold 0.0, use the mask \
+            to tell them apart.
+
+        Returns:
+            array: array("d") containing the values
+        """
+        return self.values
+
+    def get_mask(self):
+        """Returns the mask of the column. Each entry is VALUE, NULL or UNDEFINED.
+
+        Returns:
+            bytearray: mask of the column
+        """
+        return self.mask
+
+    def to_list(self):
+        """Returns all values of the column at once, which is much faster than accessing them \
+            one by one.
+
+        Returns:
+            list: values of the column, None for null and UNDEFINED for undefined fields
+        """
+        fill_values = [None, None, UNDEFINED]      # indexed by NULL and UNDEFINED
+        return [value if state == AdisDecimalColumn.VALUE else fill_values[state]
+                for value, state in zip(self.values.tolist(), self.mask)]
+
+    def __getitem__(self, index):
+        state = self.mask[index]
+        if state == AdisDecimalColumn.VALUE:
+            return self.values[index]
+        if state == AdisDecimalColumn.NULL:
+            return None
+        return UNDEFINED
+
+    def __len__(self):
+        return len(self.mask)
+
+    def __iter__(self):
+        for index in range(len(self.mask)):
+            yield self[index]
+
+    def __repr__(self):
+        return "AdisDecimalColumn containing %d value(s)" % len(self.mask)
+
+
+class AdisScaledColumn(AdisDecimalColumn):
+    value_types = (int, Decimal)
+    # larger fields may not fit into a 64 bit integer
+    max_field_size = 18
+
+    def __init__(self, decimal_digits, decimals="scaled"):
+        """Creates an empty column for a decimal field that is decoded exactly. The values \
+            are stored as scaled integers in an array("q"), i.e. the digits of the field \
+            including the decimal digits.
+
+        Args:
+            decimal_digits (int): number of decimal digits of the field
+            decimals (string, optional): "scaled" to return the scaled integers or "decimal" \
+                to return Decimals when the values get accessed. Defaults to "scaled".
+        """
+        self.decimal_digits = decimal_digits
+        self.decimals = decimals
+        self.values = array("q")
+        self.mask = bytearray()
+
+    def append(self, value):
+        """Appends a value to the column.
+
+        Args:
+            value (None, int, Decimal, UNDEFINED): value of the field, an int is a scaled \
+                integer
+        """
+        if value is None:
+            self.values.append(0)
+            self.mask.append(AdisDecimalColumn.NULL)
+        elif value is UNDEFINED:
+            self.values.append(0)
+            self.mask.append(AdisDecimalColumn.UNDEFINED)
+        else:
+            if type(value) is not int:
+                value = int(value.scaleb(self.decimal_digits, decimal_context))
+            self.values.append(value)
+            self.mask.append(AdisDecimalColumn.VALUE)
+
+    def to_list(self):
+        """Returns all values of the column at once. Decimals are created in one pass over \
+            the whole column.
+
+        Returns:
+            list: scaled integers or Decimals, None for null and UNDEFINED for undefined fields
+        """
+        values = AdisDecimalColumn.to_list(self)
+        if self.decimals == "decimal":
+            decimal_digits = self.decimal_digits
+            values = [scaled_to_decimal(value, decimal_digits) if type(value) is int else value
+                      for value in values]
+        return values
+
+    def __getitem__(self, index):
+        value = AdisDecimalColumn.__getitem__(self, index)
+        if self.decimals == "decimal" and type(value) is int:
+            return scaled_to_decimal(value, self.decimal_digits)
+        return value
+
+    def __repr__(self):
+        return "AdisScaledColumn containing %d value(s)" % len(self.mask)
+
+
+class AdisTextColumn:
+    NULL_CODE = -1
+    UNDEFINED_CODE = -2
+
+    def __init__(self):
+        """Creates an empty column for a text field. The column is dictionary-encoded: each \
+            distinct value is stored once and the rows only hold codes in an array("i").
+        """
+        self.dictionary = []
+        self.codes_by_value = {}
+        self.codes = array("i")
+
+    def append(self, value):
+        """Appends a value to the column.
+
+        Args:
+            value (None, string, UNDEFINED): value of the field
+        """
+        if value is None:
+            self.codes.append(AdisTextColumn.NULL_CODE)
+        elif value is UNDEFINED:
+            self.codes.append(AdisTextColumn.UNDEFINED_CODE)
+        else:
+            code = self.codes_by_value.get(value)
+            if code is None:
+                code = len(self.dictionary)
+                self.dictionary.append(value)
+                self.codes_by_value[value] = code
+            self.codes.append(code)
+
+    def extend(self, column):
+        """Appends all values of another text column to this column.
+
+        Args:
+            column (AdisTextColumn): column whose values get appended
+        """
+        # translate the codes of the other column into codes of this column
+        codes_by_other_code = [-2, -1]      # UNDEFINED_CODE and NULL_CODE stay the same
+        for value in column.dictionary:
+            code = self.codes_by_value.get(value)
+            if code is None:
+                code = len(self.dictionary)
+                self.dictionary.append(value)
+                self.codes_by_value[value] = code
+            codes_by_other_code.append(code)
+        self.codes.extend(array("i", [codes_by_other_code[code + 2] for code in column.codes]))
+
+    def get_dictionary(self):
+        """Returns the distinct values of the column.
+
+        Returns:
+            list: distinct values, the codes are indices into this list
+        """
+        return self.dictionary
+
+    def get_codes(self):
+        """Returns the codes of the column. Null fields have the code NULL_CODE and undefined \
+            fields the code UNDEFINED_CODE.
+
+        Returns:
+            array: array("i") containing the codes
+        """
+        return self.codes
+
+    def to_list(self):
+        """Returns all values of the column at once, which is much faster than accessing them \
+            one by one.
+
+        Returns:
+            list: values of the column, None for null and UNDEFINED for undefined fields
+        """
+        values_by_code = [UNDEFINED, None] + self.dictionary     # shifted by 2 for the codes < 0
+        return [values_by_code[code + 2] for code in self.codes]
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        if code >= 0:
+            return self.dictionary[code]
+        if code == AdisTextColumn.NULL_CODE:
+            return None
+        return UNDEFINED
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        for index in range(len(self.codes)):
+            yield self[index]
+
+    def __repr__(self):
+        return "AdisTextColumn containing %d value(s) and %d distinct value(s)" \
+            % (len(self.codes), len(self.dictionary))
+
+
+def create_column(field_definition, decimals="float"):
+    """Creates an empty column that fits the provided field definition.
+
+    Args:
+        field_definition (AdisFieldDefinition): field definition of the column
+        decimals (string, optional): how decimal fields are decoded, see AdisRowDecoder. \
+            Defaults to "float".
+
+    Returns:
+        AdisDecimalColumn, AdisScaledColumn, AdisTextColumn: new column
+    """
+    decimal_digits = field_definition.get_decimal_digits()
+    if decimal_digits == 0:
+        return AdisTextColumn()
+    if decimals == "float":
+        return AdisDecimalColumn(decimal_digits)
+    if field_definition.get_field_size() <= AdisScaledColumn.max_field_size:
+        return AdisScaledColumn(decimal_digits, decimals)
+    return AdisTextColumn()     # the dictionary holds the integers or Decimals
+
+
+class AdisColumnarRows:
+    def __init__(self, field_definitions, columns=None, decimals="float"):
+        """Creates columnar data rows. The object behaves like the list of data rows of an \
+            AdisBlock, but the values are kept in one column per field definition and each \
+            data row is only turned into AdisValues when it gets accessed.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the block
+            columns (list, optional): one column per field definition. Empty columns are \
+                created if not provided.
+            decimals (string, optional): how decimal fields are decoded, see AdisRowDecoder. \
+                Only used to create the empty columns. Defaults to "float".
+        """
+        self.field_definitions = field_definitions
+        self.item_numbers = [definition.get_item_number() for definition in field_definitions]
+        if columns is None:
+            columns = [create_column(definition, decimals) for definition in field_definitions]
+        self.columns = columns
+
+    def append_values(self, values):
+        """Appends a data row.
+
+        Args:
+            values (list): one value per field definition, UNDEFINED for undefined fields
+        """
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def extend(self, columnar_rows):
+        """Appends all data rows of other columnar data rows with the same field definitions.
+
+        Args:
+            columnar_rows (AdisColumnarRows): data rows that get appended
+        """
+        for column, other_column in zip(self.columns, columnar_rows.columns):
+            column.extend(other_column)
+
+    def get_columns(self):
+        """Returns the columns.
+
+        Returns:
+            dict: item number as key and the column as value
+        """
+        return dict(zip(self.item_numbers, self.columns))
+
+    def get_values(self, index):
+        """Returns the values of a data row.
+
+        Args:
+            index (int): index of the data row
+
+        Returns:
+            list: one value per field definition, UNDEFINED for undefined fields
+        """
+        return [column[index] for column in self.columns]
+
+    def to_tuples(self):
+        """Returns the values of all data rows at once.
+
+        Returns:
+            list[tuple]: one tuple per data row that contains one value per field definition, \
+                UNDEFINED for undefined fields
+        """
+        if len(self.columns) == 0:
+            return []
+        return list(zip(*[column.to_list() for column in self.columns]))
+
+    def to_rows(self):
+        """Returns all data rows at once as lists of AdisValues.
+
+        Returns:
+            list[list[AdisValue]]: data rows, undefined fields are left out
+        """
+        item_numbers = self.item_numbers
+        return [[AdisValue(item_number, value)
+                 for item_number, value in zip(item_numbers, values) if value is not UNDEFINED]
+                for values in self.to_tuples()]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        data_row = []
+        for item_number, column in zip(self.item_numbers, self.columns):
+            value = column[index]
+            if value is not UNDEFINED:
+                data_row.append(AdisValue(item_number, value))
+        return data_row
+
+    def __len__(self):
+        if len(self.columns) == 0:
+            return 0
+        return len(self.columns[0])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @staticmethod
+    def from_values(field_definitions, values_of_rows, decimals="float"):
+        """Creates columnar data rows from the plain values of data rows.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the block
+            values_of_rows (iterable[list]): one list per data row that contains one value per \
+                field definition, UNDEFINED for undefined fields
+            decimals (string, optional): how the decimal fields of the values are decoded, see \
+                AdisRowDecoder. Defaults to "float".
+
+        Returns:
+            AdisColumnarRows: new columnar data rows
+        """
+        columnar_rows = AdisColumnarRows(field_definitions, decimals=decimals)
+        for values in values_of_rows:
+            columnar_rows.append_values(values)
+        return columnar_rows
+
+    @staticmethod
+    def from_data_rows(field_definitions, data_rows, decimals="float"):
+        """Creates columnar data rows from a list of data rows.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the block
+            data_rows (list[list[AdisValue]]): data rows, each data row is a list of AdisValues
+            decimals (string, optional): how the decimal fields of the data rows are decoded, \
+                see AdisRowDecoder. Defaults to "float".
+
+        Returns:
+            AdisColumnarRows: new columnar data rows
+        """
+        item_numbers = [definition.get_item_number() for definition in field_definitions]
+        values_of_fields = [[] for _ in field_definitions]
+        for data_row in data_rows:
+            values_by_item_number = {}
+            for value in data_row:
+                values_by_item_number[value.item_number] = value.value
+            for item_number, values in zip(item_numbers, values_of_fields):
+                values.append(values_by_item_number.get(item_number, UNDEFINED))
+
+        columns = []
+        for definition, values in zip(field_definitions, values_of_fields):
+            column = create_column(definition, decimals)
+            if isinstance(column, AdisDecimalColumn) and not all(
+                    value is None or value is UNDEFINED or type(value) in column.value_types
+                    for value in values):
+                column = AdisTextColumn()   # e.g. strings in a decimal field of a JSON input
+            for value in values:
+                column.append(value)
+            columns.append(column)
+
+        return AdisColumnarRows(field_definitions, columns)
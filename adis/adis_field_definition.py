@@ -1,11 +1,19 @@
-from .adis_value import AdisValue
+from decimal import Decimal
+from .adis_value import (
+    AdisValue,
+    decimal_context,
+    scaled_to_decimal
+)
 
 """
 The AdisFieldDefinition holds information about the size and the decimal places of the data fields.
 """
 class AdisFieldDefinition:
+    __slots__ = ("item_number", "field_size", "decimal_digits")
+
     def __init__(self, item_number, field_size, decimal_digits):
-        """Creates an AdisFieldDefinition.
+        """Creates an AdisFieldDefinition. Field definitions are immutable, since blocks with \
+            the same layout share them (see AdisSchema).
 
         Args:
             item_number (string): item number of the fields
@@ -16,17 +24,26 @@ class AdisFieldDefinition:
         if type(item_number) is not str or len(item_number) != 8:
             raise Exception("The item_number has to be a string with length = 8. Got \"%s\""
                 % item_number)
-        self.item_number = item_number
-        
-        self.field_size = int(field_size)
-        if self.field_size < 1 or 99 < self.field_size:
+        object.__setattr__(self, "item_number", item_number)
+
+        field_size = int(field_size)
+        if field_size < 1 or 99 < field_size:
             raise Exception("The field size has to be a number between 1 and 99. Got %d."
-                % self.field_size)
-        
-        self.decimal_digits = int(decimal_digits)
-        if self.decimal_digits < 0 or 9 < self.decimal_digits:
+                % field_size)
+        object.__setattr__(self, "field_size", field_size)
+
+        decimal_digits = int(decimal_digits)
+        if decimal_digits < 0 or 9 < decimal_digits:
             raise Exception("The number of decimal digits has to be a number between 0 and 9. " \
-                "Got %d." % self.decimal_digits)
+                "Got %d." % decimal_digits)
+        object.__setattr__(self, "decimal_digits", decimal_digits)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AdisFieldDefinition is immutable, it is shared by all blocks with " \
+            "the same field definitions.")
+
+    def __reduce__(self):
+        return AdisFieldDefinition, (self.item_number, self.field_size, self.decimal_digits)
 
     def get_item_number(self):
         """Returns the item number.
@@ -52,12 +69,14 @@ class AdisFieldDefinition:
         """
         return self.decimal_digits
 
-    def parse_field_at_position(self, raw_text, position):
+    def parse_field_at_position(self, raw_text, position, decimals="float"):
         """Parses 
 
         Args:
             raw_text (string): raw ADIS file line
             position (int): position where to start to parse the field from
+            decimals (string, optional): how a decimal field is decoded: "float", "scaled" \
+                (the digits as integer) or "decimal" (an exact Decimal). Defaults to "float".
 
         Returns:
             AdisValue: AdisValue of the parsed field, or None if the value of the field is \
@@ -82,8 +101,13 @@ class AdisFieldDefinition:
 
         # handle case where it's a decimal number
         if value is not None and self.decimal_digits != 0:
-            value = float(value)
-            value /= 10**self.decimal_digits
+            if decimals == "float":
+                value = float(value)
+                value /= 10**self.decimal_digits
+            else:
+                value = int(value)
+                if decimals == "decimal":
+                    value = scaled_to_decimal(value, self.decimal_digits)
 
         return AdisValue(item_number, value)
 
@@ -126,12 +150,14 @@ class AdisFieldDefinition:
         text += str(self.decimal_digits)    # only 1 char window
         return text
 
-    def dumps_value(self, value, undefined=False):
+    def dumps_value(self, value, undefined=False, scaled=False):
         """Dumps the provided AdisValue to a string.
 
         Args:
             value (AdisValue): value that should be turned to a string
             undefined (bool, optional): Whether the value is undefined or not. Defaults to False.
+            scaled (bool, optional): Whether integers are scaled integers, i.e. already hold \
+                the digits of the field including the decimal digits. Defaults to False.
 
         Returns:
             string: string that holds the given AdisValue in the correct way
@@ -140,6 +166,14 @@ class AdisFieldDefinition:
             return self.field_size * "|"
         if value is None:
             return self.field_size * "?"
+        if (scaled and type(value) is int) or type(value) is Decimal:
+            # exact values are written as digits without searching the decimal dot
+            digits = value if type(value) is int \
+                else value.scaleb(self.decimal_digits, decimal_context)
+            text = "%*d" % (self.field_size, digits)
+            if self.field_size < len(text):
+                raise Exception(f"Number {value} is too large for this field.")
+            return text
         elif type(value) is str:
             if self.field_size < len(value):
                 raise Exception("value \"%s\" is too long for this field." % value)
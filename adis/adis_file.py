@@ -1,5 +1,7 @@
+import io
 from .adis_block import AdisBlock
 from .adis_lines import DefinitionLine
+from .adis_writer import AdisWriter
 
 """
 An AdisFile contains multiple AdisBlocks.
@@ -86,15 +88,19 @@ class AdisFile:
 
         return blocks
 
-    def to_dict(self):
+    def to_dict(self, options=None):
         """Creates a dict from the AdisFile.
 
+        Args:
+            options (AdisSerializationOptions, optional): options of the conversion. Defaults \
+                to the class flag AdisValue.strip_string_values.
+
         Returns:
             dict: contains all data of the blocks in this file
         """
         data = {}
         for block in self.blocks:
-            data[block.get_entity_number()] = block.to_dict()
+            data[block.get_entity_number()] = block.to_dict(options)
         return data
 
     def dumps(self):
@@ -103,11 +109,11 @@ class AdisFile:
         Returns:
             string: ADIS text of this AdisFile
         """
-        text = ""
+        output = io.StringIO()
+        writer = AdisWriter(output)
         for block in self.blocks:
-            text += block.dumps()
-
-        return text
+            writer.write_block(block)
+        return output.getvalue()
 
     def __repr__(self):
         return "AdisFile contains %d blocks" % len(self.blocks)
@@ -0,0 +1,121 @@
+import os
+import time
+from .adis_parser import AdisParser
+
+"""
+The AdisFollowReader reads an ADIS file that is still being written. It remembers the byte offset
+of the first unread line and the current definition line, so each poll only decodes the lines
+that have been appended since the last poll.
+"""
+
+class AdisFollowReader:
+    chunk_size = 1024 * 1024    # bytes that are read at once
+
+    def __init__(self, path_to_file, position=None, entity=None, encoding="latin-1"):
+        """Creates an AdisFollowReader.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            position (dict, optional): resume position as returned by get_position. Defaults \
+                to the start of the file.
+            entity (string, optional): only yield the data rows of blocks with this entity \
+                number. Defaults to all entities.
+            encoding (string, optional): single-byte encoding of the file. Defaults to \
+                "latin-1".
+        """
+        self.path_to_file = path_to_file
+        self.entity = entity
+        self.encoding = encoding
+        self.offset = 0
+        self.parser = AdisParser(encoding=encoding)
+
+        if position is not None:
+            self.offset = position["offset"]
+            if position["definition_line"] is not None:
+                self.parser.feed(position["definition_line"])
+            self.parser.file_index = position["file_index"]
+
+    def get_position(self):
+        """Returns the resume position. It only contains builtin types, so it can be saved as \
+            JSON and passed to a new AdisFollowReader later.
+
+        Returns:
+            dict: byte offset of the first unread line, the current definition line (None if \
+                there is no current block) and the index of the current logical file
+        """
+        definition_line = self.parser.definition_line
+        return {
+            "offset": self.offset,
+            "definition_line": definition_line.line if definition_line is not None else None,
+            "file_index": self.parser.get_file_index()
+        }
+
+    def poll(self):
+        """Yields the data rows of the complete lines that have been appended since the last \
+            poll. The file is read in chunks of chunk_size bytes, so a large unread part is \
+            never held in memory at once. A partial line at the end of the file is left for \
+            the next poll. If the file got shorter than the current offset, it is assumed to be \
+            a new file and is read from the start.
+
+        Yields:
+            tuple(int, string, list[AdisValue]): index of the logical file, entity number of the \
+                block and the data row
+        """
+        try:
+            size = os.path.getsize(self.path_to_file)
+        except FileNotFoundError:
+            return      # the file may be rotated right now
+        if size < self.offset:
+            self.offset = 0
+            self.parser = AdisParser(encoding=self.encoding)
+        if size == self.offset:
+            return
+
+        with open(self.path_to_file, "rb") as input_file:
+            input_file.seek(self.offset)
+            remaining = size - self.offset
+            data = b""
+            while remaining > 0:
+                chunk = input_file.read(min(self.chunk_size, remaining))
+                if len(chunk) == 0:
+                    break       # the file got truncated while reading it
+                remaining -= len(chunk)
+                data += chunk   # data only holds the partial line of the last chunk before
+
+                data_offset = self.offset
+                position = 0
+                while True:
+                    line_end = data.find(b"\n", position)
+                    if line_end == -1:
+                        break   # partial line, it gets completed by the next chunk or poll
+                    raw_line = data[position:line_end]
+                    if raw_line.endswith(b"\r"):
+                        raw_line = raw_line[:-1]
+                    position = line_end + 1
+
+                    rows = list(self.parser.iter_rows((raw_line,), self.entity))
+                    self.offset = data_offset + position
+                    yield from rows
+                data = data[position:]
+
+    def follow(self, poll_interval=1.0, max_polls=None):
+        """Polls the file until interrupted or until max_polls polls have been done and yields \
+            the data rows as they get appended.
+
+        Args:
+            poll_interval (float, optional): seconds between two polls. Defaults to 1.0.
+            max_polls (int, optional): number of polls. Defaults to None (poll forever).
+
+        Yields:
+            tuple(int, string, list[AdisValue]): index of the logical file, entity number of the \
+                block and the data row
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            yield from self.poll()
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(poll_interval)
+
+    def __repr__(self):
+        return "AdisFollowReader for %s at byte offset %d" % (self.path_to_file, self.offset)
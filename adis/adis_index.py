@@ -0,0 +1,97 @@
+from .adis_value import (
+    AdisValue,
+    UNDEFINED
+)
+
+"""
+The AdisIndex maps entity numbers to the blocks of all logical files and item numbers to the
+position of their field within each block, so queries do not have to scan all files and blocks.
+"""
+
+class AdisIndex:
+    def __init__(self, adis_files):
+        """Creates an AdisIndex over the provided logical files. The index is built once, it \
+            does not notice blocks that are added to the files afterwards.
+
+        Args:
+            adis_files (list[AdisFile]): logical ADIS files
+        """
+        # entity number -> list of (file index, block, item number -> position of the field)
+        self.blocks_by_entity = {}
+        # id of the block -> item number -> position of the field
+        self.positions_by_block = {}
+        for file_index, adis_file in enumerate(adis_files):
+            for block in adis_file.get_blocks():
+                positions = {}
+                for position, definition in enumerate(block.get_field_definitions()):
+                    positions[definition.get_item_number()] = position
+                self.blocks_by_entity.setdefault(block.get_entity_number(), []).append(
+                    (file_index, block, positions))
+                self.positions_by_block[id(block)] = positions
+
+    def get_entity_numbers(self):
+        """Returns the entity numbers of all blocks.
+
+        Returns:
+            list[string]: entity numbers in the order of their first appearance
+        """
+        return list(self.blocks_by_entity)
+
+    def get_blocks(self, entity):
+        """Returns the blocks of an entity from all logical files.
+
+        Args:
+            entity (string): entity number
+
+        Returns:
+            list[tuple(int, AdisBlock)]: index of the logical file and the block
+        """
+        return [(file_index, block)
+                for file_index, block, _ in self.blocks_by_entity.get(entity, [])]
+
+    def get_item_position(self, block, item_number):
+        """Returns the position of a field within the data rows of a block.
+
+        Args:
+            block (AdisBlock): block that is part of the index
+            item_number (string): item number of the field
+
+        Returns:
+            int: position of the field, or None if the block does not define the item
+        """
+        positions = self.positions_by_block.get(id(block))
+        if positions is None:
+            return None
+        return positions.get(item_number)
+
+    def select(self, entity, items=None):
+        """Returns the data rows of an entity from all logical files.
+
+        Args:
+            entity (string): entity number
+            items (list[string], optional): item numbers of the fields that are returned, in \
+                this order. Items that a block does not define are left out for its data rows. \
+                Defaults to all fields.
+
+        Returns:
+            list[tuple(int, list[AdisValue])]: index of the logical file and the data row
+        """
+        rows = []
+        for file_index, block, positions in self.blocks_by_entity.get(entity, []):
+            if items is None:
+                rows.extend((file_index, data_row) for data_row in block.get_data_rows())
+                continue
+
+            selected_fields = [(item_number, positions[item_number]) for item_number in items
+                               if item_number in positions]
+            for values in block.iter_values():
+                data_row = []
+                for item_number, position in selected_fields:
+                    value = values[position]
+                    if value is not UNDEFINED:
+                        data_row.append(AdisValue(item_number, value))
+                rows.append((file_index, data_row))
+        return rows
+
+    def __repr__(self):
+        return "AdisIndex containing %d entity number(s)" % len(self.blocks_by_entity)
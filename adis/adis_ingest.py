@@ -0,0 +1,237 @@
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .adis import Adis
+
+"""
+The AdisIngestService watches an inbox directory for ADIS files and converts them to JSON or NDJSON
+with a pool of worker processes. The inbox is polled, no external services are needed.
+"""
+
+logger = logging.getLogger("adis.ingest")
+
+
+def convert_file(path_to_file, path_to_output_file, ndjson=False, strip_string_values=True,
+                 encoding="latin-1"):
+    """Converts an ADIS file to JSON or NDJSON. This function runs in the worker processes. The \
+        output is written to a temporary file first, which is renamed when it is complete.
+
+    Args:
+        path_to_file (string): Path to the ADIS file
+        path_to_output_file (string): Path to the JSON or NDJSON file
+        ndjson (bool, optional): Whether to write NDJSON instead of JSON. Defaults to False.
+        strip_string_values (bool, optional, by default True): Whether string values should \
+            be stripped or not.
+        encoding (string, optional): encoding of the ADIS file. Defaults to "latin-1".
+
+    Returns:
+        dict: number of rows and bytes of the ADIS file and the conversion time in seconds
+    """
+    start_time = time.perf_counter()
+    temporary_path = path_to_output_file + ".part"
+    try:
+        with open(temporary_path, "w") as output_file:
+            if ndjson:
+                number_of_rows = Adis.dump_ndjson_from_file(path_to_file, output_file,
+                                                            strip_string_values,
+                                                            encoding=encoding)
+            else:
+                adis = Adis.parse_from_file(path_to_file, storage="columnar", encoding=encoding)
+                adis.dump_json(output_file, strip_string_values)
+                number_of_rows = 0
+                for adis_file in adis.get_files():
+                    for block in adis_file.get_blocks():
+                        number_of_rows += len(block)
+        os.replace(temporary_path, path_to_output_file)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    return {
+        "rows": number_of_rows,
+        "bytes": os.path.getsize(path_to_file),
+        "seconds": time.perf_counter() - start_time
+    }
+
+
+class AdisIngestService:
+    def __init__(self, inbox_dir, output_dir, done_dir, failed_dir, workers=None, ndjson=False,
+                 strip_string_values=True, poll_interval=1.0, encoding="latin-1"):
+        """Creates an AdisIngestService. ADIS files (*.ads) that appear in the inbox are \
+            converted once their size and modification time did not change between two polls. \
+            Converted files are moved to the done directory, files that could not be converted \
+            to the failed directory. A file that cannot be moved stays in the inbox and is \
+            not converted again until its size or modification time changes.
+
+        Args:
+            inbox_dir (string): directory that is watched for ADIS files
+            output_dir (string): directory the JSON or NDJSON files are written to
+            done_dir (string): directory converted ADIS files are moved to
+            failed_dir (string): directory ADIS files that could not be converted are moved to
+            workers (int, optional): number of worker processes. Defaults to the number of CPUs.
+            ndjson (bool, optional): Whether to write NDJSON instead of JSON. Defaults to False.
+            strip_string_values (bool, optional, by default True): Whether string values \
+                should be stripped or not.
+            poll_interval (float, optional): seconds between two polls. Defaults to 1.0.
+            encoding (string, optional): encoding of the ADIS files. Defaults to "latin-1".
+        """
+        self.inbox_dir = inbox_dir
+        self.output_dir = output_dir
+        self.done_dir = done_dir
+        self.failed_dir = failed_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.ndjson = ndjson
+        self.strip_string_values = strip_string_values
+        self.poll_interval = poll_interval
+        self.encoding = encoding
+
+        for directory in [output_dir, done_dir, failed_dir]:
+            os.makedirs(directory, exist_ok=True)
+
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.pending = {}           # file name -> future of the conversion
+        self.last_seen = {}         # file name -> (size, modification time) of the last poll
+        self.unmovable = {}         # file name -> (size, modification time) of a failed move
+
+    def get_output_path(self, file_name):
+        """Returns the path of the output file for an ADIS file.
+
+        Args:
+            file_name (string): name of the ADIS file
+
+        Returns:
+            string: path of the JSON or NDJSON file
+        """
+        extension = ".ndjson" if self.ndjson else ".json"
+        return os.path.join(self.output_dir, os.path.splitext(file_name)[0] + extension)
+
+    def find_ready_files(self):
+        """Returns the ADIS files in the inbox whose size and modification time did not change \
+            since the last poll and that are not being converted yet.
+
+        Returns:
+            list[string]: names of the ready files
+        """
+        ready_files = []
+        seen = {}
+        for entry in sorted(os.scandir(self.inbox_dir), key=lambda entry: entry.name):
+            if not entry.is_file() or not entry.name.lower().endswith(".ads"):
+                continue
+            if entry.name in self.pending:
+                continue
+            stat = entry.stat()
+            seen[entry.name] = (stat.st_size, stat.st_mtime)
+            if self.unmovable.get(entry.name) == seen[entry.name]:
+                continue    # already converted, but it could not be moved out of the inbox
+            if self.last_seen.get(entry.name) == seen[entry.name]:
+                ready_files.append(entry.name)
+        self.last_seen = seen
+        self.unmovable = {file_name: key for file_name, key in self.unmovable.items()
+                          if file_name in seen}
+        return ready_files
+
+    def move_file(self, file_name, target_dir):
+        """Moves an ADIS file out of the inbox. A failed move is logged instead of raised, so \
+            the other files of the inbox keep being converted.
+
+        Args:
+            file_name (string): name of the ADIS file
+            target_dir (string): done or failed directory
+        """
+        path_to_file = os.path.join(self.inbox_dir, file_name)
+        try:
+            shutil.move(path_to_file, os.path.join(target_dir, file_name))
+        except Exception as exception:
+            logger.error("Moving %s to %s failed: %s", file_name, target_dir, exception)
+            try:
+                stat = os.stat(path_to_file)
+                self.unmovable[file_name] = (stat.st_size, stat.st_mtime)
+            except OSError:
+                pass    # the file is gone
+            return
+        self.unmovable.pop(file_name, None)
+
+    def collect(self, wait=False):
+        """Moves the ADIS files of finished conversions to the done or failed directory.
+
+        Args:
+            wait (bool, optional): Whether to wait for all pending conversions. Defaults to False.
+
+        Returns:
+            list[dict]: one result per finished conversion, containing the file name, whether \
+                it succeeded, the number of rows and bytes, the time and the throughput
+        """
+        results = []
+        for file_name, future in list(self.pending.items()):
+            if not wait and not future.done():
+                continue
+            del self.pending[file_name]
+
+            try:
+                stats = future.result()
+            except Exception as exception:
+                logger.error("Converting %s failed: %s", file_name, exception)
+                self.move_file(file_name, self.failed_dir)
+                results.append({"file": file_name, "success": False, "error": str(exception)})
+                continue
+
+            self.move_file(file_name, self.done_dir)
+            seconds = max(stats["seconds"], 1e-9)
+            result = {
+                "file": file_name,
+                "success": True,
+                "rows": stats["rows"],
+                "bytes": stats["bytes"],
+                "seconds": stats["seconds"],
+                "rows_per_second": stats["rows"] / seconds,
+                "megabytes_per_second": stats["bytes"] / seconds / 1e6
+            }
+            logger.info("Converted %s: %d rows in %.3f s (%.0f rows/s, %.2f MB/s)", file_name,
+                        result["rows"], result["seconds"], result["rows_per_second"],
+                        result["megabytes_per_second"])
+            results.append(result)
+        return results
+
+    def poll(self):
+        """Collects finished conversions and submits the ready files of the inbox to the \
+            worker pool. At most twice as many files as there are workers are pending at a time.
+
+        Returns:
+            list[dict]: results of the conversions that finished since the last poll
+        """
+        results = self.collect()
+        for file_name in self.find_ready_files():
+            if len(self.pending) >= 2 * self.workers:
+                break
+            self.pending[file_name] = self.executor.submit(
+                convert_file, os.path.join(self.inbox_dir, file_name),
+                self.get_output_path(file_name), self.ndjson, self.strip_string_values,
+                self.encoding)
+        return results
+
+    def run(self, max_polls=None):
+        """Polls the inbox until interrupted or until max_polls polls have been done.
+
+        Args:
+            max_polls (int, optional): number of polls. Defaults to None (poll forever).
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                self.poll()
+                polls += 1
+                time.sleep(self.poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        """Waits for the pending conversions and shuts the worker pool down.
+
+        Returns:
+            list[dict]: results of the conversions that were still pending
+        """
+        results = self.collect(wait=True)
+        self.executor.shutdown()
+        return results
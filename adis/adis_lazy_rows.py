@@ -0,0 +1,144 @@
+from collections import OrderedDict
+
+"""
+Lazy storage for the data rows of an AdisBlock. The raw value lines are kept and each data row is
+only decoded when it gets accessed.
+"""
+
+class AdisLazyRows:
+    cache_size = 1024
+
+    def __init__(self, decoder, encoding="latin-1", cache_size=None):
+        """Creates lazy data rows. The object behaves like the list of data rows of an \
+            AdisBlock, but only holds the raw value lines. Decoded data rows are kept in a \
+            bounded LRU cache.
+
+        Args:
+            decoder (AdisRowDecoder): decoder for the value lines
+            encoding (string, optional): single-byte encoding of value lines given as bytes. \
+                Defaults to "latin-1".
+            cache_size (int, optional): maximum number of decoded data rows that are cached. \
+                Defaults to AdisLazyRows.cache_size.
+        """
+        self.decoder = decoder
+        self.encoding = encoding
+        if cache_size is None:
+            cache_size = AdisLazyRows.cache_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.raw_lines = []
+
+    def check_line(self, raw_line, start=8, encoding=None):
+        """Checks the length of a value line without decoding it.
+
+        Args:
+            raw_line (string, bytes, memoryview): value line without line break chars
+            start (int, optional): position of the first item in the line. Defaults to 8.
+            encoding (string, optional): unused, the encoding of the rows is used.
+
+        Returns:
+            string, bytes, memoryview: the checked value line
+        """
+        self.decoder.check_length(len(raw_line) - start)
+        return raw_line
+
+    def decode_line(self, raw_line, start=8, encoding=None):
+        """Checks a value line by decoding it, the decoded values are dropped. Used by the \
+            lenient error policies of the AdisParser, so lines that cannot be decoded get \
+            rejected while parsing instead of failing when their data row gets accessed.
+
+        Args:
+            raw_line (string, bytes, memoryview): value line without line break chars
+            start (int, optional): position of the first item in the line. Defaults to 8.
+            encoding (string, optional): unused, the encoding of the rows is used.
+
+        Returns:
+            string, bytes, memoryview: the checked value line
+        """
+        if type(raw_line) is str:
+            self.decoder.decode_values(raw_line, start)
+        else:
+            self.decoder.decode_values_bytes(raw_line, start, self.encoding)
+        return raw_line
+
+    def append_line(self, raw_line):
+        """Appends a value line.
+
+        Args:
+            raw_line (string, bytes, memoryview): value line without line break chars
+        """
+        self.raw_lines.append(raw_line)
+
+    def get_raw_lines(self):
+        """Returns the raw value lines.
+
+        Returns:
+            list: value lines as strings or memoryviews, including the line type, status and \
+                entity number
+        """
+        return self.raw_lines
+
+    def get_values(self, index):
+        """Decodes the values of a data row without creating AdisValues. The result is not \
+            cached.
+
+        Args:
+            index (int): index of the data row
+
+        Returns:
+            list: one value per field definition, UNDEFINED for undefined fields
+        """
+        raw_line = self.raw_lines[index]
+        if type(raw_line) is str:
+            return self.decoder.decode_values(raw_line, 8)
+        return self.decoder.decode_values_bytes(raw_line, 8, self.encoding)
+
+    def decode_row(self, raw_line):
+        """Decodes a value line into a data row.
+
+        Args:
+            raw_line (string, bytes, memoryview): value line without line break chars
+
+        Returns:
+            list[AdisValue]: data row
+        """
+        if type(raw_line) is str:
+            return self.decoder.decode(raw_line, 8)
+        return self.decoder.decode_bytes(raw_line, 8, self.encoding)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self.raw_lines)
+        if index < 0 or len(self.raw_lines) <= index:
+            raise IndexError("data row index out of range")
+        cache = self.cache
+        data_row = cache.get(index)
+        if data_row is not None:
+            cache.move_to_end(index)
+            return data_row
+
+        data_row = self.decode_row(self.raw_lines[index])
+        if self.cache_size > 0:
+            cache[index] = data_row
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)   # remove the least recently used data row
+        return data_row
+
+    def __len__(self):
+        return len(self.raw_lines)
+
+    def __iter__(self):
+        # iterating decodes each data row once and does not push other rows out of the cache
+        cache = self.cache
+        for index, raw_line in enumerate(self.raw_lines):
+            data_row = cache.get(index)
+            if data_row is None:
+                data_row = self.decode_row(raw_line)
+            yield data_row
+
+    def __repr__(self):
+        return "AdisLazyRows containing %d raw value line(s) and %d cached data row(s)" \
+            % (len(self.raw_lines), len(self.cache))
@@ -1,6 +1,11 @@
-from .adis_field_definition import AdisFieldDefinition
+from .adis_row_decoder import AdisRowDecoder
+from .adis_schema import AdisSchema
 
 class AdisLine:
+    __slots__ = ("line_type_char", "status_char", "status")
+
+    line_type = "Line"
+    allowed_statuses = frozenset()
     status_chars = {
         "H": "header",
         "N": "normal",
@@ -16,7 +21,6 @@ class AdisLine:
         Args:
             line (string): the raw line from the ADIS file
         """
-        self.line = line
         self.line_type_char = line[0]
         self.status_char = line[1]
 
@@ -53,6 +57,24 @@ class AdisLine:
         """
         return self.status_char
 
+    @property
+    def line(self):
+        """The line as it is written in an ADIS file. The raw line is not kept, it gets \
+            rebuilt from the parsed parts.
+
+        Returns:
+            string: ADIS line without line break chars
+        """
+        return self.line_type_char + self.status_char + self.get_line_text()
+
+    def get_line_text(self):
+        """Returns the part of the line that follows the type char and the status char.
+
+        Returns:
+            string: rest of the line
+        """
+        return ""
+
     def __repr__(self):
         return "%s status: %s, line: %s" % (self.line_type, self.status, self.line)
     
@@ -80,26 +102,24 @@ class AdisLine:
 
 
 class DefinitionLine(AdisLine):
+    __slots__ = ("entity_number", "schema")
+
+    line_type = "Definition"
+    allowed_statuses = frozenset([
+        "header", "normal", "synchronisation", "faulty", "deletion"
+    ])
+
     def __init__(self, line):
-        """Creates a DefinitionLine
+        """Creates a DefinitionLine. The field definitions are interned, definition lines \
+            with the same field definitions share one AdisSchema.
 
         Args:
             line (string): line from ADIS file
         """
-        self.line_type = "Definition"
-        self.allowed_statuses = [
-            "header", "normal", "synchronisation", "faulty", "deletion"
-        ]
         super().__init__(line)
 
-        self.entity_number = self.line[2:8]
-
-        field_definitions_text = self.line[8:]
-        field_definition_blocks = self.split_field_definitions_text(field_definitions_text)
-
-        self.field_definitions = []
-        for field_definition_block in field_definition_blocks:
-            self.field_definitions.append(self.create_field_definition(field_definition_block))
+        self.entity_number = line[2:8]
+        self.schema = AdisSchema.for_definitions_text(line[8:])
 
     def get_entity_number(self):
         """Returns the entity number.
@@ -113,64 +133,79 @@ class DefinitionLine(AdisLine):
         """returns the field definitions.
 
         Returns:
-            list[AdisFieldDefinition]: list of field definitions
+            tuple[AdisFieldDefinition]: field definitions, shared with other definition lines
         """
-        return self.field_definitions
+        return self.schema.field_definitions
 
-    def split_field_definitions_text(self, field_definitions_text):
-        """Splits the part of an ADIS file line that contains the field definitions into parts. \
-            (Each field definition is one part)
+    def get_schema(self):
+        """Returns the interned schema of the field definitions.
 
-        Args:
-            field_definitions_text (string): part of a raw ADIS line that holds the field \
-                definitions
+        Returns:
+            AdisSchema: schema of this definition line
+        """
+        return self.schema
+
+    @property
+    def field_definitions(self):
+        """The field definitions of this line.
+
+        Returns:
+            tuple[AdisFieldDefinition]: field definitions
+        """
+        return self.schema.field_definitions
+
+    @property
+    def field_definitions_text(self):
+        """The part of the definition line that holds the field definitions.
+
+        Returns:
+            string: field definitions as written in the ADIS file
+        """
+        return self.schema.definitions_text
+
+    def get_line_text(self):
+        """Returns the part of the line that follows the type char and the status char.
 
         Returns:
-            list[string]: list that holds the different field definition strings
+            string: entity number and field definitions
         """
-        definition_block_length = 11    # each field definition consists of 11 chars
-        if len(field_definitions_text) % definition_block_length != 0:
-            raise Exception("Length of definitions text is %d but it has to be a multiple of %d"
-                % (len(field_definitions_text), definition_block_length))
-        definition_blocks = []
-        number_of_field_definitions = int(len(field_definitions_text) / definition_block_length)
-        for block_count in range(number_of_field_definitions):
-            start_index = block_count * definition_block_length
-            end_index = start_index + definition_block_length
-            definition_blocks.append(field_definitions_text[start_index:end_index])
-        return definition_blocks
-
-    def create_field_definition(self, field_definition_block):
-        """Creates an AdisFieldDefinition from the raw definition block from the ADIS line.
+        return self.entity_number + self.field_definitions_text
+
+    def get_row_decoder(self, item_numbers=None, decimals="float"):
+        """Returns the AdisRowDecoder for the value lines that belong to this definition. \
+            Decoders are cached by the schema, so definition lines with identical definitions \
+            share one decoder.
 
         Args:
-            field_definition_block (string): part of the raw ADIS line that holds a field \
-                definition
+            item_numbers (frozenset[string], optional): only decode the fields with these item \
+                numbers. Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded, see AdisRowDecoder. \
+                Defaults to "float".
 
         Returns:
-            AdisFieldDefinition: new AdisFieldDefinition
+            AdisRowDecoder: decoder for the value lines of this definition
         """
-        item_number = field_definition_block[0:8]
-        field_size = field_definition_block[8:10]
-        decimal_digits = field_definition_block[10]
-        return AdisFieldDefinition(item_number, field_size, decimal_digits)
+        return AdisRowDecoder.for_schema(self.schema, item_numbers, decimals)
 
 
 class ValueLine(AdisLine):
+    __slots__ = ("entity_number", "raw_items")
+
+    line_type = "Value"
+    allowed_statuses = frozenset([
+        "header", "normal", "synchronisation", "faulty", "deletion"
+    ])
+
     def __init__(self, line):
         """Creates a ValueLine.
 
         Args:
             line (string): raw line from an ADIS file
         """
-        self.line_type = "Value"
-        self.allowed_statuses = [
-            "header", "normal", "synchronisation", "faulty", "deletion"
-        ]
         super().__init__(line)
 
-        self.entity_number = self.line[2:8]
-        self.raw_items = self.line[8:]
+        self.entity_number = line[2:8]
+        self.raw_items = line[8:]
 
     def get_entity_number(self):
         """Returns the entity number.
@@ -180,6 +215,14 @@ class ValueLine(AdisLine):
         """
         return self.entity_number
 
+    def get_line_text(self):
+        """Returns the part of the line that follows the type char and the status char.
+
+        Returns:
+            string: entity number and raw items
+        """
+        return self.entity_number + self.raw_items
+
     def parse(self, field_definitions):
         """Parses a list of AdisValues from a raw ADIS file value line using the provided \
             list of field definitions.
@@ -191,33 +234,15 @@ class ValueLine(AdisLine):
         Returns:
             list[AdisValue]: AdisValues parsed from this line
         """
-        expected_raw_items_length = 0
-        for field_definition in field_definitions:
-            expected_raw_items_length += field_definition.get_field_size()
-        
-        if len(self.raw_items) != expected_raw_items_length:
-            expected_raw_items_length_when_last_item_empty = \
-                expected_raw_items_length - field_definitions[-1].get_field_size()
-            if len(self.raw_items) < expected_raw_items_length_when_last_item_empty:
-                raise Exception("Expecting an item text length of %d chars or %d chars, " \
-                    "but got %d chars."
-                    % (expected_raw_items_length, 
-                        expected_raw_items_length_when_last_item_empty,
-                        len(self.raw_items)))
-
-        values = []
-        current_position = 0
-        for field_definition in field_definitions:
-            field_size = field_definition.get_field_size()
-            value = field_definition.parse_field_at_position(self.raw_items, current_position)
-            if value is not None:
-                values.append(value)
-            current_position += field_size
-
-        return values
+        return AdisRowDecoder.for_definitions(field_definitions).decode(self.raw_items)
 
 
 class EndOfLogicalFileLine(AdisLine):
+    __slots__ = ()
+
+    line_type = "End of logical file"
+    allowed_statuses = frozenset(["normal"])
+
     def __init__(self, line):
         """Creates an EndOfLogicalFileLine. Note that each physical ADIS file can contain \
             multiple logical files.
@@ -225,24 +250,25 @@ class EndOfLogicalFileLine(AdisLine):
         Args:
             line (string): raw line from an ADIS file
         """
-        self.line_type = "End of logical file"
-        self.allowed_statuses = ["normal"]
         super().__init__(line)
 
 
 class CommentLine(AdisLine):
+    __slots__ = ("comment",)
+
+    line_type = "Comment"
+    allowed_statuses = frozenset([
+        "header", "normal", "synchronisation", "faulty", "deletion"
+    ])
+
     def __init__(self, line):
         """Creates a CommentLine
 
         Args:
             line (string): raw line from an ADIS file
         """
-        self.line_type = "Comment"
-        self.allowed_statuses = [
-            "header", "normal", "synchronisation", "faulty", "deletion"
-        ]
         super().__init__(line)
-        self.comment = self.line[2:]
+        self.comment = line[2:]
     
     def get_comment(self):
         """Returns the comment.
@@ -252,14 +278,25 @@ class CommentLine(AdisLine):
         """
         return self.comment
 
+    def get_line_text(self):
+        """Returns the part of the line that follows the type char and the status char.
+
+        Returns:
+            string: comment
+        """
+        return self.comment
+
 
 class PhysicalEndOfFileLine(AdisLine):
+    __slots__ = ()
+
+    line_type = "Physical end of file"
+    allowed_statuses = frozenset(["normal"])
+
     def __init__(self, line):
         """Creates a PhysicalEndOfFileLine.
 
         Args:
             line (string): raw line from an ADIS file
         """
-        self.line_type = "Physical end of file"
-        self.allowed_statuses = ["normal"]
         super().__init__(line)
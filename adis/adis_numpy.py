@@ -0,0 +1,324 @@
+from .adis_columns import (
+    AdisDecimalColumn,
+    AdisScaledColumn,
+    AdisTextColumn
+)
+from .adis_lazy_rows import AdisLazyRows
+
+"""
+Export of AdisBlocks to NumPy arrays and pandas DataFrames. NumPy and pandas are optional
+dependencies, they are only imported when one of these functions is used.
+"""
+
+def import_numpy():
+    """Imports NumPy.
+
+    Returns:
+        module: the numpy module
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise Exception("NumPy is required for this method. Install it with " \
+            "\"pip install numpy\".")
+    return numpy
+
+
+def import_pandas():
+    """Imports pandas.
+
+    Returns:
+        module: the pandas module
+    """
+    try:
+        import pandas
+    except ImportError:
+        raise Exception("pandas is required for this method. Install it with " \
+            "\"pip install pandas\".")
+    return pandas
+
+
+def get_numpy_format(field_definition, column):
+    """Returns the NumPy format of a field. Decimal fields are stored as float64, scaled \
+        integers as int64, Decimals as objects and text fields as unicode strings of the field \
+        size.
+
+    Args:
+        field_definition (AdisFieldDefinition): field definition of the field
+        column (AdisDecimalColumn, AdisTextColumn): column holding the values of the field
+
+    Returns:
+        string: NumPy format
+    """
+    if type(column) == AdisDecimalColumn:
+        return "f8"
+    if type(column) == AdisScaledColumn:
+        return "i8" if column.decimals == "scaled" else "O"
+    if field_definition.get_decimal_digits() != 0:
+        return "O"      # a decimal field that holds other values than numbers (e.g. from JSON)
+    return "U%d" % field_definition.get_field_size()
+
+
+def column_to_numpy(column, numpy_format, strip_string_values=True, null_text=""):
+    """Turns a column into a NumPy array without creating AdisValues.
+
+    Args:
+        column (AdisDecimalColumn, AdisTextColumn): column holding the values
+        numpy_format (string): NumPy format of the array
+        strip_string_values (bool, optional, by default True): Whether string values should \
+            be stripped or not.
+        null_text (None, string, optional): value for null and undefined text fields. \
+            Defaults to "".
+
+    Returns:
+        tuple(numpy.ndarray, numpy.ndarray): the values and a boolean array that is True for \
+            null and undefined fields. Null and undefined decimal fields are NaN, null and \
+            undefined scaled integers are 0.
+    """
+    numpy = import_numpy()
+
+    if type(column) == AdisScaledColumn:
+        nulls = numpy.frombuffer(column.get_mask(), dtype=numpy.uint8) != AdisDecimalColumn.VALUE
+        if numpy_format == "i8":
+            return numpy.frombuffer(column.get_values(), dtype=numpy.int64).copy(), nulls
+        values = numpy.array(column.to_list(), dtype=object)
+        values[nulls] = None
+        return values, nulls
+
+    if type(column) == AdisDecimalColumn:
+        values = numpy.frombuffer(column.get_values(), dtype=numpy.float64).copy()
+        nulls = numpy.frombuffer(column.get_mask(), dtype=numpy.uint8) != AdisDecimalColumn.VALUE
+        values[nulls] = numpy.nan
+        return values, nulls
+
+    dictionary = column.get_dictionary()
+    if strip_string_values:
+        dictionary = [value.strip() if isinstance(value, str) else value for value in dictionary]
+    # the codes for null and undefined fields are negative and index the two fill values
+    values_by_code = numpy.array(dictionary + [null_text, null_text], dtype=numpy_format)
+    codes = numpy.frombuffer(column.get_codes(), dtype=numpy.intc)
+    return values_by_code[codes], codes < 0
+
+
+def join_value_lines(lazy_rows):
+    """Joins the raw value lines of lazy data rows into one buffer. This only works if all \
+        value lines contain every field, so each line has the same length.
+
+    Args:
+        lazy_rows (AdisLazyRows): data rows holding the raw value lines
+
+    Returns:
+        tuple(bytes, int, string): the buffer, the length of each line and the encoding of the \
+            buffer, or None if the value lines do not all have the full length or a field \
+            cannot be decoded with NumPy
+    """
+    raw_lines = lazy_rows.get_raw_lines()
+    decoder = lazy_rows.decoder
+    line_length = 8 + decoder.expected_length
+    if len(raw_lines) == 0 or decoder.decimals == "decimal":
+        return None
+    for definition in decoder.get_field_definitions():
+        if definition.get_decimal_digits() != 0 \
+                and definition.get_field_size() > AdisScaledColumn.max_field_size:
+            return None     # the digits may not fit into a 64 bit integer
+    if set(map(len, raw_lines)) != {line_length}:
+        return None     # e.g. the last field of some lines is left out
+
+    if type(raw_lines[0]) is str:
+        try:
+            # latin-1 turns each char into one byte, so the lines keep their length
+            return "".join(raw_lines).encode("latin-1"), line_length, "latin-1"
+        except UnicodeEncodeError:
+            return None
+    return b"".join(raw_lines), line_length, lazy_rows.encoding
+
+
+def decode_value_lines(buffer, line_length, decoder, encoding="latin-1",
+                       strip_string_values=True):
+    """Decodes the value lines of a block at once. The buffer is viewed as a matrix of chars \
+        with one row per value line, null and undefined fields are found with vectorized \
+        comparisons and each decimal column is parsed and scaled by one matrix product.
+
+    Args:
+        buffer (bytes): value lines of the same length without line break chars
+        line_length (int): number of chars of each value line, including the line type, the \
+            status and the entity number
+        decoder (AdisRowDecoder): decoder of the block, it provides the offsets of the fields
+        encoding (string, optional): single-byte encoding of the buffer. Defaults to \
+            "latin-1".
+        strip_string_values (bool, optional, by default True): Whether string values should \
+            be stripped or not.
+
+    Returns:
+        list[tuple(string, string, numpy.ndarray, numpy.ndarray)]: item number, NumPy format, \
+            values and a boolean array that is True for null and undefined fields of each \
+            field. Null and undefined decimal fields are NaN (0 for scaled integers), null and \
+            undefined text fields are empty. None if a decimal field is not a right-aligned \
+            number with an optional sign, such blocks have to be decoded row by row, which \
+            raises the errors of the row decoder.
+    """
+    numpy = import_numpy()
+
+    if len(buffer) % line_length != 0:
+        raise Exception("The buffer does not consist of lines with %d chars." % line_length)
+    chars = numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(-1, line_length)
+
+    columns = []
+    for item_number, field_start, field_end, field_size, null_text, undefined_text, _ \
+            in decoder.fields:
+        field_chars = chars[:, 8 + field_start:8 + field_end]
+        nulls = (field_chars == ord("?")).all(axis=1)
+        undefined = (field_chars == ord("|")).all(axis=1)
+        missing = nulls | undefined
+        definition = decoder.field_definitions[len(columns)]
+        decimal_digits = definition.get_decimal_digits()
+
+        if decimal_digits == 0:
+            if encoding.lower().replace("_", "-") in ("latin-1", "latin1", "iso-8859-1"):
+                # latin-1 bytes are the code points, so they only get widened to UCS-4
+                texts = field_chars.astype(numpy.uint32).view("U%d" % field_size)[:, 0]
+            else:
+                texts = numpy.ascontiguousarray(field_chars).view("S%d" % field_size)[:, 0]
+                texts = numpy.char.decode(texts, encoding)
+            if strip_string_values:
+                texts = numpy.char.strip(texts)
+            values = numpy.where(missing, "", texts).astype("U%d" % field_size)
+            columns.append((item_number, "U%d" % field_size, values, missing))
+            continue
+
+        if field_size > AdisScaledColumn.max_field_size:
+            raise Exception("Decimal fields with more than %d digits cannot be decoded with " \
+                "NumPy." % AdisScaledColumn.max_field_size)
+        # a number is right-aligned: spaces, an optional sign and at least one digit
+        is_digit = (field_chars >= ord("0")) & (field_chars <= ord("9"))
+        is_space = field_chars == ord(" ")
+        first = (~is_space).argmax(axis=1)     # position of the sign or the first digit
+        first_char = field_chars[numpy.arange(len(field_chars)), first]
+        has_sign = (first_char == ord("-")) | (first_char == ord("+"))
+        positions = numpy.arange(field_size)
+        digits_from = first + has_sign
+        valid = (is_digit | (positions < digits_from[:, None])).all(axis=1) \
+            & (digits_from < field_size) & ~is_space[:, -1]
+        if not (valid | missing).all():
+            return None     # e.g. blank fields, misplaced signs or decimal points
+
+        # every digit is multiplied by the power of ten of its position in the field
+        powers = 10 ** numpy.arange(field_size - 1, -1, -1, dtype=numpy.int64)
+        digits = numpy.where(is_digit, field_chars - ord("0"), 0).astype(numpy.int64)
+        values = digits @ powers
+        values = numpy.where(first_char == ord("-"), -values, values)
+        if decoder.decimals == "scaled":
+            values[missing] = 0
+            columns.append((item_number, "i8", values, missing))
+        else:
+            values = values / 10**decimal_digits
+            values[missing] = numpy.nan
+            columns.append((item_number, "f8", values, missing))
+
+    return columns
+
+
+def block_to_numpy(block, masked=False, strip_string_values=True):
+    """Creates a NumPy structured array from an AdisBlock. See AdisBlock.to_numpy.
+
+    Args:
+        block (AdisBlock): block to export
+        masked (bool, optional): Whether to return a masked array. Defaults to False.
+        strip_string_values (bool, optional, by default True): Whether string values should \
+            be stripped or not.
+
+    Returns:
+        numpy.ndarray: structured array with one field per field definition
+    """
+    numpy = import_numpy()
+
+    data_rows = block.get_data_rows()
+    joined_lines = join_value_lines(data_rows) if type(data_rows) == AdisLazyRows else None
+    columns = None
+    if joined_lines is not None:
+        # raw value lines of the same length are decoded without going through the rows
+        buffer, line_length, encoding = joined_lines
+        columns = decode_value_lines(buffer, line_length, data_rows.decoder, encoding,
+                                     strip_string_values)
+    if columns is not None:
+        dtype = numpy.dtype([(item_number, numpy_format)
+                             for item_number, numpy_format, _, _ in columns])
+        result = numpy.empty(len(data_rows), dtype=dtype)
+        mask = numpy.zeros(len(result), dtype=[(name, bool) for name in dtype.names])
+        for item_number, _, values, nulls in columns:
+            result[item_number] = values
+            mask[item_number] = nulls
+        if masked:
+            return numpy.ma.array(result, mask=mask)
+        return result
+
+    columns = block.to_columns()
+    field_definitions = block.get_field_definitions()
+    numpy_formats = []
+    for definition in field_definitions:
+        numpy_formats.append(get_numpy_format(definition, columns[definition.get_item_number()]))
+    dtype = numpy.dtype([(definition.get_item_number(), numpy_format)
+                         for definition, numpy_format in zip(field_definitions, numpy_formats)])
+
+    result = numpy.empty(len(block.get_data_rows()), dtype=dtype)
+    mask = numpy.zeros(len(result), dtype=[(name, bool) for name in dtype.names])
+    for definition, numpy_format in zip(field_definitions, numpy_formats):
+        item_number = definition.get_item_number()
+        values, nulls = column_to_numpy(columns[item_number], numpy_format, strip_string_values)
+        result[item_number] = values
+        mask[item_number] = nulls
+
+    if masked:
+        return numpy.ma.array(result, mask=mask)
+    return result
+
+
+def block_to_dataframe(block, strip_string_values=True):
+    """Creates a pandas DataFrame from an AdisBlock. See AdisBlock.to_dataframe.
+
+    Args:
+        block (AdisBlock): block to export
+        strip_string_values (bool, optional, by default True): Whether string values should \
+            be stripped or not.
+
+    Returns:
+        pandas.DataFrame: one column per field definition, named by the item number
+    """
+    pandas = import_pandas()
+
+    data_rows = block.get_data_rows()
+    joined_lines = join_value_lines(data_rows) if type(data_rows) == AdisLazyRows else None
+    columns = None
+    if joined_lines is not None:
+        buffer, line_length, encoding = joined_lines
+        columns = decode_value_lines(buffer, line_length, data_rows.decoder, encoding,
+                                     strip_string_values)
+    if columns is not None:
+        data = {}
+        for item_number, numpy_format, values, nulls in columns:
+            if numpy_format == "i8":
+                values = pandas.arrays.IntegerArray(values, nulls)
+            elif numpy_format != "f8":
+                values = values.astype(object)
+                values[nulls] = None
+            data[item_number] = values
+        return pandas.DataFrame(data, columns=list(data))
+
+    columns = block.to_columns()
+    data = {}
+    for definition in block.get_field_definitions():
+        item_number = definition.get_item_number()
+        column = columns[item_number]
+        if type(column) == AdisTextColumn:
+            numpy_format = "O"      # pandas stores strings as objects
+        elif type(column) == AdisScaledColumn:
+            numpy_format = get_numpy_format(definition, column)
+        else:
+            numpy_format = "f8"
+        values, nulls = column_to_numpy(column, numpy_format, strip_string_values,
+                                        null_text=None)
+        if numpy_format == "i8":
+            values = pandas.arrays.IntegerArray(values, nulls)     # nullable, stays exact
+        data[item_number] = values
+
+    return pandas.DataFrame(data, columns=list(data))
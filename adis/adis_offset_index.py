@@ -0,0 +1,344 @@
+import json
+import mmap
+import os
+from .adis_parser import (
+    AdisParser,
+    read_buffer_lines
+)
+
+"""
+A sidecar index with the byte offsets of the definition lines, the ends of the logical files and
+every k-th value line of an ADIS file. The AdisRandomAccessReader uses it to seek to a block or to
+a range of data rows and only decodes the requested lines.
+"""
+
+class AdisOffsetIndex:
+    version = 1
+    extension = ".idx"
+
+    def __init__(self, index_dict):
+        """Creates an AdisOffsetIndex from a dict as created by build or stored in an index \
+            file.
+
+        Args:
+            index_dict (dict): size and modification time of the ADIS file, the distance of \
+                the value line offsets, the blocks and the offsets of the ends of the logical \
+                files
+        """
+        self.size = index_dict["size"]
+        self.mtime_ns = index_dict["mtime_ns"]
+        self.every = index_dict["every"]
+        self.encoding = index_dict["encoding"]
+        self.blocks = index_dict["blocks"]
+        self.ends = index_dict["ends"]
+
+    def is_valid_for(self, path_to_file):
+        """Returns whether the index still matches the ADIS file. The index is invalid as soon \
+            as the size or the modification time of the file changes.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+
+        Returns:
+            boolean: True if the index matches the file, otherwise False
+        """
+        try:
+            stat = os.stat(path_to_file)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def get_blocks(self, file_index=None, entity=None):
+        """Returns the indexed blocks. Each block is a dict containing the file_index, the \
+            entity_number, the definition_line, the byte offsets start and end of the block, \
+            the number of rows and the row_offsets of every k-th value line.
+
+        Args:
+            file_index (int, optional): only return the blocks of this logical file
+            entity (string, optional): only return the blocks with this entity number
+
+        Returns:
+            list[dict]: blocks in the order of the file
+        """
+        return [block for block in self.blocks
+                if (file_index is None or block["file_index"] == file_index)
+                and (entity is None or block["entity_number"] == entity)]
+
+    def get_number_of_files(self):
+        """Returns the number of logical files that are terminated by an "EN" or "ZN" line.
+
+        Returns:
+            int: number of logical files
+        """
+        return len(self.ends)
+
+    def to_dict(self):
+        """Creates a dict that contains all information of this index.
+
+        Returns:
+            dict: index as builtin types
+        """
+        return {
+            "version": AdisOffsetIndex.version,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "every": self.every,
+            "encoding": self.encoding,
+            "blocks": self.blocks,
+            "ends": self.ends
+        }
+
+    def save(self, path_to_index_file):
+        """Writes the index to a JSON file.
+
+        Args:
+            path_to_index_file (string): Path to the index file
+        """
+        temporary_path = path_to_index_file + ".part"
+        with open(temporary_path, "w") as output_file:
+            json.dump(self.to_dict(), output_file)
+        os.replace(temporary_path, path_to_index_file)
+
+    @staticmethod
+    def get_index_path(path_to_file):
+        """Returns the path of the index file next to the ADIS file.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+
+        Returns:
+            string: Path to the index file
+        """
+        return path_to_file + AdisOffsetIndex.extension
+
+    @staticmethod
+    def load(path_to_index_file):
+        """Loads an index file.
+
+        Args:
+            path_to_index_file (string): Path to the index file
+
+        Returns:
+            AdisOffsetIndex: the loaded index, or None if the file does not exist, cannot be \
+                read or was written by another version
+        """
+        try:
+            with open(path_to_index_file) as input_file:
+                index_dict = json.load(input_file)
+            if index_dict.get("version") != AdisOffsetIndex.version:
+                return None
+            return AdisOffsetIndex(index_dict)
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    @staticmethod
+    def build(path_to_file, every=1000, encoding="latin-1"):
+        """Scans an ADIS file and creates an index. Value lines are only counted, not decoded.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            every (int, optional): the offset of every k-th value line of a block is recorded. \
+                Defaults to 1000.
+            encoding (string, optional): single-byte encoding of the file. Defaults to \
+                "latin-1".
+
+        Returns:
+            AdisOffsetIndex: index of the file
+        """
+        blocks = []
+        ends = []
+        with open(path_to_file, "rb") as input_file:
+            stat = os.fstat(input_file.fileno())
+            if stat.st_size != 0:
+                with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    AdisOffsetIndex.scan(buffer, every, encoding, blocks, ends)
+
+        return AdisOffsetIndex({
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "every": every,
+            "encoding": encoding,
+            "blocks": blocks,
+            "ends": ends
+        })
+
+    @staticmethod
+    def scan(buffer, every, encoding, blocks, ends):
+        """Collects the blocks and the ends of the logical files of a buffer.
+
+        Args:
+            buffer (mmap.mmap): buffer containing the ADIS text
+            every (int): the offset of every k-th value line of a block is recorded
+            encoding (string): single-byte encoding of the buffer
+            blocks (list): the blocks get appended to this list
+            ends (list): the offsets of the "EN" and "ZN" lines get appended to this list
+        """
+        size = len(buffer)
+        block = None
+        position = 0
+        while position < size:
+            line_end = buffer.find(b"\n", position)
+            next_position = size if line_end == -1 else line_end + 1
+            line_type = buffer[position]
+
+            if line_type == 86:         # "V"
+                if block is not None:
+                    if block["rows"] % every == 0:
+                        block["row_offsets"].append(position)
+                    block["rows"] += 1
+            elif line_type == 68:       # "D"
+                if block is not None:
+                    block["end"] = position
+                definition_line = buffer[position:next_position].decode(encoding)
+                definition_line = definition_line.rstrip("\r\n")
+                block = {
+                    "file_index": len(ends),
+                    "entity_number": definition_line[2:8],
+                    "definition_line": definition_line,
+                    "start": position,
+                    "end": size,
+                    "rows": 0,
+                    "row_offsets": []
+                }
+                blocks.append(block)
+            elif line_type in b"EZT":
+                if block is not None:
+                    block["end"] = position
+                    block = None
+                ends.append(position)
+
+            position = next_position
+
+
+class AdisRandomAccessReader:
+    def __init__(self, path_to_file, every=1000, encoding="latin-1", save_index=True):
+        """Creates an AdisRandomAccessReader. The index next to the ADIS file is used if it \
+            still matches the file, otherwise the index is built (and saved).
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+            every (int, optional): distance of the value line offsets in a new index. \
+                Defaults to 1000.
+            encoding (string, optional): single-byte encoding of the file. Defaults to \
+                "latin-1".
+            save_index (bool, optional): Whether a new index is saved next to the ADIS file. \
+                Defaults to True.
+        """
+        self.path_to_file = path_to_file
+        self.every = every
+        self.encoding = encoding
+        self.save_index = save_index
+        self.index = None
+
+    def get_index(self):
+        """Returns the index of the file. The index is loaded or built again whenever the size \
+            or modification time of the file changed.
+
+        Returns:
+            AdisOffsetIndex: index of the file
+        """
+        if self.index is not None and self.index.is_valid_for(self.path_to_file):
+            return self.index
+
+        index_path = AdisOffsetIndex.get_index_path(self.path_to_file)
+        index = AdisOffsetIndex.load(index_path)
+        if index is None or not index.is_valid_for(self.path_to_file) \
+                or index.encoding != self.encoding:
+            index = AdisOffsetIndex.build(self.path_to_file, self.every, self.encoding)
+            if self.save_index:
+                try:
+                    index.save(index_path)
+                except OSError:
+                    pass    # e.g. a read-only directory, the index is only kept in memory
+        self.index = index
+        return index
+
+    def read_range(self, start, end):
+        """Reads a byte range of the ADIS file.
+
+        Args:
+            start (int): start of the range
+            end (int): end of the range
+
+        Returns:
+            bytes: content of the range
+        """
+        with open(self.path_to_file, "rb") as input_file:
+            input_file.seek(start)
+            return input_file.read(end - start)
+
+    def get_block(self, file_index, block_index, storage="rows"):
+        """Reads a single block.
+
+        Args:
+            file_index (int): index of the logical file
+            block_index (int): index of the block within the logical file
+            storage (string, optional): storage mode of the data rows, see AdisParser. \
+                Defaults to "rows".
+
+        Returns:
+            AdisBlock: the block
+        """
+        blocks = self.get_index().get_blocks(file_index)
+        if block_index < 0 or len(blocks) <= block_index:
+            raise IndexError("Logical file %d has no block with the index %d."
+                % (file_index, block_index))
+        block = blocks[block_index]
+
+        parser = AdisParser(storage, self.encoding)
+        for raw_line in read_buffer_lines(self.read_range(block["start"], block["end"])):
+            parser.feed(raw_line)
+        _, adis_block = parser.finish()
+        return adis_block
+
+    def get_rows(self, entity, start, stop):
+        """Reads a range of data rows of an entity. The data rows of all blocks of the entity \
+            are counted in the order of the file, across all logical files.
+
+        Args:
+            entity (string): entity number
+            start (int): index of the first data row
+            stop (int): index after the last data row
+
+        Returns:
+            list[tuple(int, list[AdisValue])]: index of the logical file and the data row
+        """
+        index = self.get_index()
+        rows = []
+        first_row = 0       # index of the first data row of the current block
+        for block in index.get_blocks(entity=entity):
+            block_start = max(start - first_row, 0)
+            block_stop = min(stop - first_row, block["rows"])
+            first_row += block["rows"]
+            if block_start >= block_stop:
+                continue
+
+            # seek to the recorded value line in front of the first requested data row
+            checkpoint = block_start // index.every
+            range_start = block["row_offsets"][checkpoint]
+            end_checkpoint = -(-block_stop // index.every)
+            if end_checkpoint < len(block["row_offsets"]):
+                range_end = block["row_offsets"][end_checkpoint]
+            else:
+                range_end = block["end"]
+
+            parser = AdisParser(encoding=self.encoding)
+            parser.feed(block["definition_line"])
+            row = checkpoint * index.every
+            for raw_line in read_buffer_lines(self.read_range(range_start, range_end)):
+                if len(raw_line) == 0 or raw_line[0] != 86:     # not a value line
+                    continue
+                if row >= block_stop:
+                    break
+                if row >= block_start:
+                    parser.check_value_line_bytes(raw_line)
+                    rows.append((block["file_index"],
+                                 parser.decoder.decode_bytes(raw_line, 8, self.encoding)))
+                row += 1
+
+            if first_row >= stop:
+                break
+        return rows
+
+    def __repr__(self):
+        return "AdisRandomAccessReader for %s" % self.path_to_file
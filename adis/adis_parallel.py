@@ -0,0 +1,198 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from .adis_block import AdisBlock
+from .adis_columns import AdisColumnarRows
+from .adis_file import AdisFile
+from .adis_lines import (
+    AdisLine,
+    DefinitionLine
+)
+from .adis_parser import (
+    AdisParser,
+    read_buffer_lines
+)
+from .adis_tuple_rows import AdisTupleRows
+
+"""
+Parallel parsing of ADIS files. The file is split at definition lines and at the ends of logical
+files, large blocks are split further at line boundaries. The value lines of the chunks are
+decoded in a process pool and the results are reassembled in order.
+"""
+
+# lines that change the structure of an ADIS file: definitions and ends of (logical) files
+structure_line_pattern = re.compile(rb"^[DEZT][^\r\n]*", re.MULTILINE)
+
+
+def decode_chunk(path_to_file, definition_text, start, end, encoding, items, decimals):
+    """Decodes the value lines in a byte range of an ADIS file. This function runs in the \
+        worker processes.
+
+    Args:
+        path_to_file (string): Path to the ADIS file
+        definition_text (string): definition line of the block the value lines belong to
+        start (int): byte offset of the first value line
+        end (int): byte offset after the last value line
+        encoding (string): single-byte encoding of the file
+        items (list[string]): only decode the fields with these item numbers, None for all \
+            fields
+        decimals (string): how decimal fields are decoded, see AdisParser
+
+    Returns:
+        AdisColumnarRows: the decoded data rows. Columnar data rows are returned independent \
+            of the storage mode because they are far cheaper to transfer between processes \
+            than lists of AdisValues.
+    """
+    with open(path_to_file, "rb") as input_file:
+        input_file.seek(start)
+        data = input_file.read(end - start)
+
+    parser = AdisParser("columnar", encoding, items=items, decimals=decimals)
+    parser.feed(definition_text)
+    for raw_line in read_buffer_lines(data):
+        parser.feed(raw_line)
+    _, block = parser.finish()
+    return block.get_data_rows()
+
+
+def split_range(buffer, start, end, chunk_size):
+    """Splits a byte range of the buffer into chunks of about chunk_size bytes. Chunks always \
+        end at a line boundary.
+
+    Args:
+        buffer (mmap.mmap): buffer containing the ADIS text
+        start (int): start of the range
+        end (int): end of the range
+        chunk_size (int): approximate size of the chunks in bytes
+
+    Returns:
+        list[tuple(int, int)]: start and end of each chunk
+    """
+    chunks = []
+    while start < end:
+        chunk_end = buffer.find(b"\n", min(start + chunk_size, end) - 1, end)
+        if chunk_end == -1:
+            chunk_end = end
+        else:
+            chunk_end += 1
+        chunks.append((start, chunk_end))
+        start = chunk_end
+    return chunks
+
+
+def add_value_lines(buffer, blocks, file_index, start, end, chunk_size, encoding):
+    """Adds the byte ranges of the value lines between two structure lines to the last block. \
+        Lines that follow the end of a logical file may only be empty or comments.
+
+    Args:
+        buffer (mmap.mmap): buffer containing the ADIS text
+        blocks (list): blocks found so far
+        file_index (int): index of the current logical file
+        start (int): start of the value lines
+        end (int): end of the value lines
+        chunk_size (int): approximate size of the chunks in bytes
+        encoding (string): single-byte encoding of the file
+    """
+    if len(blocks) != 0 and blocks[-1][0] == file_index and blocks[-1][3] is None:
+        blocks[-1][3] = split_range(buffer, start, end, chunk_size)
+    elif start < end:
+        parser = AdisParser(encoding=encoding)
+        for raw_line in read_buffer_lines(buffer[start:end]):
+            parser.feed(raw_line)   # raises an error for value lines without a definition
+
+
+def parse_file_parallel(path_to_file, workers, storage="rows", encoding="latin-1",
+                        chunk_size=1024 * 1024, entities=None, items=None, decimals="float"):
+    """Parses an ADIS file with a pool of worker processes. Each worker only gets the text of \
+        a definition line and a byte range of value lines.
+
+    Args:
+        path_to_file (string): Path to the ADIS file
+        workers (int): number of worker processes
+        storage (string, optional): "rows", "columnar" or "tuples", see AdisParser. Defaults \
+            to "rows".
+        encoding (string, optional): single-byte encoding of the file. Defaults to "latin-1".
+        chunk_size (int, optional): approximate number of bytes of value lines that are \
+            decoded by one task. Defaults to 1 MiB.
+        entities (list[string], optional): only parse the blocks with these entity numbers, \
+            the value lines of other blocks are never read. Defaults to all entities.
+        items (list[string], optional): only decode the fields with these item numbers. \
+            Defaults to all fields.
+        decimals (string, optional): how decimal fields are decoded, see AdisParser. Defaults \
+            to "float".
+
+    Returns:
+        list[AdisFile]: logical files of the ADIS file
+    """
+    if storage not in ["rows", "columnar", "tuples"]:
+        raise Exception("Parsing with workers is only supported for the storage modes " \
+            "\"rows\", \"columnar\" and \"tuples\".")
+
+    with open(path_to_file, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size == 0:
+            return []
+        mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # each block: [file index, definition line, definition text, byte ranges of value lines]
+    blocks = []
+    with mapped_file:
+        file_index = 0
+        size = len(mapped_file)
+        region_start = 0
+        for match in structure_line_pattern.finditer(mapped_file):
+            add_value_lines(mapped_file, blocks, file_index, region_start, match.start(),
+                            chunk_size, encoding)
+
+            definition_text = match.group().decode(encoding)
+            line = AdisLine.parse_line(definition_text)
+            if type(line) == DefinitionLine:
+                blocks.append([file_index, line, definition_text, None])
+            else:
+                file_index += 1
+
+            region_start = mapped_file.find(b"\n", match.end())
+            region_start = size if region_start == -1 else region_start + 1
+
+        add_value_lines(mapped_file, blocks, file_index, region_start, size, chunk_size,
+                        encoding)
+
+    # blocks of a logical file that is not terminated are ignored
+    number_of_files = file_index
+    blocks = [block for block in blocks if block[0] < number_of_files]
+    if entities is not None:
+        blocks = [block for block in blocks if block[1].get_entity_number() in entities]
+    if items is not None:
+        items = frozenset(items)
+
+    tasks = []
+    for _, _, definition_text, byte_ranges in blocks:
+        for start, end in byte_ranges:
+            tasks.append((path_to_file, definition_text, start, end, encoding, items, decimals))
+
+    results = []
+    if len(tasks) != 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(decode_chunk, *zip(*tasks)))
+
+    blocks_of_files = [[] for _ in range(number_of_files)]
+    next_result = 0
+    for block_file_index, definition_line, _, byte_ranges in blocks:
+        field_definitions = definition_line.get_row_decoder(items).get_field_definitions()
+        data_rows = AdisColumnarRows(field_definitions, decimals=decimals)
+        for result in results[next_result:next_result + len(byte_ranges)]:
+            data_rows.extend(result)
+        next_result += len(byte_ranges)
+        if storage == "rows":
+            data_rows = data_rows.to_rows()
+        elif storage == "tuples":
+            data_rows = AdisTupleRows(field_definitions, data_rows.to_tuples())
+
+        blocks_of_files[block_file_index].append(AdisBlock(
+            definition_line.get_entity_number(),
+            definition_line.get_status_char(),
+            field_definitions,
+            data_rows,
+            decimals))
+
+    return [AdisFile(blocks) for blocks in blocks_of_files]
@@ -0,0 +1,428 @@
+from .adis_block import AdisBlock
+from .adis_columns import AdisColumnarRows
+from .adis_lazy_rows import AdisLazyRows
+from .adis_lines import (
+    AdisLine,
+    DefinitionLine,
+    EndOfLogicalFileLine,
+    PhysicalEndOfFileLine
+)
+from .adis_row_decoder import AdisRowDecoder
+from .adis_tuple_rows import AdisTupleRows
+from .adis_validator import (
+    AdisProblem,
+    AdisValidator
+)
+
+"""
+The AdisParser turns ADIS lines into AdisBlocks one line at a time. This way ADIS files can be
+processed without holding the whole file in memory.
+"""
+
+def read_lines(input_file):
+    """Yields the lines of the provided file object one by one. "\r" and "\n" chars get removed.
+
+    Args:
+        input_file (file): file object opened in text mode
+
+    Yields:
+        string: lines of the file
+    """
+    for raw_line in input_file:
+        yield raw_line.replace("\r", "").replace("\n", "")
+
+
+def read_buffer_lines(buffer):
+    """Yields the lines of the provided buffer (e.g. bytes or a memory-mapped file) one by one. \
+        Line boundaries are searched on the raw bytes and the lines are memoryviews into the \
+        buffer, so no line gets copied. A trailing "\r" gets removed from each line.
+
+    Args:
+        buffer (bytes, bytearray, mmap.mmap): buffer containing the ADIS text
+
+    Yields:
+        memoryview: lines of the buffer
+    """
+    size = len(buffer)
+    if size == 0:
+        return
+
+    view = memoryview(buffer)
+    try:
+        position = 0
+        while position < size:
+            line_end = buffer.find(b"\n", position)
+            if line_end == -1:
+                line_end = size
+            next_position = line_end + 1
+            if line_end > position and buffer[line_end - 1] == 13:     # "\r"
+                line_end -= 1
+            yield view[position:line_end]
+            position = next_position
+    finally:
+        view.release()
+
+
+class AdisParser:
+    storage_modes = ["rows", "columnar", "lazy", "tuples"]
+    error_policies = ["strict", "skip", "collect"]
+    status_bytes = set(ord(status_char) for status_char in AdisLine.status_chars)
+
+    def __init__(self, storage="rows", encoding="latin-1", entities=None, items=None,
+                 decimals="float", errors="strict", quarantine=None):
+        """Creates an AdisParser. The parser keeps track of the current logical file and the \
+            current block while lines get fed into it.
+
+        Args:
+            storage (string, optional): how the data rows of the blocks are stored. "rows" \
+                stores a list of AdisValues per data row, "columnar" stores one compact \
+                column per field definition, "lazy" keeps the raw value lines and decodes \
+                data rows when they get accessed and "tuples" stores a tuple of plain values \
+                per data row. Defaults to "rows".
+            encoding (string, optional): single-byte encoding of lines that are fed as bytes. \
+                Defaults to "latin-1".
+            entities (iterable[string], optional): only keep the blocks with these entity \
+                numbers. Value lines of other entities are skipped by their entity number \
+                without being decoded. Defaults to all entities.
+            items (iterable[string], optional): only decode the fields with these item numbers, \
+                the blocks only contain the field definitions of these items. Defaults to all \
+                fields.
+            decimals (string, optional): how decimal fields are decoded. "float" returns \
+                floats, "scaled" the digits as exact integers (the scale is the number of \
+                decimal digits of the field definition) and "decimal" exact Decimals. Defaults \
+                to "float".
+            errors (string, optional): what happens with invalid lines. "strict" raises an \
+                error, "skip" and "collect" reject the line and keep parsing. "skip" only counts \
+                the rejected lines, "collect" also keeps an AdisProblem with the line number \
+                and the reason for each of them. The value lines of an invalid definition line \
+                are rejected as well. With the storage "lazy" the value lines are decoded once \
+                to check them. Defaults to "strict".
+            quarantine (file, optional): file object opened in text mode the rejected lines \
+                get written to, one per line. Defaults to None.
+        """
+        if storage not in AdisParser.storage_modes:
+            raise Exception("Invalid storage mode \"%s\". Has to be one of %s."
+                % (storage, AdisParser.storage_modes))
+        if decimals not in AdisRowDecoder.decimal_modes:
+            raise Exception("Invalid decimal mode \"%s\". Has to be one of %s."
+                % (decimals, AdisRowDecoder.decimal_modes))
+        if errors not in AdisParser.error_policies:
+            raise Exception("Invalid error policy \"%s\". Has to be one of %s."
+                % (errors, AdisParser.error_policies))
+        self.storage = storage
+        self.decimals = decimals
+        self.encoding = encoding
+        self.entities = None
+        self.entity_bytes = None
+        if entities is not None:
+            self.entities = frozenset(entities)
+            self.entity_bytes = frozenset(entity.encode(encoding) for entity in self.entities)
+        self.items = frozenset(items) if items is not None else None
+        self.file_index = 0
+        self.definition_line = None
+        self.decoder = None
+        self.data_rows = []
+        self.append_row = None
+        self.decode_row = None
+        self.decode_row_bytes = None
+
+        self.errors = errors
+        self.quarantine = quarantine
+        self.line_number = 0
+        self.invalid_definition_number = None
+        self.rejected_count = 0
+        self.problems = []
+        if errors != "strict":
+            self.feed = self.feed_lenient   # all lines go through the error handling
+
+    def get_file_index(self):
+        """Returns the index of the logical file the next line belongs to. This is also the \
+            number of logical files that have been terminated by an "EN" or "ZN" line so far.
+
+        Returns:
+            int: index of the current logical file
+        """
+        return self.file_index
+
+    def feed(self, raw_line):
+        """Parses a single line.
+
+        Args:
+            raw_line (string, bytes, memoryview): line from an ADIS file without line break \
+                chars. Value lines given as bytes are decoded without copying the line.
+
+        Returns:
+            tuple(int, AdisBlock): index of the logical file and the block that got completed by \
+                this line, or None if no block got completed
+        """
+        if type(raw_line) is not str:
+            return self.feed_bytes(raw_line)
+        if raw_line == "":
+            return None
+
+        if raw_line[0] == "V":
+            if self.entities is not None and raw_line[2:8] not in self.entities:
+                return None
+            self.check_value_line(raw_line)
+            self.append_row(self.decode_row(raw_line, 8))
+            return None
+
+        line = AdisLine.parse_line(raw_line)
+        line_type = type(line)
+        if line_type == DefinitionLine:
+            completed_block = self.complete_block()
+            self.start_block(line)
+            return completed_block
+
+        if line_type == EndOfLogicalFileLine or line_type == PhysicalEndOfFileLine:
+            completed_block = self.complete_block()
+            self.file_index += 1
+            return completed_block
+
+        return None     # comment lines do not contain any data
+
+    def feed_bytes(self, raw_line):
+        """Parses a single line given as bytes. See feed.
+
+        Args:
+            raw_line (bytes, memoryview): line from an ADIS file without line break chars
+
+        Returns:
+            tuple(int, AdisBlock): index of the logical file and the block that got completed by \
+                this line, or None if no block got completed
+        """
+        if len(raw_line) == 0:
+            return None
+
+        if raw_line[0] == 86:   # "V"
+            if self.entity_bytes is not None and bytes(raw_line[2:8]) not in self.entity_bytes:
+                return None
+            self.check_value_line_bytes(raw_line)
+            self.append_row(self.decode_row_bytes(raw_line, 8, self.encoding))
+            return None
+
+        # not self.feed, it is replaced by feed_lenient for the lenient error policies
+        return AdisParser.feed(self, str(raw_line, self.encoding))
+
+    def feed_lenient(self, raw_line):
+        """Parses a single line like feed, but rejects invalid lines instead of raising an \
+            error. Used for the error policies "skip" and "collect".
+
+        Args:
+            raw_line (string, bytes, memoryview): line from an ADIS file without line break \
+                chars
+
+        Returns:
+            tuple(int, AdisBlock): index of the logical file and the block that got completed by \
+                this line, or None if no block got completed
+        """
+        self.line_number += 1
+        if self.invalid_definition_number is not None and raw_line[:1] in ("V", b"V"):
+            self.reject(raw_line, "The definition line %d of this value line is invalid"
+                % self.invalid_definition_number)
+            return None
+
+        try:
+            completed_block = AdisParser.feed(self, raw_line)
+        except Exception as exception:
+            reason = str(exception)
+            if type(exception) is KeyError:
+                # unknown line type and status chars fail with a KeyError of the char
+                text = raw_line if type(raw_line) is str else str(raw_line, self.encoding)
+                reason = AdisValidator.check_line(text)[0] or reason
+            self.reject(raw_line, reason)
+            if raw_line[:1] not in ("D", b"D"):
+                return None
+            # the value lines of the invalid definition line must not end up in the last block
+            self.invalid_definition_number = self.line_number
+            return self.complete_block()
+
+        if self.invalid_definition_number is not None \
+                and raw_line[:1] in ("D", "E", "Z", "T", b"D", b"E", b"Z", b"T"):
+            self.invalid_definition_number = None   # a valid line ended the invalid block
+        return completed_block
+
+    def reject(self, raw_line, reason):
+        """Records a rejected line and writes it to the quarantine file.
+
+        Args:
+            raw_line (string, bytes, memoryview): the rejected line
+            reason (string): why the line got rejected
+        """
+        if type(raw_line) is not str:
+            raw_line = str(raw_line, self.encoding)
+        self.rejected_count += 1
+        if self.errors == "collect":
+            self.problems.append(AdisProblem(self.line_number, None, reason, raw_line))
+        if self.quarantine is not None:
+            self.quarantine.write(raw_line + "\r\n")
+
+    def get_rejected_count(self):
+        """Returns the number of lines that got rejected by the error policies "skip" and \
+            "collect".
+
+        Returns:
+            int: number of rejected lines
+        """
+        return self.rejected_count
+
+    def get_problems(self):
+        """Returns the rejected lines of the error policy "collect".
+
+        Returns:
+            list[AdisProblem]: one problem per rejected line with the line number, the reason \
+                and the line. The byte offset is None, the parser only sees the lines.
+        """
+        return self.problems
+
+    def start_block(self, definition_line):
+        """Starts a new block for the provided definition line.
+
+        Args:
+            definition_line (DefinitionLine): definition line of the new block
+        """
+        if self.entities is not None \
+                and definition_line.get_entity_number() not in self.entities:
+            return      # the value lines of this block get skipped
+
+        self.definition_line = definition_line
+        self.decoder = definition_line.get_row_decoder(self.items, self.decimals)
+        field_definitions = self.decoder.get_field_definitions()
+        if self.storage == "columnar":
+            self.data_rows = AdisColumnarRows(field_definitions, decimals=self.decimals)
+            self.append_row = self.data_rows.append_values
+            self.decode_row = self.decoder.decode_values
+            self.decode_row_bytes = self.decoder.decode_values_bytes
+        elif self.storage == "lazy":
+            self.data_rows = AdisLazyRows(self.decoder, self.encoding)
+            self.append_row = self.data_rows.append_line
+            if self.errors == "strict":
+                self.decode_row = self.data_rows.check_line
+                self.decode_row_bytes = self.data_rows.check_line
+            else:
+                # invalid values have to be rejected now, not when the data row gets accessed
+                self.decode_row = self.data_rows.decode_line
+                self.decode_row_bytes = self.data_rows.decode_line
+        elif self.storage == "tuples":
+            self.data_rows = AdisTupleRows(field_definitions)
+            self.append_row = self.data_rows.append_values
+            self.decode_row = self.decoder.decode_values
+            self.decode_row_bytes = self.decoder.decode_values_bytes
+        else:
+            self.data_rows = []
+            self.append_row = self.data_rows.append
+            self.decode_row = self.decoder.decode
+            self.decode_row_bytes = self.decoder.decode_bytes
+
+    def check_value_line(self, raw_line):
+        """Checks the status char of a value line and whether there is a definition for it. \
+            Value lines are decoded directly from the raw line without creating ValueLine \
+            objects.
+
+        Args:
+            raw_line (string): value line from an ADIS file without line break chars
+        """
+        if raw_line[1:2] not in AdisLine.status_chars:
+            AdisLine.parse_line(raw_line)   # raises an error for the invalid status char
+        if self.decoder is None:
+            raise Exception("Definition line is missing before value line")
+
+    def check_value_line_bytes(self, raw_line):
+        """Checks a value line given as bytes. See check_value_line.
+
+        Args:
+            raw_line (bytes, memoryview): value line from an ADIS file without line break chars
+        """
+        if len(raw_line) < 2 or raw_line[1] not in AdisParser.status_bytes:
+            AdisLine.parse_line(str(raw_line, self.encoding))   # raises an error for the status
+        if self.decoder is None:
+            raise Exception("Definition line is missing before value line")
+
+    def finish(self):
+        """Completes the block that is currently being parsed, even if its logical file has not \
+            been terminated yet.
+
+        Returns:
+            tuple(int, AdisBlock): index of the logical file and the completed block, or None if \
+                there is no pending block
+        """
+        return self.complete_block()
+
+    def complete_block(self):
+        """Creates an AdisBlock from the definition line and the data rows collected so far \
+            and resets the block state of the parser.
+
+        Returns:
+            tuple(int, AdisBlock): index of the logical file and the completed block, or None if \
+                there is no pending block
+        """
+        if self.definition_line is None:
+            return None
+
+        definition_line = self.definition_line
+        block = AdisBlock(definition_line.get_entity_number(),
+                          definition_line.get_status_char(),
+                          self.decoder.get_field_definitions(),
+                          self.data_rows,
+                          self.decimals)
+        self.definition_line = None
+        self.decoder = None
+        self.data_rows = []
+        self.append_row = None
+        self.decode_row = None
+        self.decode_row_bytes = None
+        return self.file_index, block
+
+    def iter_blocks(self, raw_lines):
+        """Parses the provided lines and yields each block as soon as it is complete.
+
+        Args:
+            raw_lines (iterable[string], iterable[memoryview]): lines of an ADIS file without \
+                line break chars
+
+        Yields:
+            tuple(int, AdisBlock): index of the logical file and the block
+        """
+        for raw_line in raw_lines:
+            completed_block = self.feed(raw_line)
+            if completed_block is not None:
+                yield completed_block
+
+        completed_block = self.finish()
+        if completed_block is not None:
+            yield completed_block
+
+    def iter_rows(self, raw_lines, entity=None):
+        """Parses the provided lines and yields each data row right away. Data rows do not get \
+            collected into blocks, so only one line is held in memory at a time.
+
+        Args:
+            raw_lines (iterable[string], iterable[memoryview]): lines of an ADIS file without \
+                line break chars
+            entity (string, optional): only yield the data rows of blocks with this entity \
+                number. Value lines of other entities are skipped without being parsed.
+
+        Yields:
+            tuple(int, string, list[AdisValue]): index of the logical file, entity number of the \
+                block and the data row
+        """
+        for raw_line in raw_lines:
+            line_type = raw_line[:1]
+            if line_type != "V" and line_type != b"V":
+                self.feed(raw_line)
+                continue
+
+            definition_line = self.definition_line
+            if definition_line is None:
+                raise Exception("Definition line is missing before value line")
+            entity_number = definition_line.get_entity_number()
+            if entity is not None and entity_number != entity:
+                continue
+
+            if type(raw_line) is str:
+                self.check_value_line(raw_line)
+                yield self.file_index, entity_number, self.decoder.decode(raw_line, 8)
+            else:
+                self.check_value_line_bytes(raw_line)
+                yield self.file_index, entity_number, \
+                    self.decoder.decode_bytes(raw_line, 8, self.encoding)
@@ -0,0 +1,350 @@
+import threading
+from collections import OrderedDict
+from .adis_schema import AdisSchema
+from .adis_value import (
+    AdisValue,
+    scaled_to_decimal,
+    UNDEFINED
+)
+
+"""
+An AdisRowDecoder decodes the value lines of blocks that share the same field definitions. All
+slice offsets, field sizes and converters are computed once, so decoding a row is a tight loop.
+"""
+
+class AdisRowDecoder:
+    cache_size = 256
+    cache = OrderedDict()
+    cache_lock = threading.Lock()
+    decimal_modes = ["float", "scaled", "decimal"]
+
+    def __init__(self, field_definitions, item_numbers=None, decimals="float"):
+        """Creates an AdisRowDecoder for the provided field definitions.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the value lines \
+                that get decoded
+            item_numbers (set[string], optional): only decode the fields with these item \
+                numbers, the other fields are not even sliced. Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded. "float" divides the \
+                number by the scale of the field, "scaled" returns the digits as an exact \
+                integer (the scale is given by the decimal digits of the field definition) \
+                and "decimal" returns an exact Decimal. Defaults to "float".
+        """
+        if decimals not in AdisRowDecoder.decimal_modes:
+            raise Exception("Invalid decimal mode \"%s\". Has to be one of %s."
+                % (decimals, AdisRowDecoder.decimal_modes))
+        self.decimals = decimals
+
+        fields = []
+        position = 0
+        for definition in field_definitions:
+            field_size = definition.get_field_size()
+            decimal_digits = definition.get_decimal_digits()
+            if decimal_digits != 0 and decimals == "float":
+                scale = 10**decimal_digits
+            else:
+                scale = 0       # exact decimal fields are sliced like text and converted later
+            fields.append((
+                definition.get_item_number(),
+                position,
+                position + field_size,
+                field_size,
+                field_size * "?",   # null value field
+                field_size * "|",   # undefined DDI number
+                scale
+            ))
+            position += field_size
+
+        self.expected_length = position
+        # the last field of a value line may be left out
+        if len(field_definitions) != 0:
+            self.minimum_length = position - field_definitions[-1].get_field_size()
+        else:
+            self.minimum_length = 0
+
+        if item_numbers is not None:
+            fields = [field for field in fields if field[0] in item_numbers]
+            field_definitions = [definition for definition in field_definitions
+                                 if definition.get_item_number() in item_numbers]
+        self.field_definitions = field_definitions
+        self.item_numbers = tuple(field[0] for field in fields)
+        self.fields = tuple(fields)
+        # position and decimal digits of the fields that get converted after slicing
+        self.converters = None
+        if decimals != "float":
+            self.converters = tuple(
+                (position, definition.get_decimal_digits())
+                for position, definition in enumerate(field_definitions)
+                if definition.get_decimal_digits() != 0)
+        self.byte_fields = tuple(
+            (item_number, field_start, field_end, field_size, null_text.encode(),
+             undefined_text.encode(), scale)
+            for item_number, field_start, field_end, field_size, null_text, undefined_text, scale
+            in fields)
+
+    def get_field_definitions(self):
+        """Returns the field definitions this decoder was compiled for. Only the decoded \
+            fields are returned if the decoder was restricted to some item numbers.
+
+        Returns:
+            list[AdisFieldDefinition]: list of field definitions
+        """
+        return self.field_definitions
+
+    def check_length(self, length):
+        """Checks whether the items of a value line have a valid length. The last field may be \
+            left out, chars after the last field are ignored.
+
+        Args:
+            length (int): number of chars of the items of the value line
+        """
+        if length != self.expected_length and length < self.minimum_length:
+            raise Exception("Expecting an item text length of %d chars or %d chars, " \
+                "but got %d chars."
+                % (self.expected_length, self.minimum_length, length))
+        if self.minimum_length < length < self.expected_length:
+            # the same error the last field raises when it gets decoded
+            raise Exception("Expected field size of %d chars or an empty field, but got " \
+                "field size of %d chars." % (self.expected_length - self.minimum_length,
+                                             length - self.minimum_length))
+
+    def decode(self, text, start=0):
+        """Decodes the items of a value line into a list of AdisValues.
+
+        Args:
+            text (string): text that contains the items of the value line
+            start (int, optional): position of the first item in the text. Defaults to 0.
+
+        Returns:
+            list[AdisValue]: AdisValues decoded from the value line. Undefined fields are left out.
+        """
+        if self.converters is not None:
+            return self.to_adis_values(self.decode_values(text, start))
+        self.check_length(len(text) - start)
+
+        values = []
+        for item_number, field_start, field_end, field_size, null_text, undefined_text, scale \
+                in self.fields:
+            value = text[start + field_start:start + field_end]
+            if len(value) != field_size:
+                if len(value) != 0:
+                    raise Exception("Expected field size of %d chars or an empty field, but got " \
+                        "field size of %d chars." % (field_size, len(value)))
+                value = None
+            elif value == null_text:
+                value = None
+            elif value == undefined_text:
+                continue        # no value will be created for this field
+            elif scale:
+                value = float(value) / scale
+            values.append(AdisValue(item_number, value))
+
+        return values
+
+    def decode_values(self, text, start=0):
+        """Decodes the items of a value line into plain values without creating AdisValues.
+
+        Args:
+            text (string): text that contains the items of the value line
+            start (int, optional): position of the first item in the text. Defaults to 0.
+
+        Returns:
+            list: one value per field definition. Undefined fields hold UNDEFINED.
+        """
+        self.check_length(len(text) - start)
+
+        values = []
+        for _, field_start, field_end, field_size, null_text, undefined_text, scale \
+                in self.fields:
+            value = text[start + field_start:start + field_end]
+            if len(value) != field_size:
+                if len(value) != 0:
+                    raise Exception("Expected field size of %d chars or an empty field, but got " \
+                        "field size of %d chars." % (field_size, len(value)))
+                value = None
+            elif value == null_text:
+                value = None
+            elif value == undefined_text:
+                value = UNDEFINED
+            elif scale:
+                value = float(value) / scale
+            values.append(value)
+
+        if self.converters is not None:
+            self.convert_values(values)
+        return values
+
+    def decode_bytes(self, line, start=0, encoding="latin-1"):
+        """Decodes the items of a value line given as bytes into a list of AdisValues. The \
+            fields are sliced without copying the line, decimal fields are converted to float \
+            directly from the bytes and only text fields get decoded to strings.
+
+        Args:
+            line (bytes, memoryview): bytes that contain the items of the value line
+            start (int, optional): position of the first item in the line. Defaults to 0.
+            encoding (string, optional): single-byte encoding of text fields. Defaults to \
+                "latin-1".
+
+        Returns:
+            list[AdisValue]: AdisValues decoded from the value line. Undefined fields are left out.
+        """
+        if self.converters is not None:
+            return self.to_adis_values(self.decode_values_bytes(line, start, encoding))
+        self.check_length(len(line) - start)
+
+        values = []
+        for item_number, field_start, field_end, field_size, null_bytes, undefined_bytes, scale \
+                in self.byte_fields:
+            value = line[start + field_start:start + field_end]
+            if len(value) != field_size:
+                if len(value) != 0:
+                    raise Exception("Expected field size of %d chars or an empty field, but got " \
+                        "field size of %d chars." % (field_size, len(value)))
+                value = None
+            elif value == null_bytes:
+                value = None
+            elif value == undefined_bytes:
+                continue        # no value will be created for this field
+            elif scale:
+                value = float(value) / scale
+            else:
+                value = str(value, encoding)
+            values.append(AdisValue(item_number, value))
+
+        return values
+
+    def decode_values_bytes(self, line, start=0, encoding="latin-1"):
+        """Decodes the items of a value line given as bytes into plain values without \
+            creating AdisValues. See decode_bytes.
+
+        Args:
+            line (bytes, memoryview): bytes that contain the items of the value line
+            start (int, optional): position of the first item in the line. Defaults to 0.
+            encoding (string, optional): single-byte encoding of text fields. Defaults to \
+                "latin-1".
+
+        Returns:
+            list: one value per field definition. Undefined fields hold UNDEFINED.
+        """
+        self.check_length(len(line) - start)
+
+        values = []
+        for _, field_start, field_end, field_size, null_bytes, undefined_bytes, scale \
+                in self.byte_fields:
+            value = line[start + field_start:start + field_end]
+            if len(value) != field_size:
+                if len(value) != 0:
+                    raise Exception("Expected field size of %d chars or an empty field, but got " \
+                        "field size of %d chars." % (field_size, len(value)))
+                value = None
+            elif value == null_bytes:
+                value = None
+            elif value == undefined_bytes:
+                value = UNDEFINED
+            elif scale:
+                value = float(value) / scale
+            else:
+                value = str(value, encoding)
+            values.append(value)
+
+        if self.converters is not None:
+            self.convert_values(values)
+        return values
+
+    def convert_values(self, values):
+        """Converts the sliced text of the decimal fields of a data row into scaled integers \
+            or Decimals. Only used if the decoder does not decode decimal fields as floats.
+
+        Args:
+            values (list): one value per field, gets changed in place
+        """
+        as_decimal = self.decimals == "decimal"
+        for position, decimal_digits in self.converters:
+            value = values[position]
+            if value is None or value is UNDEFINED:
+                continue
+            try:
+                value = int(value)
+            except ValueError:
+                raise Exception("Expected a number in the decimal field %s, but got \"%s\"."
+                    % (self.item_numbers[position], value))
+            if as_decimal:
+                value = scaled_to_decimal(value, decimal_digits)
+            values[position] = value
+
+    def to_adis_values(self, values):
+        """Creates the AdisValues of a data row from its plain values.
+
+        Args:
+            values (list): one value per field, UNDEFINED for undefined fields
+
+        Returns:
+            list[AdisValue]: AdisValues of the data row. Undefined fields are left out.
+        """
+        return [AdisValue(item_number, value)
+                for item_number, value in zip(self.item_numbers, values)
+                if value is not UNDEFINED]
+
+    @staticmethod
+    def for_schema(schema, item_numbers=None, decimals="float"):
+        """Returns the cached AdisRowDecoder for the provided schema. A new decoder is \
+            compiled and cached if there is none yet.
+
+        Args:
+            schema (AdisSchema): interned field definitions of the value lines
+            item_numbers (frozenset[string], optional): only decode the fields with these item \
+                numbers. Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded, see __init__. \
+                Defaults to "float".
+
+        Returns:
+            AdisRowDecoder: decoder for the field definitions
+        """
+        if item_numbers is None and decimals == "float":
+            key = schema
+        else:
+            key = (schema, item_numbers, decimals)
+        cache = AdisRowDecoder.cache
+        with AdisRowDecoder.cache_lock:
+            decoder = cache.get(key)
+            if decoder is not None:
+                cache.move_to_end(key)
+                return decoder
+
+        decoder = AdisRowDecoder(schema.get_field_definitions(), item_numbers, decimals)
+        with AdisRowDecoder.cache_lock:
+            cache[key] = decoder
+            if len(cache) > AdisRowDecoder.cache_size:
+                cache.popitem(last=False)     # remove the least recently used decoder
+        return decoder
+
+    @staticmethod
+    def for_definitions_text(definitions_text, item_numbers=None, decimals="float"):
+        """Returns the cached AdisRowDecoder for the provided definitions text.
+
+        Args:
+            definitions_text (string): part of the definition line that holds the field \
+                definitions
+            item_numbers (frozenset[string], optional): only decode the fields with these item \
+                numbers. Defaults to all fields.
+            decimals (string, optional): how decimal fields are decoded, see __init__. \
+                Defaults to "float".
+
+        Returns:
+            AdisRowDecoder: decoder for the field definitions
+        """
+        return AdisRowDecoder.for_schema(AdisSchema.for_definitions_text(definitions_text),
+                                         item_numbers, decimals)
+
+    @staticmethod
+    def for_definitions(field_definitions):
+        """Returns the cached AdisRowDecoder for the provided field definitions.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions
+
+        Returns:
+            AdisRowDecoder: decoder for the field definitions
+        """
+        return AdisRowDecoder.for_schema(AdisSchema.for_field_definitions(field_definitions))
@@ -0,0 +1,203 @@
+import threading
+from collections import OrderedDict
+from .adis_field_definition import AdisFieldDefinition
+
+"""
+An AdisSchema is the immutable layout of a block: its field definitions and their text. Schemas
+and field definitions are interned by their text, so all blocks with the same layout share one
+schema and one AdisFieldDefinition per field. Schemas are hashable and are used as cache keys. Like the
+decoder cache, the intern tables are LRU caches.
+"""
+
+class AdisSchema:
+    __slots__ = ("definitions_text", "field_definitions", "item_numbers")
+
+    definition_text_length = 11     # each field definition consists of 11 chars
+    cache_size = 65536
+    field_definitions_by_text = OrderedDict()
+    schemas_by_text = OrderedDict()
+    lock = threading.Lock()
+
+    def __init__(self, definitions_text, field_definitions):
+        """Creates an AdisSchema. Use for_definitions_text or for_field_definitions to get the \
+            interned schema instead.
+
+        Args:
+            definitions_text (string): part of the definition line that holds the field \
+                definitions
+            field_definitions (tuple[AdisFieldDefinition]): field definitions of the text
+        """
+        object.__setattr__(self, "definitions_text", definitions_text)
+        object.__setattr__(self, "field_definitions", tuple(field_definitions))
+        object.__setattr__(self, "item_numbers", tuple(
+            definition.get_item_number() for definition in field_definitions))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AdisSchema is immutable, it is shared by all blocks with the " \
+            "same field definitions.")
+
+    def get_definitions_text(self):
+        """Returns the field definitions as written in the definition line.
+
+        Returns:
+            string: definitions text
+        """
+        return self.definitions_text
+
+    def get_field_definitions(self):
+        """Returns the field definitions. They are shared with other blocks and must not be \
+            changed.
+
+        Returns:
+            tuple[AdisFieldDefinition]: field definitions
+        """
+        return self.field_definitions
+
+    def get_item_numbers(self):
+        """Returns the item numbers of the fields.
+
+        Returns:
+            tuple(string): item numbers in the order of the field definitions
+        """
+        return self.item_numbers
+
+    def __eq__(self, other):
+        return self is other or (type(other) is AdisSchema
+                                 and self.definitions_text == other.definitions_text)
+
+    def __hash__(self):
+        return hash(self.definitions_text)
+
+    def __len__(self):
+        return len(self.field_definitions)
+
+    def __repr__(self):
+        return "AdisSchema containing %d field definition(s)" % len(self.field_definitions)
+
+    @staticmethod
+    def get_field_definition(definition_text):
+        """Returns the interned AdisFieldDefinition for the 11 chars of a field definition.
+
+        Args:
+            definition_text (string): item number, field size and decimal digits
+
+        Returns:
+            AdisFieldDefinition: shared field definition
+        """
+        cache = AdisSchema.field_definitions_by_text
+        definition = AdisSchema.get_cached(cache, definition_text)
+        if definition is not None:
+            return definition
+
+        definition = AdisFieldDefinition(definition_text[0:8], definition_text[8:10],
+                                         definition_text[10])
+        with AdisSchema.lock:
+            definition = cache.setdefault(definition_text, definition)
+            AdisSchema.evict(cache)
+        return definition
+
+    @staticmethod
+    def for_definitions_text(definitions_text):
+        """Returns the interned AdisSchema for the field definitions of a definition line.
+
+        Args:
+            definitions_text (string): part of the definition line that holds the field \
+                definitions
+
+        Returns:
+            AdisSchema: shared schema
+        """
+        cache = AdisSchema.schemas_by_text
+        schema = AdisSchema.get_cached(cache, definitions_text)
+        if schema is not None:
+            return schema
+
+        text_length = AdisSchema.definition_text_length
+        if len(definitions_text) % text_length != 0:
+            raise Exception("Length of definitions text is %d but it has to be a multiple of %d"
+                % (len(definitions_text), text_length))
+        field_definitions = [AdisSchema.get_field_definition(definitions_text[start:start
+                                                                              + text_length])
+                             for start in range(0, len(definitions_text), text_length)]
+
+        # texts like " 5" instead of "05" for the field size share the schema of the dumped text
+        normalized_text = "".join(definition.dumps() for definition in field_definitions)
+        with AdisSchema.lock:
+            schema = cache.get(normalized_text)
+            if schema is None:
+                schema = AdisSchema(normalized_text, field_definitions)
+            cache[normalized_text] = schema
+            cache.move_to_end(normalized_text)
+            cache[definitions_text] = schema
+            cache.move_to_end(definitions_text)
+            AdisSchema.evict(cache)
+        return schema
+
+    @staticmethod
+    def get_cached(cache, key):
+        """Returns an entry of an intern table and marks it as recently used.
+
+        Args:
+            cache (OrderedDict): field_definitions_by_text or schemas_by_text
+            key (string): text of the entry
+
+        Returns:
+            AdisFieldDefinition, AdisSchema: the entry, or None if there is none
+        """
+        with AdisSchema.lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    @staticmethod
+    def evict(cache):
+        """Removes the least recently used entries of an intern table until it holds at most \
+            cache_size entries. The lock has to be held.
+
+        Args:
+            cache (OrderedDict): field_definitions_by_text or schemas_by_text
+        """
+        while len(cache) > AdisSchema.cache_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def for_field_definitions(field_definitions):
+        """Returns the interned AdisSchema for a list of field definitions.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions
+
+        Returns:
+            AdisSchema: shared schema
+        """
+        return AdisSchema.for_definitions_text(
+            "".join(definition.dumps() for definition in field_definitions))
+
+    @staticmethod
+    def for_definition_dicts(definition_dicts):
+        """Returns the interned AdisSchema for field definitions given as dicts (see \
+            AdisFieldDefinition.to_dict). AdisFieldDefinitions are only created for layouts \
+            that have not been interned yet.
+
+        Args:
+            definition_dicts (list[dict]): dicts containing the item number, the field size \
+                and the decimal digits of each field
+
+        Returns:
+            AdisSchema: shared schema
+        """
+        parts = []
+        for definition_dict in definition_dicts:
+            item_number = definition_dict.get("item_number")
+            field_size = definition_dict.get("field_size")
+            decimal_digits = definition_dict.get("decimal_digits")
+            if type(item_number) is not str or len(item_number) != 8 \
+                    or type(field_size) is not int or not 1 <= field_size <= 99 \
+                    or type(decimal_digits) is not int or not 0 <= decimal_digits <= 9:
+                # let AdisFieldDefinition convert the values or raise the matching error
+                return AdisSchema.for_field_definitions([
+                    AdisFieldDefinition.from_dict(definition_dict)
+                    for definition_dict in definition_dicts])
+            parts.append("%s%02d%d" % (item_number, field_size, decimal_digits))
+        return AdisSchema.for_definitions_text("".join(parts))
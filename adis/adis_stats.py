@@ -0,0 +1,214 @@
+import time
+from .adis_lazy_rows import AdisLazyRows
+from .adis_value import UNDEFINED
+
+"""
+Opt-in instrumentation of parsing and serialization. An AdisStats object collects the time spent
+in each phase and counters like lines, chars, rows, fields and nulls. Nothing is measured unless
+an AdisStats object is passed, so the hot paths stay unchanged when the stats are disabled.
+"""
+
+class AdisStats:
+    def __init__(self, callback=None):
+        """Creates an empty AdisStats object. It can be passed to several operations, the \
+            times and counters add up.
+
+        Args:
+            callback (callable, optional): called as callback(operation, stats) after each \
+                operation ("parse", "dumps", "to_json", ...) that used these stats, e.g. to \
+                forward them to a metrics system. Defaults to None.
+        """
+        self.callback = callback
+        self.times = {}
+        self.counters = {}
+        self.entity_rows = {}
+
+    def add_time(self, phase, seconds):
+        """Adds time to a phase.
+
+        Args:
+            phase (string): name of the phase, e.g. "split_lines"
+            seconds (float): time spent in the phase
+        """
+        self.times[phase] = self.times.get(phase, 0.0) + seconds
+
+    def measure(self, phase, function, *args):
+        """Calls a function and adds the time of the call to a phase.
+
+        Args:
+            phase (string): name of the phase
+            function (callable): function to call
+            *args: arguments of the function
+
+        Returns:
+            the result of the function
+        """
+        started = time.perf_counter()
+        result = function(*args)
+        self.add_time(phase, time.perf_counter() - started)
+        return result
+
+    def count(self, counter, number=1):
+        """Increases a counter.
+
+        Args:
+            counter (string): name of the counter, e.g. "lines"
+            number (int, optional): value that is added. Defaults to 1.
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + number
+
+    def count_blocks(self, blocks, fields=True):
+        """Counts the blocks and rows of blocks and the rows per entity.
+
+        Args:
+            blocks (iterable[AdisBlock]): blocks to count
+            fields (bool, optional): Whether to count the defined fields and the null fields as \
+                well. They are not counted for lazy data rows, since that would decode them. \
+                Defaults to True.
+        """
+        for block in blocks:
+            rows = len(block.get_data_rows())
+            self.count("blocks")
+            self.count("rows", rows)
+            entity_number = block.get_entity_number()
+            self.entity_rows[entity_number] = self.entity_rows.get(entity_number, 0) + rows
+            if not fields or type(block.get_data_rows()) == AdisLazyRows:
+                continue
+
+            defined_fields = 0
+            nulls = 0
+            for values in block.iter_values():
+                for value in values:
+                    if value is None:
+                        nulls += 1
+                    elif value is UNDEFINED:
+                        continue
+                    defined_fields += 1
+            self.count("fields", defined_fields)
+            self.count("nulls", nulls)
+
+    def feed_lines(self, parser, raw_lines):
+        """Feeds lines into a parser and collects the completed blocks. The time of reading \
+            and splitting the lines ("split_lines"), of parsing value lines ("parse_values") \
+            and of parsing the other lines ("parse_lines") is measured separately, and the \
+            lines and their chars are counted.
+
+        Args:
+            parser (AdisParser): parser the lines are fed into
+            raw_lines (iterable[string], iterable[memoryview]): lines without line break chars
+
+        Returns:
+            list[tuple(int, AdisBlock)]: index of the logical file and the block of each \
+                completed block
+        """
+        perf_counter = time.perf_counter
+        feed = parser.feed
+        indexed_blocks = []
+        split_seconds = 0.0
+        values_seconds = 0.0
+        lines_seconds = 0.0
+        lines = 0
+        chars = 0
+        try:
+            started = perf_counter()
+            for raw_line in raw_lines:
+                fed = perf_counter()
+                split_seconds += fed - started
+                completed_block = feed(raw_line)
+                started = perf_counter()
+                if raw_line[:1] == "V" or raw_line[:1] == b"V":
+                    values_seconds += started - fed
+                else:
+                    lines_seconds += started - fed
+                lines += 1
+                chars += len(raw_line)
+                if completed_block is not None:
+                    indexed_blocks.append(completed_block)
+            fed = perf_counter()
+            split_seconds += fed - started
+
+            completed_block = parser.finish()
+            lines_seconds += perf_counter() - fed
+            if completed_block is not None:
+                indexed_blocks.append(completed_block)
+        finally:
+            self.add_time("split_lines", split_seconds)
+            self.add_time("parse_values", values_seconds)
+            self.add_time("parse_lines", lines_seconds)
+            self.count("lines", lines)
+            self.count("chars", chars)
+        return indexed_blocks
+
+    def finish(self, operation):
+        """Marks the end of an operation and calls the callback.
+
+        Args:
+            operation (string): name of the operation, e.g. "parse"
+        """
+        self.count("operations." + operation)
+        if self.callback is not None:
+            self.callback(operation, self)
+
+    def get_times(self):
+        """Returns the time spent in each phase.
+
+        Returns:
+            dict: phase as key and seconds as value
+        """
+        return self.times
+
+    def get_counters(self):
+        """Returns the counters.
+
+        Returns:
+            dict: counter name as key and count as value
+        """
+        return self.counters
+
+    def get_entity_rows(self):
+        """Returns the number of rows per entity.
+
+        Returns:
+            dict: entity number as key and the number of rows as value
+        """
+        return self.entity_rows
+
+    def to_dict(self):
+        """Creates a dict containing all times and counters.
+
+        Returns:
+            dict: contains times, counters and entity_rows
+        """
+        return {
+            "times": dict(self.times),
+            "counters": dict(self.counters),
+            "entity_rows": dict(self.entity_rows)
+        }
+
+    def __repr__(self):
+        return "AdisStats: " + ", ".join(
+            ["%s=%.6fs" % (phase, seconds) for phase, seconds in self.times.items()]
+            + ["%s=%d" % (counter, number) for counter, number in self.counters.items()])
+
+
+class AdisStatsWriter:
+    def __init__(self, output_file, stats):
+        """Creates a text file like object that counts the written lines and chars and passes \
+            the text on to a file object. The AdisWriter writes one line per call.
+
+        Args:
+            output_file (file): file object opened in text mode
+            stats (AdisStats): stats the lines and chars are counted in
+        """
+        self.output_file = output_file
+        self.stats = stats
+
+    def write(self, text):
+        """Writes text to the file object and counts it.
+
+        Args:
+            text (string): text to write
+        """
+        self.stats.count("lines")
+        self.stats.count("chars", len(text))
+        self.output_file.write(text)
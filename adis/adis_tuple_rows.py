@@ -0,0 +1,93 @@
+from .adis_value import (
+    AdisValue,
+    UNDEFINED
+)
+
+"""
+Tuple storage for the data rows of an AdisBlock. Each data row is a tuple of plain values and the
+item numbers are stored once per block instead of once per value.
+"""
+
+class AdisTupleRows:
+    __slots__ = ("field_definitions", "item_numbers", "rows")
+
+    def __init__(self, field_definitions, rows=None):
+        """Creates tuple data rows. The object behaves like the list of data rows of an \
+            AdisBlock, each data row is only turned into AdisValues when it gets accessed.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the block
+            rows (list[tuple], optional): one tuple per data row that contains one value per \
+                field definition, UNDEFINED for undefined fields. Defaults to no data rows.
+        """
+        self.field_definitions = field_definitions
+        self.item_numbers = tuple(definition.get_item_number()
+                                  for definition in field_definitions)
+        self.rows = rows if rows is not None else []
+
+    def append_values(self, values):
+        """Appends a data row.
+
+        Args:
+            values (list, tuple): one value per field definition, UNDEFINED for undefined fields
+        """
+        self.rows.append(tuple(values))
+
+    def get_item_numbers(self):
+        """Returns the item numbers of the fields in the order of the values of a data row.
+
+        Returns:
+            tuple(string): item numbers
+        """
+        return self.item_numbers
+
+    def get_rows(self):
+        """Returns the data rows as tuples.
+
+        Returns:
+            list[tuple]: one tuple per data row, UNDEFINED for undefined fields
+        """
+        return self.rows
+
+    def get_values(self, index):
+        """Returns the values of a data row.
+
+        Args:
+            index (int): index of the data row
+
+        Returns:
+            tuple: one value per field definition, UNDEFINED for undefined fields
+        """
+        return self.rows[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        return [AdisValue(item_number, value)
+                for item_number, value in zip(self.item_numbers, self.rows[index])
+                if value is not UNDEFINED]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for index in range(len(self.rows)):
+            yield self[index]
+
+    @staticmethod
+    def from_values(field_definitions, values_of_rows):
+        """Creates tuple data rows from the plain values of data rows.
+
+        Args:
+            field_definitions (list[AdisFieldDefinition]): field definitions of the block
+            values_of_rows (iterable[list]): one list per data row that contains one value per \
+                field definition, UNDEFINED for undefined fields
+
+        Returns:
+            AdisTupleRows: new tuple data rows
+        """
+        return AdisTupleRows(field_definitions, [tuple(values) for values in values_of_rows])
+
+    def __repr__(self):
+        return "AdisTupleRows containing %d data row(s)" % len(self.rows)
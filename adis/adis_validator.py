@@ -0,0 +1,310 @@
+import mmap
+import os
+import re
+from .adis_lines import (
+    AdisLine,
+    DefinitionLine,
+    EndOfLogicalFileLine,
+    PhysicalEndOfFileLine
+)
+
+"""
+Validation of ADIS files without parsing them. The lines are checked in one pass over the raw
+bytes: value lines are only checked by their status char and length, no values get decoded. Each
+problem is reported with its line number and byte offset.
+"""
+
+class AdisProblem:
+    __slots__ = ("line_number", "offset", "reason", "line")
+
+    def __init__(self, line_number, offset, reason, line=None):
+        """Creates an AdisProblem.
+
+        Args:
+            line_number (int): number of the line, starting at 1
+            offset (int): byte offset of the start of the line, None if it is not known
+            reason (string): description of the problem
+            line (string, optional): the line without line break chars. Defaults to None.
+        """
+        self.line_number = line_number
+        self.offset = offset
+        self.reason = reason
+        self.line = line
+
+    def get_line_number(self):
+        """Returns the number of the line, starting at 1.
+
+        Returns:
+            int: line number
+        """
+        return self.line_number
+
+    def get_offset(self):
+        """Returns the byte offset of the start of the line.
+
+        Returns:
+            int: byte offset, or None if it is not known
+        """
+        return self.offset
+
+    def get_reason(self):
+        """Returns the description of the problem.
+
+        Returns:
+            string: reason
+        """
+        return self.reason
+
+    def get_line(self):
+        """Returns the line the problem was found in.
+
+        Returns:
+            string: line without line break chars, or None if it is not known
+        """
+        return self.line
+
+    def to_dict(self):
+        """Creates a dict that contains all information of this problem.
+
+        Returns:
+            dict: line_number, offset, reason and line
+        """
+        return {
+            "line_number": self.line_number,
+            "offset": self.offset,
+            "reason": self.reason,
+            "line": self.line
+        }
+
+    def __repr__(self):
+        if self.offset is None:
+            return "AdisProblem in line %d: %s" % (self.line_number, self.reason)
+        return "AdisProblem in line %d (byte %d): %s" % (self.line_number, self.offset,
+                                                         self.reason)
+
+
+class AdisValidator:
+    line_type_chars = frozenset("DVECZT")
+    status_bytes = frozenset(ord(status_char) for status_char in AdisLine.status_chars)
+    value_lines_patterns = {}
+    max_value_lines = 4096      # value lines that are matched at once
+
+    def __init__(self, encoding="latin-1", max_problems=None):
+        """Creates an AdisValidator.
+
+        Args:
+            encoding (string, optional): single-byte encoding of the ADIS text. Defaults to \
+                "latin-1".
+            max_problems (int, optional): stop validating after this number of problems, e.g. 1 \
+                to only find the first bad line. Defaults to all problems.
+        """
+        self.encoding = encoding
+        self.max_problems = max_problems
+
+    def validate_file(self, path_to_file):
+        """Validates an ADIS file. The file is memory-mapped and scanned once.
+
+        Args:
+            path_to_file (string): Path to the ADIS file
+
+        Returns:
+            list[AdisProblem]: problems in the order of the file, empty if the file is valid
+        """
+        with open(path_to_file, "rb") as input_file:
+            if os.fstat(input_file.fileno()).st_size == 0:
+                return self.validate_buffer(b"")
+            with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return self.validate_buffer(buffer)
+
+    def validate_buffer(self, buffer):
+        """Validates the ADIS text of a buffer. Checked are the line types, the status chars, \
+            the definition lines, the lengths of the value lines against the current \
+            definition line and the structure of the logical files ("EN" and "ZN" lines). The \
+            values of the fields are not decoded.
+
+        Args:
+            buffer (bytes, bytearray, mmap.mmap): buffer containing the ADIS text
+
+        Returns:
+            list[AdisProblem]: problems in the order of the buffer, empty if the text is valid
+        """
+        problems = []
+        max_problems = self.max_problems
+        status_bytes = AdisValidator.status_bytes
+        size = len(buffer)
+        position = 0
+        line_number = 0
+        decoder = None
+        value_lines_pattern = None
+        expected_length = 0
+        minimum_length = 0
+        skip_values = False     # the value lines of an invalid definition line are not checked
+        pending_blocks = False
+        end_line_number = None
+
+        while position < size:
+            if max_problems is not None and len(problems) >= max_problems:
+                return problems
+
+            if value_lines_pattern is not None:
+                # valid value lines of the current block are skipped by one match
+                match = value_lines_pattern.match(buffer, position)
+                if match is not None:
+                    line_number += match.group(0).count(b"\n")
+                    position = match.end()
+                    continue
+
+            line_end = buffer.find(b"\n", position)
+            if line_end == -1:
+                line_end = size
+            next_position = line_end + 1
+            if line_end > position and buffer[line_end - 1] == 13:     # "\r"
+                line_end -= 1
+            line_number += 1
+            line_start = position
+            position = next_position
+            length = line_end - line_start
+            if length == 0:
+                continue    # empty lines are ignored by the parser
+
+            if end_line_number is not None:
+                problems.append(self.create_problem(
+                    buffer, line_number, line_start, line_end,
+                    "Line after the physical end of file in line %d" % end_line_number))
+                break
+
+            if buffer[line_start] == 86:    # "V"
+                if length < 2 or buffer[line_start + 1] not in status_bytes:
+                    problems.append(self.create_problem(buffer, line_number, line_start,
+                                                        line_end, "Invalid status char"))
+                elif decoder is not None:
+                    items_length = length - 8
+                    if items_length != expected_length and items_length != minimum_length:
+                        problems.append(self.create_problem(
+                            buffer, line_number, line_start, line_end,
+                            AdisValidator.get_length_reason(decoder, items_length)))
+                elif not skip_values:
+                    problems.append(self.create_problem(
+                        buffer, line_number, line_start, line_end,
+                        "Definition line is missing before value line"))
+                continue
+
+            text = str(buffer[line_start:line_end], self.encoding)
+            reason, line = AdisValidator.check_line(text)
+            if reason is not None:
+                problems.append(AdisProblem(line_number, line_start, reason, text))
+
+            line_type = type(line)
+            if text[0] == "D":
+                pending_blocks = True
+                decoder = None
+                value_lines_pattern = None
+                skip_values = line is None
+                if line is not None:
+                    decoder = line.get_row_decoder()
+                    expected_length = decoder.expected_length
+                    minimum_length = decoder.minimum_length
+                    value_lines_pattern = AdisValidator.get_value_lines_pattern(expected_length,
+                                                                                minimum_length)
+            elif line_type == EndOfLogicalFileLine or line_type == PhysicalEndOfFileLine:
+                decoder = None
+                value_lines_pattern = None
+                skip_values = False
+                pending_blocks = False
+                if line_type == PhysicalEndOfFileLine:
+                    end_line_number = line_number
+
+        if max_problems is not None and len(problems) >= max_problems:
+            return problems
+        if pending_blocks:
+            problems.append(AdisProblem(line_number + 1, size,
+                                        "Logical file is not terminated by an EN or ZN line"))
+        elif end_line_number is None:
+            problems.append(AdisProblem(line_number + 1, size,
+                                        "Physical end of file (ZN) is missing"))
+        return problems
+
+    def create_problem(self, buffer, line_number, line_start, line_end, reason):
+        """Creates an AdisProblem for a line of a buffer.
+
+        Args:
+            buffer (bytes, bytearray, mmap.mmap): buffer containing the ADIS text
+            line_number (int): number of the line, starting at 1
+            line_start (int): byte offset of the start of the line
+            line_end (int): byte offset of the end of the line without line break chars
+            reason (string): description of the problem
+
+        Returns:
+            AdisProblem: new problem
+        """
+        return AdisProblem(line_number, line_start, reason,
+                           str(buffer[line_start:line_end], self.encoding))
+
+    @staticmethod
+    def get_value_lines_pattern(expected_length, minimum_length):
+        """Returns a pattern that matches up to max_value_lines complete value lines with a \
+            valid status char and items of exactly expected_length or minimum_length chars. \
+            The parser ignores chars after the last field, the validator reports them.
+
+        Args:
+            expected_length (int): number of chars of the items of a value line
+            minimum_length (int): number of chars of the items without the last field
+
+        Returns:
+            re.Pattern: compiled pattern for bytes
+        """
+        key = (expected_length, minimum_length)
+        pattern = AdisValidator.value_lines_patterns.get(key)
+        if pattern is None:
+            status_chars = "".join(AdisLine.status_chars).encode()
+            pattern = re.compile(b"(?:V[%s](?:[^\r\n]{%d}|[^\r\n]{%d})\r?\n){1,%d}"
+                                 % (status_chars, 6 + expected_length, 6 + minimum_length,
+                                    AdisValidator.max_value_lines))
+            AdisValidator.value_lines_patterns[key] = pattern
+        return pattern
+
+    @staticmethod
+    def get_length_reason(decoder, length):
+        """Returns why the items of a value line have an invalid length. Lines the parser \
+            rejects get its error, longer lines are reported as well, although the parser \
+            ignores the chars after the last field.
+
+        Args:
+            decoder (AdisRowDecoder): decoder of the definition line of the value line
+            length (int): number of chars of the items, neither the expected nor the minimum \
+                length
+
+        Returns:
+            string: reason
+        """
+        try:
+            decoder.check_length(length)
+        except Exception as exception:
+            return str(exception)
+        return "Expecting an item text length of %d chars or %d chars, but got %d chars." \
+            % (decoder.expected_length, decoder.minimum_length, length)
+
+    @staticmethod
+    def check_line(text):
+        """Checks a line that is not a value line by creating its AdisLine.
+
+        Args:
+            text (string): line without line break chars
+
+        Returns:
+            tuple(string, AdisLine): the reason why the line is invalid or None, and the line \
+                or None if it is invalid
+        """
+        if text[0] not in AdisValidator.line_type_chars:
+            return "Unknown line type char \"%s\"" % text[0], None
+        if len(text) < 2 or text[1] not in AdisLine.status_chars:
+            return "Invalid status char", None
+
+        try:
+            line = AdisLine.parse_line(text)
+        except Exception as exception:
+            return str(exception), None
+
+        if type(line) == DefinitionLine and len(line.get_entity_number()) != 6:
+            return "The entity number has to consist of 6 chars", None
+        return None, line
@@ -1,4 +1,15 @@
+from decimal import (
+    Context,
+    Decimal
+)
+
+# enough precision for the largest field (99 digits), so scaling never rounds
+decimal_context = Context(prec=100)
+
+
 class AdisValue:
+    __slots__ = ("item_number", "value")
+
     strip_string_values = True
 
     def __init__(self, item_number, value):
@@ -6,24 +17,39 @@ class AdisValue:
 
         Args:
             item_number (string): item number of the field
-            value (None, string, int, float): value of the field
+            value (None, string, int, float, Decimal): value of the field
         """
         self.item_number = item_number
         self.value = value
 
-    def to_dict(self):
+    def to_dict(self, options=None, decimal_digits=0):
         """Returns the AdisValue as a dict.
 
+        Args:
+            options (AdisSerializationOptions, optional): options of the conversion. Defaults \
+                to the class flag strip_string_values.
+            decimal_digits (int, optional): number of decimal digits of a scaled integer \
+                (decimal mode "scaled"). The integer is divided by 10**decimal_digits. \
+                Defaults to 0.
+
         Returns:
-            dict: contains item_number and value
+            dict: contains item_number and value. Scaled integers and Decimals are turned into \
+                floats, so the dict only contains builtin types. Decimals with more than 15 \
+                significant digits lose precision.
         """
+        if options is None:
+            options = AdisSerializationOptions.from_class_flags()
 
         result_dict = {
             "item_number": self.item_number
         }
 
-        if AdisValue.strip_string_values and isinstance(self.value, str):
+        if options.strip_string_values and isinstance(self.value, str):
             result_dict["value"] = self.value.strip()
+        elif type(self.value) is Decimal:
+            result_dict["value"] = float(self.value)
+        elif decimal_digits != 0 and type(self.value) is int:
+            result_dict["value"] = self.value / 10**decimal_digits
         else:
             result_dict["value"] = self.value
 
@@ -31,3 +57,61 @@ class AdisValue:
 
     def __repr__(self):
         return "AdisValue: item_number=%s, value=%s" % (self.item_number, str(self.value))
+
+
+class AdisSerializationOptions:
+    __slots__ = ("strip_string_values",)
+
+    def __init__(self, strip_string_values=True):
+        """Creates AdisSerializationOptions. The options are passed through the to_dict methods \
+            of a single conversion, so conversions with different options can run in parallel \
+            threads.
+
+        Args:
+            strip_string_values (bool, optional): Whether string values should be stripped or \
+                not. Defaults to True.
+        """
+        self.strip_string_values = strip_string_values
+
+    @staticmethod
+    def from_class_flags():
+        """Creates AdisSerializationOptions from the class flag AdisValue.strip_string_values, \
+            which is used when no options are passed.
+
+        Returns:
+            AdisSerializationOptions: options matching the class flag
+        """
+        return AdisSerializationOptions(AdisValue.strip_string_values)
+
+    def __repr__(self):
+        return "AdisSerializationOptions: strip_string_values=%s" % self.strip_string_values
+
+
+class AdisUndefinedValue:
+    """Marks a field whose DDI number is undefined ("|" chars in the ADIS file). In contrast to \
+        a null value ("?" chars) no AdisValue gets created for such a field.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        # unpickled as the module level singleton, so "is UNDEFINED" keeps working
+        return "UNDEFINED"
+
+    def __repr__(self):
+        return "UNDEFINED"
+
+
+UNDEFINED = AdisUndefinedValue()
+
+
+def scaled_to_decimal(value, decimal_digits):
+    """Turns a scaled integer into a Decimal without rounding.
+
+    Args:
+        value (int): the digits of a decimal field as integer
+        decimal_digits (int): number of decimal digits of the field
+
+    Returns:
+        Decimal: the exact value of the field
+    """
+    return Decimal(value).scaleb(-decimal_digits, decimal_context)
@@ -0,0 +1,141 @@
+from .adis_lines import AdisLine
+from .adis_value import UNDEFINED
+
+"""
+The AdisWriter writes ADIS lines incrementally to a file object. Each line is written as soon as
+it is complete, so the ADIS text is never built up as one string.
+"""
+
+class AdisWriter:
+    def __init__(self, output_file):
+        """Creates an AdisWriter.
+
+        Args:
+            output_file (file): file object opened in text mode. Use newline="" when opening \
+                a file, the writer already terminates each line with "\r\n".
+        """
+        self.output_file = output_file
+        self.value_line_prefix = None
+        self.field_definitions = None
+        self.scaled = False
+
+    def begin_block(self, entity_number, status, field_definitions, scaled=False):
+        """Writes the definition line of a new block. The following data rows belong to this \
+            block.
+
+        Args:
+            entity_number (string): Entity number of the block (has to be a string with 6 chars)
+            status (string): Status char of the block, can be H, N, S, F or D
+            field_definitions (list[AdisFieldDefinition]): Field definitions of the block
+            scaled (bool, optional): Whether integers in decimal fields are scaled integers, \
+                see AdisFieldDefinition.dumps_value. Defaults to False.
+        """
+        self.resume_block(entity_number, status, field_definitions, scaled)
+
+        parts = ["D", status, entity_number]
+        for definition in field_definitions:
+            parts.append(definition.dumps())
+        parts.append("\r\n")
+        self.output_file.write("".join(parts))
+
+    def resume_block(self, entity_number, status, field_definitions, scaled=False):
+        """Continues a block whose definition line has already been written. The following \
+            data rows belong to this block.
+
+        Args:
+            entity_number (string): Entity number of the block (has to be a string with 6 chars)
+            status (string): Status char of the block, can be H, N, S, F or D
+            field_definitions (list[AdisFieldDefinition]): Field definitions of the block
+            scaled (bool, optional): Whether integers in decimal fields are scaled integers, \
+                see AdisFieldDefinition.dumps_value. Defaults to False.
+        """
+        if status not in AdisLine.status_chars:
+            raise Exception("Invalid status char. Has to be one of %s."
+                % AdisLine.status_chars)
+        if type(entity_number) is not str or len(entity_number) != 6:
+            raise Exception("""The entity number has to be a string consisting of 6 chars.
+                Got \"%s\".""" % entity_number)
+
+        self.value_line_prefix = "V" + status + entity_number
+        self.field_definitions = field_definitions
+        self.scaled = scaled
+
+    def write_row(self, data_row):
+        """Writes a value line for a data row of the current block.
+
+        Args:
+            data_row (list[AdisValue], dict): list containing the values of the data row or a \
+                dict where the key is the item number and the value is the actual value of the \
+                field. Fields that are not in the data row are written as undefined.
+        """
+        if self.field_definitions is None:
+            raise Exception("A block has to be started before data rows can be written.")
+
+        if type(data_row) is dict:
+            values_by_item_number = data_row
+        else:
+            values_by_item_number = {}
+            for value in data_row:
+                values_by_item_number[value.item_number] = value.value
+
+        parts = [self.value_line_prefix]
+        for definition in self.field_definitions:
+            item_number = definition.item_number
+            if item_number in values_by_item_number:
+                parts.append(definition.dumps_value(values_by_item_number[item_number],
+                                                    scaled=self.scaled))
+            else:
+                # the value of this field is undefined
+                parts.append(definition.dumps_value(None, undefined=True))
+        parts.append("\r\n")
+        self.output_file.write("".join(parts))
+
+    def write_values(self, values):
+        """Writes a value line from plain values of the current block.
+
+        Args:
+            values (list): one value per field definition, UNDEFINED for undefined fields
+        """
+        if self.field_definitions is None:
+            raise Exception("A block has to be started before data rows can be written.")
+
+        parts = [self.value_line_prefix]
+        for definition, value in zip(self.field_definitions, values):
+            if value is UNDEFINED:
+                parts.append(definition.dumps_value(None, undefined=True))
+            else:
+                parts.append(definition.dumps_value(value, scaled=self.scaled))
+        parts.append("\r\n")
+        self.output_file.write("".join(parts))
+
+    def write_block(self, block):
+        """Writes the definition line and all value lines of an AdisBlock.
+
+        Args:
+            block (AdisBlock): block to write
+        """
+        self.begin_block(block.get_entity_number(), block.status, block.get_field_definitions(),
+                         block.decimals == "scaled")
+        self.write_data_rows(block)
+
+    def write_data_rows(self, block):
+        """Writes the value lines of an AdisBlock. The block has to be started with begin_block \
+            or resume_block.
+
+        Args:
+            block (AdisBlock): block whose data rows get written
+        """
+        for values in block.iter_values():
+            self.write_values(values)
+
+    def end_logical_file(self):
+        """Writes the end of the current logical file ("EN")."""
+        self.output_file.write("EN\r\n")
+        self.value_line_prefix = None
+        self.field_definitions = None
+
+    def close(self):
+        """Writes the physical end of the file ("ZN"). The file object itself is not closed."""
+        self.output_file.write("ZN\r\n")
+        self.value_line_prefix = None
+        self.field_definitions = None
@@ -0,0 +1,123 @@
+import io
+import random
+import string
+from adis import (
+    AdisFieldDefinition,
+    AdisWriter
+)
+from adis.adis_value import UNDEFINED
+
+"""
+Seeded generator for synthetic ADIS files. The same parameters and seed always produce the same
+ADIS text.
+"""
+
+def generate_field_definitions(generator, number_of_fields, field_size_range, decimal_ratio):
+    """Creates random field definitions.
+
+    Args:
+        generator (random.Random): seeded random number generator
+        number_of_fields (int): number of field definitions
+        field_size_range (tuple(int, int)): smallest and largest field size
+        decimal_ratio (float): share of decimal fields (between 0 and 1)
+
+    Returns:
+        list[AdisFieldDefinition]: field definitions
+    """
+    field_definitions = []
+    item_numbers = generator.sample(range(100000000), number_of_fields)
+    for item_number in item_numbers:
+        decimal_digits = 0
+        if generator.random() < decimal_ratio:
+            # at least two integer digits and at most 15 digits, so that str(float) neither
+            # uses the exponent notation nor loses digits when the value gets written
+            field_size = generator.randint(max(3, field_size_range[0]),
+                                           max(3, min(15, field_size_range[1])))
+            decimal_digits = generator.randint(1, min(9, field_size - 2))
+        else:
+            field_size = generator.randint(*field_size_range)
+        field_definitions.append(AdisFieldDefinition("%08d" % item_number, field_size,
+                                                     decimal_digits))
+    return field_definitions
+
+
+def generate_value(generator, field_definition, null_ratio, undefined_ratio):
+    """Creates a random value that fits the field definition.
+
+    Args:
+        generator (random.Random): seeded random number generator
+        field_definition (AdisFieldDefinition): field definition of the value
+        null_ratio (float): share of null values ("?" fields)
+        undefined_ratio (float): share of undefined values ("|" fields)
+
+    Returns:
+        None, string, float, UNDEFINED: the value
+    """
+    chance = generator.random()
+    if chance < null_ratio:
+        return None
+    if chance < null_ratio + undefined_ratio:
+        return UNDEFINED
+
+    field_size = field_definition.get_field_size()
+    decimal_digits = field_definition.get_decimal_digits()
+    if decimal_digits == 0:
+        length = generator.randint(1, field_size)
+        return "".join(generator.choice(string.ascii_letters + string.digits + " ")
+                       for _ in range(length))
+
+    scaled_value = generator.randrange(10**decimal_digits, 10**(field_size - 1))
+    return round(scaled_value / 10**decimal_digits, decimal_digits)
+
+
+def generate_adis(output_file, seed=0, logical_files=1, blocks_per_file=10, rows_per_block=100,
+                  fields_per_block=(5, 20), field_size_range=(1, 20), decimal_ratio=0.5,
+                  null_ratio=0.05, undefined_ratio=0.01):
+    """Writes a synthetic ADIS file.
+
+    Args:
+        output_file (file): file object opened in text mode
+        seed (int, optional): seed of the random number generator. Defaults to 0.
+        logical_files (int, optional): number of logical files. Defaults to 1.
+        blocks_per_file (int, optional): number of blocks per logical file. Defaults to 10.
+        rows_per_block (int, optional): number of data rows per block. Defaults to 100.
+        fields_per_block (tuple(int, int), optional): smallest and largest number of fields \
+            per block. Defaults to (5, 20).
+        field_size_range (tuple(int, int), optional): smallest and largest field size. \
+            Defaults to (1, 20).
+        decimal_ratio (float, optional): share of decimal fields. Defaults to 0.5.
+        null_ratio (float, optional): share of null values. Defaults to 0.05.
+        undefined_ratio (float, optional): share of undefined values. Defaults to 0.01.
+
+    Returns:
+        int: number of written data rows
+    """
+    generator = random.Random(seed)
+    writer = AdisWriter(output_file)
+    number_of_rows = 0
+    for file_index in range(logical_files):
+        if file_index != 0:
+            writer.end_logical_file()
+        for block_index in range(blocks_per_file):
+            field_definitions = generate_field_definitions(
+                generator, generator.randint(*fields_per_block), field_size_range, decimal_ratio)
+            writer.begin_block("%06d" % (block_index + 1), generator.choice("HNSFD"),
+                               field_definitions)
+            for _ in range(rows_per_block):
+                writer.write_values([generate_value(generator, definition, null_ratio,
+                                                    undefined_ratio)
+                                     for definition in field_definitions])
+                number_of_rows += 1
+    writer.close()
+    return number_of_rows
+
+
+def generate_adis_text(**parameters):
+    """Creates a synthetic ADIS text. See generate_adis for the parameters.
+
+    Returns:
+        string: ADIS text
+    """
+    output = io.StringIO()
+    generate_adis(output, **parameters)
+    return output.getvalue()
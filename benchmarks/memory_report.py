@@ -0,0 +1,76 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adis import (
+    Adis,
+    AdisParser
+)
+from benchmarks.adis_generator import generate_adis_text
+
+"""
+Memory report for the storage modes of the AdisParser. A synthetic ADIS text is parsed and the
+memory that is still allocated while the parsed Adis object is alive is divided by the number of
+data rows.
+
+Usage:
+    python benchmarks/memory_report.py [--rows-per-block 1000] [--blocks 20]
+"""
+
+def measure_bytes_per_row(adis_text, storage, number_of_rows):
+    """Measures the memory that the parsed data rows occupy.
+
+    Args:
+        adis_text (string): ADIS text to parse
+        storage (string): storage mode, see AdisParser
+        number_of_rows (int): number of data rows in the ADIS text
+
+    Returns:
+        float: allocated bytes per data row
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        adis = Adis.parse(adis_text, storage=storage)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del adis
+    return (after - before) / number_of_rows
+
+
+def main(arguments=None):
+    """Prints the bytes per data row of each storage mode.
+
+    Args:
+        arguments (list[string], optional): command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Memory report for the adis package")
+    parser.add_argument("--blocks", type=int, default=20,
+        help="number of blocks (default: 20)")
+    parser.add_argument("--rows-per-block", type=int, default=1000,
+        help="number of data rows per block (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+        help="seed of the synthetic ADIS generator (default: 0)")
+    parsed_arguments = parser.parse_args(arguments)
+
+    adis_text = generate_adis_text(seed=parsed_arguments.seed,
+                                   blocks_per_file=parsed_arguments.blocks,
+                                   rows_per_block=parsed_arguments.rows_per_block,
+                                   fields_per_block=(10, 10))
+    number_of_rows = parsed_arguments.blocks * parsed_arguments.rows_per_block
+
+    print("%d data rows with 10 fields each" % number_of_rows)
+    for storage in AdisParser.storage_modes:
+        print("%-10s %8.0f bytes per row" % (storage, measure_bytes_per_row(
+            adis_text, storage, number_of_rows)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adis import Adis
+from benchmarks.adis_generator import generate_adis_text
+
+"""
+Benchmarks for parsing and serializing ADIS files. Synthetic ADIS texts of several scales are
+generated with a fixed seed, the run time and the peak memory of Adis.parse, dumps, to_json and
+from_json are measured and the results are saved as JSON.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scales small,medium] [--repeat 3] [--output FILE]
+"""
+
+# parameters for generate_adis, the data rows of a scale = logical_files * blocks * rows
+scales = {
+    "small": {
+        "logical_files": 1,
+        "blocks_per_file": 10,
+        "rows_per_block": 100
+    },
+    "medium": {
+        "logical_files": 2,
+        "blocks_per_file": 20,
+        "rows_per_block": 1000
+    },
+    "large": {
+        "logical_files": 4,
+        "blocks_per_file": 25,
+        "rows_per_block": 10000
+    }
+}
+
+
+def measure(function, repeat):
+    """Measures the run time and the peak memory of a function. The time is the best of \
+        several runs without tracing, the peak memory is measured in a separate run with \
+        tracemalloc since tracing slows the function down.
+
+    Args:
+        function (callable): function without arguments
+        repeat (int): number of timed runs
+
+    Returns:
+        dict: seconds of the fastest run, seconds of all runs and the peak memory in bytes
+    """
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(durations),
+        "all_seconds": durations,
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def run_scale(scale_name, parameters, seed, repeat):
+    """Runs all benchmarks for one scale.
+
+    Args:
+        scale_name (string): name of the scale
+        parameters (dict): parameters for generate_adis
+        seed (int): seed of the generator
+        repeat (int): number of timed runs per benchmark
+
+    Returns:
+        list[dict]: one result per benchmark
+    """
+    adis_text = generate_adis_text(seed=seed, **parameters)
+    adis = Adis.parse(adis_text)
+    json_text = adis.to_json()
+    number_of_rows = parameters["logical_files"] * parameters["blocks_per_file"] \
+        * parameters["rows_per_block"]
+
+    benchmarks = [
+        ("parse", lambda: Adis.parse(adis_text)),
+        ("parse_columnar", lambda: Adis.parse(adis_text, storage="columnar")),
+        ("parse_lazy", lambda: Adis.parse(adis_text, storage="lazy")),
+        ("dumps", adis.dumps),
+        ("to_json", adis.to_json),
+        ("from_json", lambda: Adis.from_json(json_text))
+    ]
+
+    results = []
+    for name, function in benchmarks:
+        result = {
+            "scale": scale_name,
+            "operation": name,
+            "rows": number_of_rows,
+            "adis_bytes": len(adis_text),
+            "json_bytes": len(json_text)
+        }
+        result.update(measure(function, repeat))
+        result["rows_per_second"] = number_of_rows / max(result["seconds"], 1e-9)
+        print("%-8s %-16s %10.4f s %12.0f rows/s %10.1f MiB peak" % (scale_name, name,
+              result["seconds"], result["rows_per_second"],
+              result["peak_memory_bytes"] / 2**20))
+        results.append(result)
+    return results
+
+
+def main(arguments=None):
+    """Runs the benchmarks and writes the results to a JSON file.
+
+    Args:
+        arguments (list[string], optional): command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for the adis package")
+    parser.add_argument("--scales", default="small,medium",
+        help="comma separated scales, available: %s (default: small,medium)"
+             % ", ".join(scales))
+    parser.add_argument("--repeat", type=int, default=3,
+        help="number of timed runs per benchmark (default: 3)")
+    parser.add_argument("--seed", type=int, default=0,
+        help="seed of the synthetic ADIS generator (default: 0)")
+    parser.add_argument("--output", default="benchmark_results.json",
+        help="path of the JSON results (default: benchmark_results.json)")
+    parsed_arguments = parser.parse_args(arguments)
+
+    scale_names = parsed_arguments.scales.split(",")
+    for scale_name in scale_names:
+        if scale_name not in scales:
+            raise Exception("Unknown scale \"%s\". Has to be one of %s."
+                % (scale_name, list(scales)))
+
+    results = []
+    for scale_name in scale_names:
+        results.extend(run_scale(scale_name, scales[scale_name], parsed_arguments.seed,
+                                 parsed_arguments.repeat))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": parsed_arguments.seed,
+        "repeat": parsed_arguments.repeat,
+        "scales": {scale_name: scales[scale_name] for scale_name in scale_names},
+        "results": results
+    }
+    with open(parsed_arguments.output, "w") as output_file:
+        json.dump(report, output_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,27 @@
 from adis import (
     Adis,
     AdisBlock,
-    AdisFieldDefinition
+    AdisFieldDefinition,
+    AdisFollowReader,
+    AdisParser,
+    AdisSerializationOptions,
+    AdisStats,
+    AdisWriter
+)
+from adis.adis_cache import AdisParseCache
+from adis.adis_ingest import AdisIngestService
+from adis.adis_offset_index import (
+    AdisOffsetIndex,
+    AdisRandomAccessReader
+)
+from benchmarks.adis_generator import generate_adis_text
+from adis.adis_parallel import parse_file_parallel
+from adis.adis_parser import read_buffer_lines
+from adis.adis_schema import AdisSchema
+from adis.adis_validator import AdisValidator
+from adis.adis_value import (
+    AdisValue,
+    UNDEFINED
 )
 from adis.adis_lines import (
     AdisLine,
@@ -11,8 +31,16 @@ from adis.adis_lines import (
 )
 
 import pytest
+import pickle
+import re
 import os
 import json
+import io
+import shutil
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
 directory = os.path.dirname(__file__)
 if directory == "":
@@ -245,3 +273,827 @@ def equals_stripped(stripped, unstripped):
         return unstripped.strip() == stripped
 
     return True
+
+def test_iter_blocks():
+    blocks = list(Adis.iter_blocks(demo_adis_file))
+    assert [(file_index, block.get_entity_number()) for file_index, block in blocks] == \
+        [(0, "990001"), (0, "990002"), (1, "990001")]
+    assert len(blocks[0][1].get_data_rows()) == 3
+
+def test_iter_rows():
+    rows = list(Adis.iter_rows(demo_adis_file))
+    assert len(rows) == 7
+
+    rows = list(Adis.iter_rows(demo_adis_file, entity="990001"))
+    assert [(file_index, entity_number) for file_index, entity_number, _ in rows] == \
+        [(0, "990001")] * 3 + [(1, "990001")] * 2
+    assert rows[4][2][0].value == "         2"
+
+def test_iter_encoding(tmp_path):
+    path_to_file = str(tmp_path / "umlauts.ads")
+    adis_text = "DN99000200000008100\r\nVN990002Müller    \r\nZN\r\n"
+    with open(path_to_file, "wb") as output_file:
+        output_file.write(adis_text.encode("latin-1"))
+    assert [data_row[0].value for _, _, data_row in Adis.iter_rows(path_to_file)] == \
+        ["Müller    "]
+    blocks = list(Adis.iter_blocks(path_to_file))
+    assert blocks[0][1].get_data_rows()[0][0].value == "Müller    "
+    output = io.StringIO()
+    assert Adis.dump_ndjson_from_file(path_to_file, output) == 1
+    assert json.loads(output.getvalue())["data"] == {"00000008": "Müller"}
+
+    with open(path_to_file, "wb") as output_file:
+        output_file.write(adis_text.encode("utf-8"))
+    assert [data_row[0].value for _, _, data_row
+            in Adis.iter_rows(path_to_file, encoding="utf-8")] == ["Müller    "]
+
+def test_parse_unterminated_logical_file():
+    parsed = Adis.parse("DN9900020000000810000000009100\r\nVN990002abc       xyz       \r\n")
+    assert len(parsed.get_files()) == 0
+
+    parsed = Adis.parse("EN\r\nZN\r\n")
+    assert len(parsed.get_files()) == 2
+    assert len(parsed.get_files()[0].get_blocks()) == 0
+
+def test_row_decoder_cache():
+    first_line = AdisLine.parse_line("DH9900010000000610000000007052")
+    second_line = AdisLine.parse_line("DN9900020000000610000000007052")
+    decoder = first_line.get_row_decoder()
+    assert decoder is second_line.get_row_decoder()
+
+    values = decoder.decode("VH990001         1  123", 8)
+    assert [(value.item_number, value.value) for value in values] == \
+        [("00000006", "         1"), ("00000007", 1.23)]
+    values = decoder.decode("         2|||||")
+    assert [(value.item_number, value.value) for value in values] == [("00000006", "         2")]
+    values = decoder.decode("??????????")
+    assert [(value.item_number, value.value) for value in values] == \
+        [("00000006", None), ("00000007", None)]
+
+    with pytest.raises(Exception,
+        match="Expected field size of 5 chars or an empty field, but got field size of 2 chars."):
+        decoder.decode("         2 1")
+
+def test_schema_interning():
+    first_line = AdisLine.parse_line("DH9900010000000610000000007052")
+    second_line = AdisLine.parse_line("DN9900020000000610000000007052")
+    schema = first_line.get_schema()
+    assert schema is second_line.get_schema()
+    assert schema is AdisSchema.for_field_definitions(list(first_line.get_field_definitions()))
+    assert schema is AdisLine.parse_line("DH9900030000000610000000007 52").get_schema()
+    assert schema.get_definitions_text() == "0000000610000000007052"
+    assert schema.get_item_numbers() == ("00000006", "00000007")
+    assert {schema: 1}[AdisSchema("0000000610000000007052", schema.get_field_definitions())] == 1
+    with pytest.raises(AttributeError):
+        schema.definitions_text = ""
+    with pytest.raises(AttributeError):
+        schema.get_field_definitions()[0].field_size = 3
+    definition = pickle.loads(pickle.dumps(schema.get_field_definitions()[1]))
+    assert definition.dumps() == "00000007052"
+
+    cache_size = AdisSchema.cache_size
+    AdisSchema.cache_size = 2
+    try:
+        AdisSchema.for_definitions_text("00000008050")
+        assert len(AdisSchema.schemas_by_text) == 2
+        assert len(AdisSchema.field_definitions_by_text) == 2
+        assert AdisSchema.for_definitions_text("00000008050") is next(
+            reversed(AdisSchema.schemas_by_text.values()))
+    finally:
+        AdisSchema.cache_size = cache_size
+
+    first_block = Adis.from_json_file(demo_json_file).get_files()[0].get_blocks()[0]
+    same_blocks = [block for adis_file in Adis.from_json_file(demo_json_file).get_files()
+                   for block in adis_file.get_blocks()
+                   if block.get_entity_number() == first_block.get_entity_number()]
+    assert same_blocks[0].get_field_definitions() is first_block.get_field_definitions()
+
+def test_columnar_storage():
+    columnar_adis = Adis.parse_from_file(demo_adis_file, storage="columnar")
+    row_adis = Adis.parse_from_file(demo_adis_file)
+    assert columnar_adis.to_json(strip_string_values=False) == \
+        row_adis.to_json(strip_string_values=False)
+    assert columnar_adis.dumps() == row_adis.dumps()
+
+    adis_block = columnar_adis.get_files()[0].get_blocks()[0]
+    assert adis_block.is_columnar()
+    assert adis_block.__repr__() == "AdisBlock with status=H and entity_number=990001 " \
+        "containing 3 data row(s)"
+    assert adis_block.get_data_rows()[2][2].value == "ms^(-2)   "
+
+    columns = adis_block.to_columns()
+    assert list(columns) == ["00000000", "00000001", "00000002"]
+    assert list(columns["00000001"].get_values()) == [2.718281, 3.141592, 9.81]
+    assert list(columns["00000002"]) == [None, None, "ms^(-2)   "]
+
+    adis_block = columnar_adis.get_files()[1].get_blocks()[0]
+    assert list(adis_block.to_columns()["00000007"]) == [1.23, UNDEFINED]
+    assert list(row_adis.get_files()[1].get_blocks()[0].to_columns()["00000007"]) == \
+        [1.23, UNDEFINED]
+
+    with pytest.raises(Exception, match="Invalid storage mode \"cells\"."):
+        Adis.parse("", storage="cells")
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    for storage in ["rows", "columnar"]:
+        adis_block = Adis.parse_from_file(demo_adis_file, storage=storage) \
+            .get_files()[1].get_blocks()[0]
+        array = adis_block.to_numpy()
+        assert array.dtype.names == ("00000006", "00000007")
+        assert array.dtype["00000006"] == numpy.dtype("U10")
+        assert list(array["00000006"]) == ["1", "2"]
+        assert array["00000007"][0] == 1.23
+        assert numpy.isnan(array["00000007"][1])
+
+        masked_array = adis_block.to_numpy(masked=True, strip_string_values=False)
+        assert list(masked_array.mask["00000007"]) == [False, True]
+        assert masked_array["00000006"][0] == "         1"
+
+def test_vectorized_decoding():
+    numpy = pytest.importorskip("numpy")
+    text = generate_adis_text(seed=7, blocks_per_file=3, rows_per_block=300, null_ratio=0.1,
+                              undefined_ratio=0.1)
+    for decimals in ["float", "scaled"]:
+        for adis in [Adis.parse(text, "lazy", decimals=decimals),
+                     Adis.parse_bytes(text.encode("latin-1"), "lazy", decimals=decimals)]:
+            columnar_adis = Adis.parse(text, "columnar", decimals=decimals)
+            for adis_file, columnar_file in zip(adis.get_files(), columnar_adis.get_files()):
+                for block, columnar_block in zip(adis_file.get_blocks(),
+                                                 columnar_file.get_blocks()):
+                    array = block.to_numpy(masked=True)
+                    expected_array = columnar_block.to_numpy(masked=True)
+                    assert array.dtype == expected_array.dtype
+                    for name in array.dtype.names:
+                        assert (array[name].mask == expected_array[name].mask).all()
+                        assert array[name].compressed().tolist() \
+                            == expected_array[name].compressed().tolist()
+
+    # the last field of a value line may be left out, such blocks are decoded row by row
+    adis = Adis.parse_from_file(demo_adis_file, storage="lazy")
+    assert adis.get_files()[1].get_blocks()[0].to_numpy()["00000007"].tolist()[0] == 1.23
+    # fields that are no right-aligned numbers are decoded like by the row decoder
+    block = Adis.parse("DH99000100000001041\nVH990001-1.5\nVH990001  -3\nZN", storage="lazy") \
+        .get_files()[0].get_blocks()[0]
+    assert block.to_numpy()["00000001"].tolist() == [-0.15, -0.3]
+    for field in ["    ", " 1-2", "1 2 "]:
+        text = "DH99000100000001041\nVH990001  12\nVH990001%s\nZN" % field
+        with pytest.raises(ValueError):
+            Adis.parse(text)
+        block = Adis.parse(text, storage="lazy").get_files()[0].get_blocks()[0]
+        with pytest.raises(ValueError):
+            block.to_numpy()
+
+def test_to_dataframes():
+    pytest.importorskip("pandas")
+    dataframes = Adis.parse_from_file(demo_adis_file, storage="columnar").to_dataframes()
+    assert list(dataframes) == ["990001", "990002"]
+    assert list(dataframes["990001"].columns) == \
+        ["00000000", "00000001", "00000002", "00000006", "00000007"]
+    assert len(dataframes["990001"]) == 5
+    assert list(dataframes["990002"]["00000009"]) == ["xyz", "uvw"]
+
+def test_dump_json():
+    for strip_string_values in [True, False]:
+        output = io.StringIO()
+        adis.dump_json(output, strip_string_values)
+        assert output.getvalue() == adis.to_json(strip_string_values)
+
+    mapping_dict = {"000001": "Constant"}
+    output = io.StringIO()
+    adis.dump_json(output, mapping_dict=mapping_dict)
+    assert output.getvalue() == adis.to_json(mapping_dict=mapping_dict)
+    definitions = json.loads(output.getvalue())[0]["990001"]["definitions"]
+    assert [definition["item_name"] for definition in definitions] == \
+        ["000000", "Constant", "000002"]
+
+    two_files = Adis.parse(adis.dumps().replace("ZN\r\n", "EN\r\n")
+                           + "DN99000300000001050\r\nVN99000312345\r\nZN\r\n")
+    assert len(two_files.get_files()) > 1
+    output = io.StringIO()
+    two_files.dump_json(output, mapping_dict=mapping_dict)
+    assert output.getvalue() == two_files.to_json(mapping_dict=mapping_dict)
+
+def test_dump_ndjson():
+    output = io.StringIO()
+    adis.dump_json(output, ndjson=True)
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 7
+    assert json.loads(lines[3]) == {
+        "file_index": 0,
+        "entity_number": "990002",
+        "data": {"00000008": "abc", "00000009": "xyz"}
+    }
+
+    output = io.StringIO()
+    Adis.parse_from_file(demo_adis_file).dump_json(output, ndjson=True)
+    streamed_output = io.StringIO()
+    Adis.dump_ndjson_from_file(demo_adis_file, streamed_output)
+    assert streamed_output.getvalue() == output.getvalue()
+
+def test_adis_writer():
+    output = io.StringIO()
+    writer = AdisWriter(output)
+    definitions = [AdisFieldDefinition("00000008", 5, 0), AdisFieldDefinition("00000009", 4, 2)]
+    writer.begin_block("990002", "N", definitions)
+    writer.write_row({"00000008": "abc", "00000009": 1.5})
+    writer.write_row([AdisValue("00000008", None)])
+    writer.end_logical_file()
+    writer.close()
+    assert output.getvalue() == "DN9900020000000805000000009042\r\n" \
+        "VN990002abc   150\r\nVN990002?????||||\r\nEN\r\nZN\r\n"
+
+    with pytest.raises(Exception,
+        match="A block has to be started before data rows can be written."):
+        writer.write_row({})
+
+    # values are written unstripped, independent of the strip_string_values setting
+    parsed = Adis.parse_from_file(demo_adis_file)
+    parsed.to_json()
+    with open(demo_adis_file, newline="") as input_file:
+        assert parsed.dumps() == input_file.read()
+    assert parsed.get_files()[0].get_blocks()[1].dumps_data() == \
+        "VN990002abc       xyz       \r\nVN990002def       uvw       \r\n"
+
+def test_pickle_storage_modes():
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json()
+    for storage in AdisParser.storage_modes:
+        adis = pickle.loads(pickle.dumps(Adis.parse_from_file(demo_adis_file, storage)))
+        assert adis.to_json() == expected_json
+        assert adis.dumps() == Adis.parse_from_file(demo_adis_file).dumps()
+    assert pickle.loads(pickle.dumps(UNDEFINED)) is UNDEFINED
+
+def test_parse_bytes(tmp_path):
+    with open(demo_adis_file, "rb") as input_file:
+        data = input_file.read()
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json()
+    for storage in ["rows", "columnar"]:
+        assert Adis.parse_bytes(data, storage).to_json() == expected_json
+        assert Adis.parse_from_file(demo_adis_file, storage, use_mmap=True).to_json() == \
+            expected_json
+    assert Adis.parse_bytes(data.replace(b"\r\n", b"\n")).to_json() == expected_json
+    assert len(Adis.parse_bytes(b"").get_files()) == 0
+    empty_file = str(tmp_path / "empty.ads")
+    open(empty_file, "wb").close()
+    assert len(Adis.parse_from_file(empty_file, use_mmap=True).get_files()) == 0
+    with pytest.raises(Exception, match="Invalid decimal mode"):
+        Adis.parse_from_file(empty_file, use_mmap=True, decimals="fixed")
+
+    parser = AdisParser()
+    rows = list(parser.iter_rows(read_buffer_lines(data), entity="990002"))
+    assert [[value.value for value in data_row] for _, _, data_row in rows] == \
+        [["abc       ", "xyz       "], ["def       ", "uvw       "]]
+
+    with pytest.raises(Exception,
+        match="Expecting an item text length of 20 chars or 10 chars, but got 3 chars."):
+        Adis.parse_bytes(b"DN9900020000000810000000009100\nVN990002abc\nZN\n")
+
+def test_lazy_storage():
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json(strip_string_values=False)
+    for use_mmap in [False, True]:
+        lazy_adis = Adis.parse_from_file(demo_adis_file, storage="lazy", use_mmap=use_mmap)
+        assert lazy_adis.to_json(strip_string_values=False) == expected_json
+        with open(demo_adis_file, newline="") as input_file:
+            assert lazy_adis.dumps() == input_file.read()
+
+    adis_block = Adis.parse_from_file(demo_adis_file, storage="lazy").get_files()[0].get_blocks()[0]
+    data_rows = adis_block.get_data_rows()
+    assert len(adis_block) == 3
+    assert len(data_rows.cache) == 0
+    assert data_rows[-1][0].value == "Gravity on Earth    "
+    assert data_rows[2] is data_rows[-1]
+    assert list(data_rows.cache) == [2]
+    assert list(adis_block.to_columns()["00000001"]) == [2.718281, 3.141592, 9.81]
+    with pytest.raises(IndexError):
+        data_rows[3]
+
+    with pytest.raises(Exception,
+        match="Expecting an item text length of 20 chars or 10 chars, but got 3 chars."):
+        Adis.parse("DN9900020000000810000000009100\nVN990002abc\nZN\n", storage="lazy")
+
+def test_tuple_storage():
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json(strip_string_values=False)
+    for use_mmap in [False, True]:
+        tuple_adis = Adis.parse_from_file(demo_adis_file, storage="tuples", use_mmap=use_mmap)
+        assert tuple_adis.to_json(strip_string_values=False) == expected_json
+        with open(demo_adis_file, newline="") as input_file:
+            assert tuple_adis.dumps() == input_file.read()
+
+    adis_block = Adis.parse_from_file(demo_adis_file, storage="tuples").get_files()[1].get_blocks()[0]
+    data_rows = adis_block.get_data_rows()
+    assert data_rows.get_item_numbers() == ("00000006", "00000007")
+    assert data_rows.get_rows() == [("         1", 1.23), ("         2", UNDEFINED)]
+    assert len(data_rows[1]) == 1
+    assert list(adis_block.to_columns()["00000007"]) == [1.23, UNDEFINED]
+
+def test_compact_objects():
+    for instance in [AdisValue("00000001", 1.0), AdisFieldDefinition("00000001", 5, 2),
+                     AdisLine.parse_line("DH990001000000002000000000109600000002100"),
+                     AdisLine.parse_line("VH990001Pi                    3141592??????????"),
+                     AdisLine.parse_line("CNcomment"), AdisLine.parse_line("EN")]:
+        assert not hasattr(instance, "__dict__")
+
+    definition_line = AdisLine.parse_line("DH990001000000002000000000109600000002100")
+    assert definition_line.line == "DH990001000000002000000000109600000002100"
+    assert definition_line.allowed_statuses is DefinitionLine.allowed_statuses
+    assert str(AdisLine.parse_line("EN")) == "End of logical file status: normal, line: EN"
+
+def test_select():
+    for storage in ["rows", "columnar", "lazy", "tuples"]:
+        adis = Adis.parse_from_file(demo_adis_file, storage=storage)
+        index = adis.get_index()
+        assert index.get_entity_numbers() == ["990001", "990002"]
+        assert [file_index for file_index, _ in index.get_blocks("990001")] == [0, 1]
+        assert adis.get_index() is index
+
+        block = adis.get_files()[1].get_blocks()[0]
+        assert index.get_item_position(block, "00000007") == 1
+        assert index.get_item_position(block, "00000001") is None
+
+        rows = adis.select("990001", items=["00000001", "00000000", "00000007"])
+        assert [file_index for file_index, _ in rows] == [0, 0, 0, 1, 1]
+        assert [[value.value for value in data_row] for _, data_row in rows] == [
+            [2.718281, "Euler number        "], [3.141592, "Pi                  "],
+            [9.81, "Gravity on Earth    "], [1.23], []]
+        assert len(adis.select("990002")) == 2
+        assert adis.select("123456") == []
+
+def test_parse_filters():
+    expected_json = json.dumps([
+        {"990001": {"definitions": [{"item_number": "00000001", "field_size": 9,
+                                     "decimal_digits": 6}],
+                    "data": [{"00000001": 2.718281}, {"00000001": 3.141592},
+                             {"00000001": 9.81}],
+                    "status": "H"}},
+        {"990001": {"definitions": [{"item_number": "00000007", "field_size": 5,
+                                     "decimal_digits": 2}],
+                    "data": [{"00000007": 1.23}, {}],
+                    "status": "H"}}])
+    for storage in ["rows", "columnar", "lazy", "tuples"]:
+        for use_mmap in [False, True]:
+            adis = Adis.parse_from_file(demo_adis_file, storage=storage, use_mmap=use_mmap,
+                                        entities=["990001"], items=["00000001", "00000007"])
+            assert adis.to_json() == expected_json
+    adis = Adis.parse_from_file(demo_adis_file, workers=2, entities=["990001"],
+                                items=["00000001", "00000007"])
+    assert adis.to_json() == expected_json
+
+    with open(demo_adis_file) as input_file:
+        adis = Adis.parse(input_file.read(), entities=["990002"])
+    assert [len(adis_file.get_blocks()) for adis_file in adis.get_files()] == [1, 0]
+    assert adis.select("990002", ["00000009"])[1][1][0].value == "uvw       "
+
+def test_follow_reader(tmp_path):
+    with open(demo_adis_file, "rb") as input_file:
+        content = input_file.read()
+    path_to_file = str(tmp_path / "growing.ads")
+    with open(path_to_file, "wb") as output_file:
+        output_file.write(content[:80])         # ends within the first value line
+
+    reader = AdisFollowReader(path_to_file)
+    assert list(reader.poll()) == []
+    assert reader.get_position()["offset"] == 43
+    assert reader.get_position()["definition_line"] == "DH990001000000002000000000109600000002100"
+
+    with open(path_to_file, "ab") as output_file:
+        output_file.write(content[80:150])
+    rows = list(reader.poll())
+    assert [data_row[0].value for _, _, data_row in rows] == ["Euler number        ", "Pi                  "]
+
+    position = json.loads(json.dumps(reader.get_position()))
+    assert position["offset"] == 141
+    with open(path_to_file, "ab") as output_file:
+        output_file.write(content[150:])
+    resumed_rows = list(AdisFollowReader(path_to_file, position).poll())
+    expected_rows = list(Adis.iter_rows(demo_adis_file))
+    assert len(resumed_rows) == len(expected_rows) - 2
+    for (file_index, entity_number, data_row), expected_row in zip(resumed_rows,
+                                                                   expected_rows[2:]):
+        assert (file_index, entity_number) == expected_row[:2]
+        assert [value.value for value in data_row] == [value.value for value in expected_row[2]]
+
+    assert len(list(reader.follow(poll_interval=0, max_polls=2))) == len(expected_rows) - 2
+    assert reader.get_position()["offset"] == len(content)
+
+def test_follow_reader_chunks(tmp_path):
+    with open(demo_adis_file, "rb") as input_file:
+        content = input_file.read()
+    path_to_file = str(tmp_path / "growing.ads")
+    with open(path_to_file, "wb") as output_file:
+        output_file.write(content[:-5])         # ends within the last line
+
+    reader = AdisFollowReader(path_to_file)
+    reader.chunk_size = 7                       # lines span several chunks
+    rows = list(reader.poll())
+    expected_reader = AdisFollowReader(path_to_file)
+    expected_rows = list(expected_reader.poll())
+    assert len(rows) == len(expected_rows) > 0
+    for (file_index, entity_number, data_row), expected_row in zip(rows, expected_rows):
+        assert (file_index, entity_number) == expected_row[:2]
+        assert [value.value for value in data_row] == [value.value for value in expected_row[2]]
+    assert reader.get_position() == expected_reader.get_position()
+    assert reader.get_position()["offset"] < len(content) - 5
+
+    with open(path_to_file, "ab") as output_file:
+        output_file.write(content[-5:])
+    list(reader.poll())
+    assert reader.get_position()["offset"] == len(content)
+
+def test_random_access_reader(tmp_path):
+    path_to_file = str(tmp_path / "sample.ads")
+    shutil.copy(demo_adis_file, path_to_file)
+    adis = Adis.parse_from_file(demo_adis_file)
+    expected_rows = adis.select("990001")
+
+    for every in [1, 2, 1000]:
+        reader = AdisRandomAccessReader(path_to_file, every=every)
+        index = reader.get_index()
+        assert index.get_number_of_files() == 2
+        assert [block["rows"] for block in index.get_blocks()] == [3, 2, 2]
+        assert AdisOffsetIndex.load(path_to_file + ".idx").to_dict() == index.to_dict()
+
+        block = reader.get_block(1, 0)
+        assert block.to_dict() == adis.get_files()[1].get_blocks()[0].to_dict()
+        for start, stop in [(0, 5), (1, 4), (2, 3), (4, 10), (3, 3)]:
+            rows = reader.get_rows("990001", start, stop)
+            assert [(file_index, [value.value for value in data_row])
+                    for file_index, data_row in rows] == \
+                [(file_index, [value.value for value in data_row])
+                 for file_index, data_row in expected_rows[start:stop]]
+        os.remove(path_to_file + ".idx")
+
+    with pytest.raises(IndexError):
+        reader.get_block(1, 1)
+
+    with open(path_to_file, "a", newline="") as output_file:
+        output_file.write("DN9900030000000810000000009100\r\nVN990003abc       \r\nZN\r\n")
+    assert reader.get_index().get_number_of_files() == 3
+    assert reader.get_rows("990003", 0, 1)[0][1][0].value == "abc       "
+
+def test_parse_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json()
+    for storage in ["columnar", "rows", "tuples", "columnar"]:
+        adis = Adis.parse_from_file(demo_adis_file, storage=storage, cache_dir=cache_dir)
+        assert adis.to_json() == expected_json
+    cache_files = os.listdir(cache_dir)
+    assert len(cache_files) == 1
+
+    filtered_adis = Adis.parse_from_file(demo_adis_file, cache_dir=cache_dir, entities=["990002"])
+    assert [len(adis_file.get_blocks()) for adis_file in filtered_adis.get_files()] == [1, 0]
+    assert len(os.listdir(cache_dir)) == 2
+
+    cache_path = os.path.join(cache_dir, cache_files[0])
+    with open(cache_path, "r+b") as cache_file:
+        cache_file.seek(-1, os.SEEK_END)
+        cache_file.write(b"x")
+    cache = AdisParseCache(cache_dir, max_bytes=os.path.getsize(cache_path))
+    assert cache.load(demo_adis_file, (None, None, None, "float")) is None
+    assert not os.path.exists(cache_path)
+    assert Adis.parse_from_file(demo_adis_file, cache_dir=cache_dir).to_json() == expected_json
+
+    cache.evict()
+    assert len(os.listdir(cache_dir)) == 1
+    assert Adis.parse_from_file(demo_adis_file, cache_dir=cache_dir).to_json() == expected_json
+
+class BufferStreamWriter:
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.drains = 0
+
+    def write(self, data):
+        self.buffer.write(data)
+
+    async def drain(self):
+        self.drains += 1
+
+def test_async_api():
+    with open(demo_adis_file, "rb") as input_file:
+        content = input_file.read()
+    expected_adis = Adis.parse_from_file(demo_adis_file)
+
+    async def parse_and_dump(chunks):
+        reader = asyncio.StreamReader()
+        for chunk in chunks:
+            reader.feed_data(chunk)
+        reader.feed_eof()
+        indexed_blocks = [indexed_block async for indexed_block in Adis.aiter_blocks(reader)]
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(content)
+        reader.feed_eof()
+        adis = await Adis.aparse(reader, storage="columnar")
+
+        stream_writer = BufferStreamWriter()
+        await adis.adump(stream_writer)
+        return indexed_blocks, adis, stream_writer
+
+    for chunks in [[content], [content[position:position + 7]
+                               for position in range(0, len(content), 7)]]:
+        indexed_blocks, adis, stream_writer = asyncio.run(parse_and_dump(chunks))
+        assert [file_index for file_index, _ in indexed_blocks] == [0, 0, 1]
+        assert [block.to_dict() for _, block in indexed_blocks] == [
+            block.to_dict() for adis_file in expected_adis.get_files()
+            for block in adis_file.get_blocks()]
+        assert adis.to_json() == expected_adis.to_json()
+        assert stream_writer.buffer.getvalue() == content
+        assert stream_writer.drains >= 1
+
+def test_serialization_options():
+    adis = Adis.parse_from_file(demo_adis_file)
+    block = adis.get_files()[0].get_blocks()[0]
+    stripped_dict = block.to_dict(AdisSerializationOptions(strip_string_values=True))
+    unstripped_dict = block.to_dict(AdisSerializationOptions(strip_string_values=False))
+    assert stripped_dict["data"][1]["00000000"] == "Pi"
+    assert unstripped_dict["data"][1]["00000000"] == "Pi                  "
+
+    adis = Adis.parse(generate_adis_text(seed=5, blocks_per_file=4, rows_per_block=200))
+    expected_json = {strip: adis.to_json(strip_string_values=strip) for strip in [True, False]}
+    assert expected_json[True] != expected_json[False]
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # switch threads as often as possible
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            settings = [index % 2 == 0 for index in range(64)]
+            results = list(executor.map(
+                lambda strip: adis.to_json(strip_string_values=strip), settings))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    for strip, result in zip(settings, results):
+        assert result == expected_json[strip]
+
+def test_decimal_modes(tmp_path):
+    with open(demo_adis_file, newline="") as input_file:
+        content = input_file.read()
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json()
+    for decimals in ["scaled", "decimal"]:
+        for storage in AdisParser.storage_modes:
+            adis = Adis.parse_from_file(demo_adis_file, storage=storage, decimals=decimals)
+            block = adis.get_files()[1].get_blocks()[0]
+            assert block.decimals == decimals
+            values = [data_row[1].value for data_row in block.get_data_rows()
+                      if len(data_row) == 2]
+            assert values == [123 if decimals == "scaled" else Decimal("1.23")]
+            assert adis.dumps() == content
+            assert adis.to_json() == expected_json
+            assert Adis.from_json(adis.to_json(strip_string_values=False)).dumps() == content
+            output = io.StringIO()
+            adis.dump_json(output)
+            assert output.getvalue() == expected_json
+        adis = Adis.parse_bytes(content.encode(), storage="columnar", decimals=decimals)
+        assert adis.dumps() == content
+    assert Adis.parse(content, decimals="decimal").to_json() == expected_json
+
+    cache_dir = str(tmp_path / "cache")
+    Adis.parse_from_file(demo_adis_file, cache_dir=cache_dir)
+    for _ in range(2):
+        adis = Adis.parse_from_file(demo_adis_file, cache_dir=cache_dir, decimals="scaled")
+        assert adis.get_files()[1].get_blocks()[0].get_data_rows()[0][1].value == 123
+        assert adis.dumps() == content
+    assert len(os.listdir(cache_dir)) == 2
+
+    definition = AdisFieldDefinition("00000001", 6, 3)
+    assert definition.parse_field_at_position("012345", 0, "scaled").value == 12345
+    assert definition.parse_field_at_position("012345", 0, "decimal").value == Decimal("12.345")
+    assert definition.dumps_value(12345, scaled=True) == " 12345"
+    assert definition.dumps_value(Decimal("-1.5")) == " -1500"
+    with pytest.raises(Exception, match="too large"):
+        definition.dumps_value(1234567, scaled=True)
+    with pytest.raises(Exception, match="Invalid decimal mode"):
+        AdisParser(decimals="double")
+
+    numpy = pytest.importorskip("numpy")
+    adis = Adis.parse_from_file(demo_adis_file, storage="columnar", decimals="scaled")
+    array = adis.get_files()[1].get_blocks()[0].to_numpy(masked=True)
+    assert array["00000007"].dtype == numpy.int64
+    assert array["00000007"].tolist() == [123, None]
+
+def test_parse_parallel():
+    expected_json = Adis.parse_from_file(demo_adis_file).to_json()
+    for storage in ["rows", "columnar", "tuples"]:
+        for chunk_size in [1, 1024 * 1024]:
+            adis_files = parse_file_parallel(demo_adis_file, 2, storage, chunk_size=chunk_size)
+            assert Adis(adis_files).to_json() == expected_json
+    assert Adis.parse_from_file(demo_adis_file, workers=2).to_json() == expected_json
+    assert Adis.parse_from_file(demo_adis_file, workers=2, decimals="decimal").to_json() \
+        == expected_json
+
+    with pytest.raises(Exception, match="Parsing with workers is only supported"):
+        Adis.parse_from_file(demo_adis_file, storage="lazy", workers=2)
+
+def test_ingest_service(tmp_path):
+    inbox_dir = tmp_path / "inbox"
+    inbox_dir.mkdir()
+    shutil.copy(demo_adis_file, inbox_dir / "sample.ads")
+    (inbox_dir / "broken.ads").write_text("XN\r\n")
+    (inbox_dir / "notes.txt").write_text("not an ADIS file")
+
+    service = AdisIngestService(str(inbox_dir), str(tmp_path / "output"), str(tmp_path / "done"),
+                                str(tmp_path / "failed"), workers=1, ndjson=True)
+    assert service.poll() == []     # files are only converted once they did not change
+    service.poll()
+    results = sorted(service.close(), key=lambda result: result["file"])
+
+    assert [(result["file"], result["success"]) for result in results] == \
+        [("broken.ads", False), ("sample.ads", True)]
+    assert results[1]["rows"] == 7
+    assert results[1]["rows_per_second"] > 0
+    assert sorted(os.listdir(inbox_dir)) == ["notes.txt"]
+    assert os.listdir(tmp_path / "done") == ["sample.ads"]
+    assert os.listdir(tmp_path / "failed") == ["broken.ads"]
+    assert os.listdir(tmp_path / "output") == ["sample.ndjson"]
+    assert len((tmp_path / "output" / "sample.ndjson").read_text().splitlines()) == 7
+
+def test_ingest_move_failure(tmp_path):
+    inbox_dir = tmp_path / "inbox"
+    inbox_dir.mkdir()
+    shutil.copy(demo_adis_file, inbox_dir / "first.ads")
+    shutil.copy(demo_adis_file, inbox_dir / "second.ads")
+    # the done directory already contains a directory of the same name with the file in it
+    (tmp_path / "done" / "first.ads").mkdir(parents=True)
+    (tmp_path / "done" / "first.ads" / "first.ads").write_text("taken")
+
+    service = AdisIngestService(str(inbox_dir), str(tmp_path / "output"), str(tmp_path / "done"),
+                                str(tmp_path / "failed"), workers=1)
+    service.poll()
+    service.poll()
+    results = sorted(service.collect(wait=True), key=lambda result: result["file"])
+    assert [(result["file"], result["success"]) for result in results] == \
+        [("first.ads", True), ("second.ads", True)]
+    assert sorted(os.listdir(inbox_dir)) == ["first.ads"]
+    assert sorted(os.listdir(tmp_path / "done")) == ["first.ads", "second.ads"]
+
+    # the file that could not be moved is not converted again
+    service.poll()
+    service.poll()
+    assert service.pending == {}
+    assert service.close() == []
+
+def test_ingest_encoding(tmp_path):
+    adis_text = "DN99000200000008100\r\nVN990002Ölkuchen  \r\nZN\r\n"
+    for ndjson in [False, True]:
+        inbox_dir = tmp_path / str(ndjson) / "inbox"
+        inbox_dir.mkdir(parents=True)
+        (inbox_dir / "feed.ads").write_bytes(adis_text.encode("latin-1"))
+        service = AdisIngestService(str(inbox_dir), str(tmp_path / str(ndjson) / "output"),
+                                    str(tmp_path / str(ndjson) / "done"),
+                                    str(tmp_path / str(ndjson) / "failed"), workers=1,
+                                    ndjson=ndjson)
+        service.poll()
+        service.poll()
+        assert [result["success"] for result in service.close()] == [True]
+        output_text = os.listdir(tmp_path / str(ndjson) / "output")
+        output_path = tmp_path / str(ndjson) / "output" / output_text[0]
+        assert "Ölkuchen" in json.dumps(json.loads(output_path.read_text().splitlines()[0]),
+                                        ensure_ascii=False)
+
+
+def test_generate_adis_text():
+    parameters = {"seed": 3, "logical_files": 2, "blocks_per_file": 4, "rows_per_block": 25,
+                  "null_ratio": 0.2, "undefined_ratio": 0.1}
+    adis_text = generate_adis_text(**parameters)
+    assert adis_text == generate_adis_text(**parameters)
+    assert adis_text != generate_adis_text(**dict(parameters, seed=4))
+
+    adis = Adis.parse(adis_text)
+    assert len(adis.get_files()) == 2
+    assert sum(len(block) for adis_file in adis.get_files()
+               for block in adis_file.get_blocks()) == 200
+    assert adis.dumps() == adis_text
+
+
+def test_stats():
+    adis_text = generate_adis_text(seed=5, logical_files=1, blocks_per_file=2, rows_per_block=10,
+                                   null_ratio=0.2, undefined_ratio=0.1)
+    operations = []
+    stats = AdisStats(lambda operation, stats: operations.append(operation))
+    adis = Adis.parse(adis_text, stats=stats)
+    counters = stats.get_counters()
+    assert counters["lines"] == len(adis_text.split("\n"))
+    assert counters["blocks"] == 2 and counters["rows"] == 20
+    assert sum(stats.get_entity_rows().values()) == 20
+    values = [value for adis_file in adis.get_files() for block in adis_file.get_blocks()
+              for values in block.iter_values() for value in values]
+    assert counters["nulls"] == values.count(None)
+    assert counters["fields"] == len([value for value in values if value is not UNDEFINED])
+    assert set(stats.get_times()) == {"split_lines", "parse_values", "parse_lines",
+                                      "count_blocks"}
+    assert counters["chars"] == len(adis_text) - adis_text.count("\r\n") * 2
+
+    assert adis.dumps(stats=stats) == adis_text
+    assert adis.to_json(stats=stats) == adis.to_json()
+    assert operations == ["parse", "dumps", "to_json"]
+    assert stats.get_counters()["rows"] == 60
+    assert {"write_blocks", "to_dict", "json_dumps"} <= set(stats.to_dict()["times"])
+
+    lazy_stats = AdisStats()
+    Adis.parse(adis_text, "lazy", stats=lazy_stats)
+    assert lazy_stats.get_counters()["rows"] == 20 and "nulls" not in lazy_stats.get_counters()
+
+    bytes_stats = AdisStats()
+    Adis.parse_bytes(adis_text.encode("latin-1"), stats=bytes_stats)
+    assert bytes_stats.get_counters()["chars"] == lazy_stats.get_counters()["chars"]
+    assert bytes_stats.get_times()["parse_values"] > 0
+
+
+def test_validate(tmp_path):
+    assert Adis.validate(demo_adis_file) == []
+
+    definition_line = "DN0000010000000105000000020032"
+    adis_text = (definition_line + "\r\nVN00000112345678\r\nVN0000011234\r\nVX00000112345678\r\n"
+                 "XN\r\nDN00000100000001020000000020\r\nVN0000011234567\r\n" + definition_line
+                 + "\r\nVN00000112345\r\nEH\r\nEN\r\nVN000001123\r\nZN\r\nCN after\r\n")
+    path_to_file = str(tmp_path / "broken.ads")
+    with open(path_to_file, "w", newline="") as output_file:
+        output_file.write(adis_text)
+
+    problems = Adis.validate(path_to_file)
+    assert [(problem.get_line_number(), problem.get_offset()) for problem in problems] == [
+        (3, 50), (4, 64), (5, 82), (6, 86), (10, 180), (12, 188), (14, 205)]
+    for problem in problems:
+        offset = problem.get_offset()
+        assert adis_text[offset:].startswith(problem.get_line())
+        assert adis_text[:offset].count("\n") == problem.get_line_number() - 1
+    assert problems[0].get_reason().endswith("but got 4 chars.")
+    assert problems[3].to_dict()["reason"].startswith("Length of definitions text is 20")
+    assert len(Adis.validate(path_to_file, max_problems=2)) == 2
+
+    validator = AdisValidator()
+    assert validator.validate_buffer((definition_line + "\nVN00000112345678").encode())[0] \
+        .get_reason() == "Logical file is not terminated by an EN or ZN line"
+    assert validator.validate_buffer(b"")[0].get_reason() == \
+        "Physical end of file (ZN) is missing"
+
+    # a cut last field is rejected like by the parser, longer lines as well
+    with open(demo_adis_file, newline="") as input_file:
+        demo_text = input_file.read()
+    for bad_line, reason in [
+            ("VH990001Euler number          2718281?????",
+             "Expected field size of 10 chars or an empty field, but got field size of 5 chars."),
+            ("VH990001Euler number          2718281??????????X",
+             "Expecting an item text length of 39 chars or 29 chars, but got 40 chars.")]:
+        broken_text = demo_text.replace("VH990001Euler number          2718281??????????",
+                                        bad_line)
+        problems = validator.validate_buffer(broken_text.encode("latin-1"))
+        assert [(problem.get_line_number(), problem.get_reason()) for problem in problems] == \
+            [(2, reason)]
+        if bad_line.endswith("X"):
+            continue    # the parser ignores chars after the last field
+        with pytest.raises(Exception, match=re.escape(reason)):
+            Adis.parse(broken_text)
+
+    # the parser keeps ignoring chars after the last field of overlong value lines
+    overlong_text = "DH99000200000000020\r\nVH990002abXYZ\r\nEN\r\nZN\r\n"
+    assert len(validator.validate_buffer(overlong_text.encode("latin-1"))) == 1
+    for storage in AdisParser.storage_modes:
+        for adis in [Adis.parse(overlong_text, storage),
+                     Adis.parse_bytes(overlong_text.encode("latin-1"), storage)]:
+            block = adis.get_files()[0].get_blocks()[0]
+            assert [list(values) for values in block.iter_values()] == [["ab"]]
+            assert adis.to_json() == '[{"990002": {"definitions": [{"item_number": ' \
+                '"00000000", "field_size": 2, "decimal_digits": 0}], "data": [{"00000000": "ab"}], ' \
+                '"status": "H"}}, {}]'
+
+
+def test_error_policies(tmp_path):
+    definition_line = "DN0000010000000105000000020032"
+    adis_text = (definition_line + "\r\nVN00000112345678\r\nVN0000011234\r\nXN\r\n"
+                 "VN000001abcdeXYZ\r\nDN00000100000001020000000020\r\nVN0000011234567\r\n"
+                 "CN comment\r\nVN0000011234567\r\n" + definition_line
+                 + "\r\nVN00000112345678\r\nEH\r\nZN\r\n")
+    with pytest.raises(Exception):
+        Adis.parse(adis_text)
+    with pytest.raises(Exception):
+        AdisParser(errors="ignore")
+
+    for storage in AdisParser.storage_modes:
+        quarantine = io.StringIO()
+        adis = Adis.parse(adis_text, storage, errors="collect", quarantine=quarantine)
+        blocks = adis.get_files()[0].get_blocks()
+        assert [len(block) for block in blocks] == [1, 1]
+        assert [[value.value for value in data_row] for block in blocks
+                for data_row in block.get_data_rows()] == [["12345", 6.78], ["12345", 6.78]]
+        assert [problem.get_line_number() for problem in adis.get_problems()] == \
+            [3, 4, 5, 6, 7, 9, 12]
+        assert adis.get_rejected_count() == 7
+        assert quarantine.getvalue().split("\r\n")[:3] == \
+            ["VN0000011234", "XN", "VN000001abcdeXYZ"]
+
+    problems = adis.get_problems()
+    assert problems[1].get_reason() == "Unknown line type char \"X\""
+    assert problems[4].get_reason() == "The definition line 6 of this value line is invalid"
+    assert problems[0].get_offset() is None
+
+    path_to_file = str(tmp_path / "broken.ads")
+    with open(path_to_file, "w", newline="") as output_file:
+        output_file.write(adis_text)
+    adis = Adis.parse_from_file(path_to_file, "lazy", use_mmap=True, errors="skip")
+    assert adis.get_rejected_count() == 7 and adis.get_problems() == []
+    adis = Adis.parse(adis_text.replace("VN00000112345678\r\nEH", "VN0000011234567\r\nEH"),
+                      "lazy", errors="collect")
+    assert adis.get_problems()[-2].get_reason() == \
+        "Expected field size of 3 chars or an empty field, but got field size of 2 chars."
+    assert [len(block) for block in adis.get_files()[0].get_blocks()] == [1, 0]
+    with pytest.raises(Exception):
+        Adis.parse_from_file(path_to_file, errors="skip", workers=2)